@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch cone searches against the same cones run one at a time.
+
+Usage:
+    python -m benchmarks.bench_batch [--size 1000000] [--batches 1 10 100 1000]
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import uniform_sky
+from dso_search.search.store import CatalogStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=1_000_000)
+    parser.add_argument('--batches', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--radius', type=float, default=1.0)
+    args = parser.parse_args()
+
+    ra, dec = uniform_sky(args.size, seed=1)
+    store = CatalogStore.from_frame(pd.DataFrame({
+        'name': 'OBJ', 'catalog': 'NGC', 'ra': ra, 'dec': dec, 'size': 1.0}))
+
+    print(f"{'queries':>8} {'single us/q':>12} {'batch us/q':>11} {'speedup':>8}")
+    for n in args.batches:
+        q_ra, q_dec = uniform_sky(n, seed=2)
+
+        start = time.perf_counter()
+        for a, d in zip(q_ra, q_dec):
+            store.cone(a, d, args.radius)
+        single = (time.perf_counter() - start) / n
+
+        start = time.perf_counter()
+        store.cone_many(q_ra, q_dec, args.radius)
+        batch = (time.perf_counter() - start) / n
+
+        print(f"{n:>8} {single * 1e6:>12.1f} {batch * 1e6:>11.1f} {single / batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
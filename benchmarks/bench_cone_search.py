@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark cone searches: brute-force haversine scan vs. the zone index.
+
+Usage:
+    python -m benchmarks.bench_cone_search [--sizes 10000 100000 1000000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import uniform_sky
+from dso_search.search.geometry import angular_separation
+from dso_search.search.zones import ZoneIndex
+
+
+def brute_force(ra, dec, ra0, dec0, radius):
+    return np.nonzero(angular_separation(ra, dec, ra0, dec0) <= radius)[0]
+
+
+def indexed(index, ra, dec, ra0, dec0, radius):
+    rows = index.candidates(ra0, dec0, radius)
+    return rows[angular_separation(ra[rows], dec[rows], ra0, dec0) <= radius]
+
+
+def time_queries(func, queries):
+    start = time.perf_counter()
+    for query in queries:
+        func(*query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--radii', type=float, nargs='+', default=[0.1, 1.0, 5.0])
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'objects':>10} {'radius':>7} {'build ms':>9} {'brute ms':>9} {'index ms':>9} {'speedup':>8}")
+    for size in args.sizes:
+        ra, dec = uniform_sky(size, seed=1)
+        start = time.perf_counter()
+        index = ZoneIndex(ra, dec)
+        build = time.perf_counter() - start
+
+        q_ra, q_dec = uniform_sky(args.queries, seed=2)
+        for radius in args.radii:
+            queries = list(zip(q_ra, q_dec, [radius] * args.queries))
+            for ra0, dec0, r in queries:
+                assert np.array_equal(brute_force(ra, dec, ra0, dec0, r),
+                                      indexed(index, ra, dec, ra0, dec0, r))
+            brute = time_queries(lambda *q: brute_force(ra, dec, *q), queries)
+            fast = time_queries(lambda *q: indexed(index, ra, dec, *q), queries)
+            print(f"{size:>10} {radius:>7.2f} {build * 1e3:>9.1f} {brute * 1e3:>9.3f} "
+                  f"{fast * 1e3:>9.3f} {brute / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark sexagesimal coordinate parsing: per-row Python loop vs. vectorized.
+
+The loop is the conversion the Messier processor used to run per row
+(split on ':' and float arithmetic); the vectorized parser converts whole
+RA and Dec columns with catalog.coordinates.
+
+Usage:
+    python -m benchmarks.bench_coordinates [--sizes 10000 100000 1000000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import sexagesimal, uniform_sky
+from dso_search.catalog.coordinates import parse_dec, parse_ra
+
+
+def loop_parse(ra_text, dec_text):
+    """Row-by-row conversion with per-row sign handling."""
+    ra = []
+    dec = []
+    for ra_str, dec_str in zip(ra_text, dec_text):
+        h, m, s = (float(part) for part in ra_str.split())
+        ra.append((h + m / 60 + s / 3600) * 15)
+        sign = -1 if dec_str.startswith('-') else 1
+        d, m, s = (float(part) for part in dec_str.lstrip('+-').split())
+        dec.append(sign * (d + m / 60 + s / 3600))
+    return np.array(ra), np.array(dec)
+
+
+def vectorized_parse(ra_text, dec_text):
+    return parse_ra(ra_text)[0], parse_dec(dec_text)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'loop rows/s':>12} {'vector rows/s':>14} {'speedup':>8}")
+    for size in args.sizes:
+        ra_text, dec_text = sexagesimal(*uniform_sky(size, seed=3))
+        timings = []
+        results = []
+        for func in (loop_parse, vectorized_parse):
+            start = time.perf_counter()
+            results.append(func(ra_text, dec_text))
+            timings.append(time.perf_counter() - start)
+        for expected, actual in zip(*results):
+            np.testing.assert_allclose(actual, expected, atol=1e-9)
+        print(f"{size:>10} {size / timings[0]:>12.0f} {size / timings[1]:>14.0f} "
+              f"{timings[0] / timings[1]:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark streaming ingestion throughput and memory against the chunk size.
+
+A synthetic VizieR TSV dump in the NGC 2000.0 layout (sexagesimal
+coordinates) is ingested with NGCSource at several chunk sizes, each in a
+fresh interpreter whose peak resident memory (ru_maxrss) is reported.
+
+Usage:
+    python -m benchmarks.bench_ingest [--rows 1000000] [--chunk-sizes 10000 100000 1000000]
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic import sexagesimal, uniform_sky
+from dso_search.catalog.process_ngc import NGCSource
+
+
+def write_vizier_tsv(path, rows: int, seed: int = 0):
+    """Write a VizieR-style TSV with Name/RAJ2000/DEJ2000/Diam columns."""
+    ra, dec = uniform_sky(rows, seed)
+    ra_text, dec_text = sexagesimal(ra, dec)
+    diam = np.random.default_rng(seed).uniform(0.1, 60.0, rows).round(1)
+    with open(path, 'w') as f:
+        f.write("#\n#   Synthetic VizieR dump\n#\nName\tRAJ2000\tDEJ2000\tDiam\n")
+        f.write(' \t"h:m:s"\t"d:m:s"\tarcmin\n-----\t----------\t---------\t-----\n')
+        for i in range(0, rows, 100_000):
+            f.writelines(f"{n}\t{r}\t{d}\t{s}\n" for n, r, d, s in zip(
+                range(i + 1, min(i + 100_000, rows) + 1), ra_text[i:i + 100_000],
+                dec_text[i:i + 100_000], diam[i:i + 100_000]))
+
+
+def measure(raw_dir, chunk_size: int) -> dict:
+    """Ingest in this process; returns rows, seconds and peak RSS in MiB."""
+    source = NGCSource(raw_dir=raw_dir, processed_dir=raw_dir)
+    start = time.perf_counter()
+    rows = source.process(chunk_size)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {'rows': rows, 'seconds': elapsed, 'peak_mib': peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--measure', metavar='RAW_DIR', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.chunk_sizes[0])))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        write_vizier_tsv(tmp / 'ngc2000.tsv', args.rows)
+        size_mib = (tmp / 'ngc2000.tsv').stat().st_size / 2**20
+        print(f"{args.rows} rows, {size_mib:.1f} MiB of TSV")
+        print(f"{'chunk size':>10} {'seconds':>8} {'rows/s':>10} {'peak MiB':>9}")
+        for chunk_size in args.chunk_sizes:
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_ingest', '--measure', str(tmp),
+                 '--chunk-sizes', str(chunk_size)],
+                check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{chunk_size:>10} {result['seconds']:>8.2f} "
+                  f"{result['rows'] / result['seconds']:>10.0f} {result['peak_mib']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
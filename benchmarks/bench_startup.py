@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark catalog startup time and per-worker memory: CSV vs. memory-mapped.
+
+Each measurement runs in a fresh interpreter that loads the catalog, touches
+every column (as a warmed-up worker would) and reports its resident memory,
+split into private (RssAnon) and file-backed, shareable (RssFile) pages.
+
+Usage:
+    python -m benchmarks.bench_startup [--size 1000000] [--workers 4]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.synthetic import uniform_sky
+from dso_search.catalog.binary import BINARY_DIR_NAME, build_binary_catalog
+
+WORKER = r"""
+import json, sys, time
+start = time.perf_counter()
+from dso_search.catalog.binary import load_binary_catalog
+from dso_search.search.store import ARRAY_COLUMNS, CatalogStore
+import pandas as pd
+import numpy as np
+fmt, path = sys.argv[1], sys.argv[2]
+if fmt == 'csv':
+    store = CatalogStore.from_frame(pd.read_csv(path))
+else:
+    store = load_binary_catalog(path)
+loaded = time.perf_counter() - start
+for column in ARRAY_COLUMNS:
+    np.asarray(getattr(store, column)).sum()
+store.cone(10.0, 10.0, 5.0)
+status = dict(line.split(':', 1) for line in open('/proc/self/status'))
+kib = lambda key: int(status.get(key, '0 kB').split()[0])
+print(json.dumps({'load_s': loaded, 'rss_kib': kib('VmRSS'),
+                  'anon_kib': kib('RssAnon'), 'file_kib': kib('RssFile')}))
+"""
+
+
+def run_worker(fmt, path):
+    out = subprocess.run([sys.executable, '-c', WORKER, fmt, str(path)],
+                         check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        ra, dec = uniform_sky(args.size, seed=1)
+        csv_path = tmp / 'processed_synthetic.csv'
+        pd.DataFrame({'name': [f'OBJ {i}' for i in range(args.size)], 'catalog': 'NGC',
+                      'ra': ra, 'dec': dec, 'size': 1.0}).to_csv(csv_path, index=False)
+        build_binary_catalog(tmp)
+
+        print(f"{'format':>7} {'worker':>6} {'load s':>7} {'RSS MiB':>8} {'private':>8} {'shared':>7}")
+        for fmt, path in (('csv', csv_path), ('mmap', tmp / BINARY_DIR_NAME)):
+            for worker in range(args.workers):
+                stats = run_worker(fmt, path)
+                print(f"{fmt:>7} {worker:>6} {stats['load_s']:>7.3f} {stats['rss_kib'] / 1024:>8.1f} "
+                      f"{stats['anon_kib'] / 1024:>8.1f} {stats['file_kib'] / 1024:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request cost of the pandas search path vs. the columnar store.
+
+Usage:
+    python -m benchmarks.bench_store [--sizes 10000 100000 1000000]
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import uniform_sky
+from dso_search.search.store import CatalogStore
+
+
+def pandas_search(df, ra0, dec0, radius):
+    """The original per-request Series arithmetic over the whole catalog."""
+    ra_diff = df['ra'] - ra0
+    dec_diff = df['dec'] - dec0
+    distances = (
+        2 * np.arcsin(np.sqrt(
+            np.sin(np.deg2rad(dec_diff) / 2) ** 2 +
+            np.cos(np.deg2rad(dec0)) *
+            np.cos(np.deg2rad(df['dec'])) *
+            np.sin(np.deg2rad(ra_diff) / 2) ** 2
+        )) * 180 / np.pi
+    )
+    return df[distances <= radius]
+
+
+def measure(func, queries):
+    start = time.perf_counter()
+    for query in queries:
+        func(*query)
+    elapsed = (time.perf_counter() - start) / len(queries)
+
+    tracemalloc.start()
+    func(*queries[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--radius', type=float, default=1.0)
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'objects':>10} {'pandas ms':>10} {'store ms':>9} {'pandas KiB':>11} {'store KiB':>10}")
+    for size in args.sizes:
+        ra, dec = uniform_sky(size, seed=1)
+        df = pd.DataFrame({'name': [f'OBJ {i}' for i in range(size)], 'catalog': 'NGC',
+                           'ra': ra, 'dec': dec, 'size': 1.0})
+        store = CatalogStore.from_frame(df)
+        q_ra, q_dec = uniform_sky(args.queries, seed=2)
+        queries = [(a, d, args.radius) for a, d in zip(q_ra, q_dec)]
+
+        slow, slow_peak = measure(lambda *q: pandas_search(df, *q), queries)
+        fast, fast_peak = measure(store.cone, queries)
+        print(f"{size:>10} {slow * 1e3:>10.3f} {fast * 1e3:>9.3f} "
+              f"{slow_peak / 1024:>11.1f} {fast_peak / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
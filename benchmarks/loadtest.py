@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Load generator for a running search API.
+
+Keeps --concurrency requests in flight against --url for --duration seconds,
+mixing single cone searches over several radii with batch searches, and
+reports throughput, error counts and latency percentiles per request type.
+Query positions follow one of the synthetic sky distributions so that dense
+and sparse regions are both exercised. With --json the report is also saved
+like a benchmark suite run (see benchmarks.results).
+
+Usage:
+    uvicorn dso_search.api.main:app --workers 4 &
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 [--concurrency 32] [--duration 30]
+
+A locustfile with the same request mix is in benchmarks/locustfile.py.
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from benchmarks import results as bench_results
+from benchmarks.synthetic import DISTRIBUTIONS, sky
+
+
+class RequestMix:
+    """Random requests in the given proportions: single searches per radius and batches."""
+
+    def __init__(self, distribution: str = 'uniform', radii=(0.1, 1.0, 5.0), batch_share: float = 0.1,
+                 batch_size: int = 100, seed: int = 0, pool: int = 100_000):
+        self.radii = list(radii)
+        self.batch_share = batch_share
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self.ra, self.dec = sky(pool, distribution, seed)
+
+    def _position(self):
+        i = self.rng.integers(len(self.ra))
+        return float(self.ra[i]), float(self.dec[i])
+
+    def next(self):
+        """(label, path, JSON body) of the next request."""
+        if self.rng.random() < self.batch_share:
+            radius = float(self.rng.choice(self.radii))
+            queries = []
+            for _ in range(self.batch_size):
+                ra, dec = self._position()
+                queries.append({'ra': ra, 'dec': dec, 'radius': radius})
+            return f'batch.n{self.batch_size}', '/search/batch', {'queries': queries}
+        radius = float(self.rng.choice(self.radii))
+        ra, dec = self._position()
+        return f'search.r{radius:g}', '/search', {'ra': ra, 'dec': dec, 'radius': radius}
+
+
+async def run_load(url: str, mix: RequestMix, concurrency: int, duration: float) -> dict:
+    """Run the load and return {label: {'latencies': [...], 'errors': n}} plus the elapsed time."""
+    import httpx
+
+    stats = {}
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+        async def user():
+            while time.perf_counter() < deadline:
+                label, path, body = mix.next()
+                entry = stats.setdefault(label, {'latencies': [], 'errors': 0})
+                start = time.perf_counter()
+                try:
+                    response = await client.post(path, json=body)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    entry['latencies'].append(time.perf_counter() - start)
+                else:
+                    entry['errors'] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return stats, elapsed
+
+
+def summarize(stats: dict, elapsed: float) -> dict:
+    """Flat metrics: requests per second, errors and latency percentiles (ms) per label."""
+    metrics = {}
+    total = 0
+    for label, entry in sorted(stats.items()):
+        done = len(entry['latencies'])
+        total += done
+        metrics[f'load.{label}.requests_per_s'] = done / elapsed
+        metrics[f'load.{label}.errors'] = entry['errors']
+        if done:
+            metrics.update(bench_results.flatten(f'load.{label}.latency_ms',
+                                                 bench_results.percentiles(entry['latencies'], 1e3)))
+    metrics['load.total.requests_per_s'] = total / elapsed
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds")
+    parser.add_argument('--distribution', default='uniform', choices=sorted(DISTRIBUTIONS))
+    parser.add_argument('--radii', type=float, nargs='+', default=[0.1, 1.0, 5.0])
+    parser.add_argument('--batch-share', type=float, default=0.1, help="Fraction of batch requests")
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--json', action='store_true', help="Save the report under benchmarks/results")
+    args = parser.parse_args()
+
+    mix = RequestMix(args.distribution, args.radii, args.batch_share, args.batch_size)
+    stats, elapsed = asyncio.run(run_load(args.url, mix, args.concurrency, args.duration))
+    metrics = summarize(stats, elapsed)
+    for metric, value in sorted(metrics.items()):
+        print(f"{metric:<45} {value:>12.3f}")
+    if args.json:
+        path = bench_results.save({'environment': bench_results.environment(),
+                                   'parameters': vars(args), 'metrics': metrics})
+        print(f"\nSaved results to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Locust load test for the search API, with the request mix of benchmarks.loadtest.
+
+Usage (needs the optional `locust` package):
+    locust -f benchmarks/locustfile.py --host http://127.0.0.1:8000 \
+        --headless --users 64 --spawn-rate 16 --run-time 1m --csv bench
+"""
+import os
+
+from locust import FastHttpUser, task
+
+from benchmarks.loadtest import RequestMix
+
+DISTRIBUTION = os.environ.get('DSO_BENCH_DISTRIBUTION', 'uniform')
+
+
+class SearchUser(FastHttpUser):
+    """Issues cone and batch searches back to back, like a busy client."""
+
+    def on_start(self):
+        self.mix = RequestMix(DISTRIBUTION, seed=id(self) % 2 ** 32)
+
+    @task
+    def search(self):
+        label, path, body = self.mix.next()
+        self.client.post(path, json=body, name=label)
@@ -0,0 +1,101 @@
+"""
+Machine-readable benchmark results.
+
+A run is stored as one JSON file holding the environment (commit, Python and
+library versions, CPU), the run's parameters and a flat mapping of metric
+names to values. Metrics ending in '_per_s' are throughputs (higher is
+better); every other metric is a time or a size (lower is better). Two runs
+are compared metric by metric, so a regression between commits shows up as
+the metrics that got worse by more than a threshold.
+"""
+import json
+import os
+import platform
+import subprocess
+import time
+from pathlib import Path
+
+import numpy as np
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+PERCENTILES = (50, 90, 99)
+
+
+def percentiles(samples, scale: float = 1.0) -> dict:
+    """p50/p90/p99/max and mean of the samples, multiplied by `scale` (e.g. 1e3 for ms)."""
+    samples = np.asarray(samples, dtype=np.float64) * scale
+    stats = {f'p{p}': float(np.percentile(samples, p)) for p in PERCENTILES}
+    stats['max'] = float(samples.max())
+    stats['mean'] = float(samples.mean())
+    return stats
+
+
+def flatten(prefix: str, stats: dict) -> dict:
+    return {f'{prefix}.{key}': value for key, value in stats.items()}
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                             cwd=Path(__file__).resolve().parent, check=True)
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, cwd=Path(__file__).resolve().parent)
+        return out.stdout.strip() + ('-dirty' if dirty.stdout.strip() else '')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    import pandas as pd
+
+    return {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def save(results: dict, directory=RESULTS_DIR) -> Path:
+    """Write a run to <directory>/<timestamp>-<commit>.json and return the path."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    path = directory / f"{stamp}-{results['environment'].get('commit') or 'unknown'}.json"
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    return path
+
+
+def load(path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith('_per_s')
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.1) -> list:
+    """
+    Metrics of `current` that are worse than in `baseline` by more than
+    `threshold` (relative).
+
+    Returns:
+        (metric, baseline value, current value, relative change) tuples,
+        worst first; the change is positive when the metric got worse
+    """
+    regressions = []
+    for metric, value in current['metrics'].items():
+        base = baseline['metrics'].get(metric)
+        if base is None or base == 0 or value is None:
+            continue
+        change = (value - base) / abs(base)
+        if higher_is_better(metric):
+            change = -change
+        if change > threshold:
+            regressions.append((metric, base, value, change))
+    return sorted(regressions, key=lambda regression: -regression[3])
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the search API, with machine-readable results.
+
+A synthetic catalog of the given size and sky distribution is written and
+served by the real application in-process (through the ASGI test client, so
+request validation, the endpoint and serialization are all included). The
+suite measures:
+
+    search      /search latency percentiles for each radius
+    batch       /search/batch throughput (cones per second) per batch size
+    crossmatch  /crossmatch throughput (sources per second)
+    startup     catalog load time and resident memory of fresh worker
+                processes, for the CSV and memory-mapped catalogs
+
+Each run is saved as JSON under benchmarks/results/ (see benchmarks.results);
+with --baseline the run is compared against an earlier one and the command
+fails if any metric regressed by more than --threshold.
+
+Usage:
+    python -m benchmarks.suite [--size 1000000] [--distribution uniform clustered galactic]
+                               [--baseline benchmarks/results/<run>.json]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import results as bench_results
+from benchmarks.synthetic import DISTRIBUTIONS, sky, write_catalog
+
+DEFAULT_RADII = (0.1, 1.0, 5.0)
+DEFAULT_BATCH_SIZES = (10, 100, 1000)
+
+
+def make_client(catalog_dir):
+    """Test client of an app serving `catalog_dir`, with the result cache disabled."""
+    from fastapi.testclient import TestClient
+    from dso_search.api.main import create_app
+
+    app = create_app(catalog_dir, preload=True, watch_interval=0)
+    app.state.cache = None
+    return TestClient(app)
+
+
+def measure_search(client, distribution: str, radii, queries: int, seed: int = 2) -> dict:
+    """Latency percentiles (ms) of single /search requests, per radius."""
+    ra, dec = sky(queries, distribution, seed)
+    metrics = {}
+    for radius in radii:
+        for a, d in zip(ra[:10], dec[:10]):
+            client.post('/search', json={'ra': a, 'dec': d, 'radius': radius})
+        samples = []
+        for a, d in zip(ra, dec):
+            start = time.perf_counter()
+            response = client.post('/search', json={'ra': a, 'dec': d, 'radius': radius})
+            samples.append(time.perf_counter() - start)
+            response.raise_for_status()
+        metrics.update(bench_results.flatten(f'search.r{radius:g}.latency_ms',
+                                             bench_results.percentiles(samples, 1e3)))
+    return metrics
+
+
+def measure_batch(client, distribution: str, batch_sizes, radius: float, repeats: int = 5,
+                  seed: int = 3) -> dict:
+    """Cones per second answered by /search/batch, per batch size."""
+    metrics = {}
+    for size in batch_sizes:
+        ra, dec = sky(size, distribution, seed)
+        body = {'queries': [{'ra': a, 'dec': d, 'radius': radius} for a, d in zip(ra, dec)]}
+        client.post('/search/batch', json=body).raise_for_status()
+        start = time.perf_counter()
+        for _ in range(repeats):
+            client.post('/search/batch', json=body).raise_for_status()
+        elapsed = time.perf_counter() - start
+        metrics[f'batch.n{size}.cones_per_s'] = size * repeats / elapsed
+    return metrics
+
+
+def measure_crossmatch(client, distribution: str, sources: int, radius: float, repeats: int = 3,
+                       seed: int = 4) -> dict:
+    """Sources per second cross-matched by /crossmatch, for both modes."""
+    ra, dec = sky(sources, distribution, seed)
+    body = 'ra,dec\n' + ''.join(f'{a:.6f},{d:.6f}\n' for a, d in zip(ra, dec))
+    metrics = {}
+    for mode in ('nearest', 'all'):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            response = client.post('/crossmatch', params={'radius': radius, 'mode': mode},
+                                   content=body, headers={'content-type': 'text/csv'})
+            response.raise_for_status()
+        elapsed = time.perf_counter() - start
+        metrics[f'crossmatch.{mode}.sources_per_s'] = sources * repeats / elapsed
+    return metrics
+
+
+def measure_startup(catalog_dir, workers: int) -> dict:
+    """Load time and memory of fresh worker processes (medians over `workers` runs)."""
+    import numpy as np
+
+    from benchmarks.bench_startup import run_worker
+    from dso_search.catalog.binary import BINARY_DIR_NAME
+
+    catalog_dir = Path(catalog_dir)
+    metrics = {}
+    for fmt, path in (('csv', catalog_dir / 'processed_synthetic.csv'),
+                      ('mmap', catalog_dir / BINARY_DIR_NAME)):
+        runs = [run_worker(fmt, path) for _ in range(workers)]
+        metrics[f'startup.{fmt}.load_s'] = float(np.median([run['load_s'] for run in runs]))
+        for key in ('rss_kib', 'anon_kib', 'file_kib'):
+            metrics[f'startup.{fmt}.{key[:-4]}_mib'] = float(np.median([run[key] for run in runs])) / 1024
+    return metrics
+
+
+def run_suite(size: int, distribution: str, radii=DEFAULT_RADII, queries: int = 200,
+              batch_sizes=DEFAULT_BATCH_SIZES, crossmatch_sources: int = 10_000,
+              workers: int = 3, startup: bool = True, seed: int = 1) -> dict:
+    """Run every benchmark on one synthetic catalog and return the metrics."""
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog_dir = write_catalog(Path(tmp), size, distribution, seed)
+        metrics = {}
+        with make_client(catalog_dir) as client:
+            metrics.update(measure_search(client, distribution, radii, queries))
+            metrics.update(measure_batch(client, distribution, batch_sizes, radius=1.0))
+            metrics.update(measure_crossmatch(client, distribution, crossmatch_sources, radius=0.1))
+        if startup:
+            metrics.update(measure_startup(catalog_dir, workers))
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=1_000_000)
+    parser.add_argument('--distribution', nargs='+', default=['uniform'], choices=sorted(DISTRIBUTIONS))
+    parser.add_argument('--radii', type=float, nargs='+', default=list(DEFAULT_RADII))
+    parser.add_argument('--queries', type=int, default=200, help="Single searches per radius")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=list(DEFAULT_BATCH_SIZES))
+    parser.add_argument('--crossmatch-sources', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, default=3, help="Fresh worker processes for startup")
+    parser.add_argument('--no-startup', action='store_true')
+    parser.add_argument('--out', type=Path, default=bench_results.RESULTS_DIR)
+    parser.add_argument('--baseline', type=Path, help="Earlier results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="Relative change counted as a regression (default 0.1)")
+    args = parser.parse_args()
+
+    metrics = {}
+    for distribution in args.distribution:
+        run = run_suite(args.size, distribution, args.radii, args.queries, args.batch_sizes,
+                        args.crossmatch_sources, args.workers, not args.no_startup)
+        metrics.update({f'{distribution}.{key}': value for key, value in run.items()})
+
+    results = {
+        'environment': bench_results.environment(),
+        'parameters': {key: (str(value) if isinstance(value, Path) else value)
+                       for key, value in vars(args).items()},
+        'metrics': metrics,
+    }
+    for metric, value in sorted(metrics.items()):
+        print(f"{metric:<55} {value:>12.3f}")
+    path = bench_results.save(results, args.out)
+    print(f"\nSaved results to {path}")
+
+    if args.baseline:
+        regressions = bench_results.compare(results, bench_results.load(args.baseline), args.threshold)
+        for metric, base, value, change in regressions:
+            print(f"REGRESSION {metric}: {base:.3f} -> {value:.3f} ({change:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Synthetic catalogs for benchmarks.
+"""
+import numpy as np
+
+
+def uniform_sky(n: int, seed: int = 0):
+    """Return (ra, dec) arrays in degrees for n points uniform on the sphere."""
+    rng = np.random.default_rng(seed)
+    ra = rng.uniform(0.0, 360.0, n)
+    dec = np.rad2deg(np.arcsin(rng.uniform(-1.0, 1.0, n)))
+    return ra, dec
+
+
+def sexagesimal(ra, dec):
+    """Format RA (hours) and Dec (degrees) as 'HH MM SS.S' / '±DD MM SS' strings."""
+    ra_s = np.round(np.asarray(ra) / 15.0 * 3600.0, 1) % 86400.0
+    dec_s = np.round(np.abs(np.asarray(dec)) * 3600.0)
+    signs = np.where(np.asarray(dec) < 0, '-', '+')
+    ra_text = [f"{int(s // 3600):02d} {int(s % 3600 // 60):02d} {s % 60:04.1f}" for s in ra_s]
+    dec_text = [f"{sign}{int(s // 3600):02d} {int(s % 3600 // 60):02d} {int(s % 60):02d}"
+                for sign, s in zip(signs, dec_s)]
+    return ra_text, dec_text
+
+
+def clustered_sky(n: int, seed: int = 0, clusters: int = 50, spread: float = 2.0):
+    """Points in Gaussian clumps of `spread` degrees around random centres, like galaxy clusters."""
+    rng = np.random.default_rng(seed)
+    centre_ra, centre_dec = uniform_sky(clusters, seed + 1)
+    member = rng.integers(0, clusters, n)
+    dec = np.clip(centre_dec[member] + rng.normal(0.0, spread, n), -90.0, 90.0)
+    cos_dec = np.maximum(np.cos(np.deg2rad(dec)), 1e-3)
+    ra = (centre_ra[member] + rng.normal(0.0, spread, n) / cos_dec) % 360.0
+    return ra, dec
+
+
+def galactic_plane_sky(n: int, seed: int = 0, scale_height: float = 5.0):
+    """Points concentrated towards the Galactic plane (Laplace-distributed latitude)."""
+    rng = np.random.default_rng(seed)
+    lon = np.deg2rad(rng.uniform(0.0, 360.0, n))
+    lat = np.deg2rad(np.clip(rng.laplace(0.0, scale_height, n), -90.0, 90.0))
+    # Rotate Galactic (l, b) to equatorial (ra, dec), J2000
+    pole_ra, pole_dec, l_ncp = np.deg2rad([192.85948, 27.12825, 122.93192])
+    sin_dec = (np.sin(lat) * np.sin(pole_dec) +
+               np.cos(lat) * np.cos(pole_dec) * np.cos(l_ncp - lon))
+    dec = np.arcsin(np.clip(sin_dec, -1.0, 1.0))
+    ra = pole_ra + np.arctan2(np.cos(lat) * np.sin(l_ncp - lon),
+                              np.sin(lat) * np.cos(pole_dec) -
+                              np.cos(lat) * np.sin(pole_dec) * np.cos(l_ncp - lon))
+    return np.rad2deg(ra) % 360.0, np.rad2deg(dec)
+
+
+DISTRIBUTIONS = {
+    'uniform': uniform_sky,
+    'clustered': clustered_sky,
+    'galactic': galactic_plane_sky,
+}
+
+
+def sky(n: int, distribution: str = 'uniform', seed: int = 0):
+    """Return (ra, dec) for n points drawn from one of DISTRIBUTIONS."""
+    try:
+        return DISTRIBUTIONS[distribution](n, seed)
+    except KeyError:
+        raise ValueError(f"Unknown distribution {distribution!r}; choose from {', '.join(DISTRIBUTIONS)}")
+
+
+def catalog_frame(n: int, distribution: str = 'uniform', seed: int = 0):
+    """A processed-catalog frame of n objects with realistic catalogs, names and sizes."""
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    ra, dec = sky(n, distribution, seed)
+    catalog = rng.choice(np.array(['NGC', 'IC', 'PGC']), n, p=[0.3, 0.2, 0.5])
+    return pd.DataFrame({
+        'name': np.char.add(catalog.astype(str), np.arange(1, n + 1).astype(str)),
+        'catalog': catalog,
+        'ra': ra,
+        'dec': dec,
+        'size': rng.lognormal(0.0, 1.0, n).round(2),
+    })
+
+
+def write_catalog(directory, n: int, distribution: str = 'uniform', seed: int = 0, binary: bool = True):
+    """
+    Write a synthetic processed catalog (and its binary artifact) to `directory`,
+    so that it loads like data/processed.
+    """
+    from pathlib import Path
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    catalog_frame(n, distribution, seed).to_csv(directory / 'processed_synthetic.csv', index=False)
+    if binary:
+        from dso_search.catalog.binary import build_binary_catalog
+
+        build_binary_catalog(directory)
+    return directory
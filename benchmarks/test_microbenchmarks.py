@@ -0,0 +1,91 @@
+"""
+Microbenchmarks of the search hot paths, for pytest-benchmark.
+
+Skipped unless the optional `pytest-benchmark` plugin is installed. The
+catalog size and sky distribution are set with $DSO_BENCH_SIZE (default
+100000) and $DSO_BENCH_DISTRIBUTION (default uniform). pytest-benchmark keeps
+machine-readable runs, e.g.:
+
+    python -m pytest benchmarks --benchmark-autosave
+    python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:10%
+"""
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from benchmarks.synthetic import catalog_frame, sexagesimal, sky
+from dso_search.api.serialization import search_response
+from dso_search.catalog.coordinates import parse_dec, parse_ra
+from dso_search.search.crossmatch import crossmatch
+from dso_search.search.engine import cone_search
+from dso_search.search.filters import AttributeFilter
+from dso_search.search.store import CatalogStore
+from dso_search.search.visibility import time_grid, visible_objects
+
+SIZE = int(os.environ.get('DSO_BENCH_SIZE', 100_000))
+DISTRIBUTION = os.environ.get('DSO_BENCH_DISTRIBUTION', 'uniform')
+
+
+@pytest.fixture(scope='module')
+def store():
+    return CatalogStore.from_frame(catalog_frame(SIZE, DISTRIBUTION, seed=1))
+
+
+@pytest.fixture(scope='module')
+def positions():
+    return sky(1000, DISTRIBUTION, seed=2)
+
+
+def cycle(positions):
+    """A function returning the next query position on every call."""
+    ra, dec = positions
+    state = {'i': 0}
+
+    def next_position():
+        i = state['i'] = (state['i'] + 1) % len(ra)
+        return ra[i], dec[i]
+    return next_position
+
+
+@pytest.mark.parametrize('radius', [0.1, 1.0, 5.0])
+def test_cone(benchmark, store, positions, radius):
+    next_position = cycle(positions)
+    benchmark(lambda: store.cone(*next_position(), radius))
+
+
+def test_filtered_cone(benchmark, store, positions):
+    next_position = cycle(positions)
+    rule = AttributeFilter(catalogs=['NGC'], min_size=1.0)
+    benchmark(lambda: cone_search(store, *next_position(), 1.0, rule))
+
+
+def test_search_response(benchmark, store, positions):
+    ra, dec = positions[0][0], positions[1][0]
+    rows = store.cone(ra, dec, 5.0)
+    separations = store.separations(rows, ra, dec)
+    benchmark(search_response, store, rows, separations, len(rows))
+
+
+@pytest.mark.parametrize('queries', [100, 1000])
+def test_cone_many(benchmark, store, positions, queries):
+    ra, dec = positions[0][:queries], positions[1][:queries]
+    benchmark(store.cone_many, ra, dec, 1.0)
+
+
+def test_crossmatch(benchmark, store, positions):
+    benchmark(crossmatch, store, *positions, 0.1)
+
+
+def test_visible_objects(benchmark, store):
+    # A twelve-hour night in five-minute steps
+    night = time_grid(1_727_740_800.0, 1_727_784_000.0, 300.0)
+    benchmark(visible_objects, store, 40.0, -75.0, night, 30.0)
+
+
+def test_parse_coordinates(benchmark):
+    ra_text, dec_text = sexagesimal(*sky(10_000, DISTRIBUTION, seed=3))
+    ra_text, dec_text = np.array(ra_text), np.array(dec_text)
+    benchmark(lambda: (parse_ra(ra_text), parse_dec(dec_text)))
@@ -0,0 +1,203 @@
+"""
+Result cache for repeated cone searches.
+
+Serialized responses are cached under keys built from the catalog version and
+the query's (ra, dec, radius) quantized to a configurable precision, so
+nearby repeats of popular fields share an entry. A new catalog version
+invalidates the cache automatically. Entries are kept in a bounded
+in-process LRU with a TTL; an optional shared backend (e.g. Redis) lets
+several workers reuse each other's results.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Environment variables configuring the cache built by create_app()
+CACHE_SIZE_ENV = 'DSO_SEARCH_CACHE_SIZE'
+CACHE_BYTES_ENV = 'DSO_SEARCH_CACHE_BYTES'
+CACHE_TTL_ENV = 'DSO_SEARCH_CACHE_TTL'
+CACHE_PRECISION_ENV = 'DSO_SEARCH_CACHE_PRECISION'
+CACHE_REDIS_URL_ENV = 'DSO_SEARCH_CACHE_REDIS_URL'
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 300.0
+DEFAULT_PRECISION = 1e-6
+
+
+class CacheBackend:
+    """Interface of shared cache backends: a string-keyed store of bytes."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float):
+        raise NotImplementedError
+
+
+class InMemoryBackend(CacheBackend):
+    """Process-local stand-in for a shared backend, used in tests."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+
+
+class RedisBackend(CacheBackend):
+    """Shared backend on a Redis server; needs the optional `redis` package."""
+
+    def __init__(self, url: str, prefix: str = 'dso_search:'):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self._prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._client.set(self._prefix + key, value, px=max(1, int(ttl * 1000)))
+
+
+class QueryCache:
+    """Bounded LRU/TTL cache of serialized query results."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttl: float = DEFAULT_TTL, precision: float = DEFAULT_PRECISION,
+                 shared: Optional[CacheBackend] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.precision = precision
+        self.shared = shared
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.shared_hits = 0
+
+    @classmethod
+    def from_environment(cls) -> Optional["QueryCache"]:
+        """Build the cache configured by the DSO_SEARCH_CACHE_* variables; None if disabled."""
+        max_entries = int(os.environ.get(CACHE_SIZE_ENV) or DEFAULT_MAX_ENTRIES)
+        if max_entries <= 0:
+            return None
+        shared = None
+        redis_url = os.environ.get(CACHE_REDIS_URL_ENV)
+        if redis_url:
+            shared = RedisBackend(redis_url)
+        return cls(
+            max_entries=max_entries,
+            max_bytes=int(os.environ.get(CACHE_BYTES_ENV) or DEFAULT_MAX_BYTES),
+            ttl=float(os.environ.get(CACHE_TTL_ENV) or DEFAULT_TTL),
+            precision=float(os.environ.get(CACHE_PRECISION_ENV) or DEFAULT_PRECISION),
+            shared=shared,
+        )
+
+    def key(self, version: str, endpoint: str, ra: float, dec: float, radius: float,
+            extra: tuple = ()) -> str:
+        """Cache key for a cone query; `extra` holds any further query parameters."""
+        quantized = (round(value / self.precision) for value in (ra % 360.0, dec, radius))
+        parts = [version, endpoint, *map(str, quantized), *map(repr, extra)]
+        return ':'.join(parts)
+
+    def _check_version(self, key: str):
+        version = key.split(':', 1)[0]
+        if version != self._version:
+            if self._entries:
+                logger.info(f"Catalog version changed to {version}, clearing query cache")
+            self._entries.clear()
+            self._bytes = 0
+            self._version = version
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            self._check_version(key)
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires >= time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+
+        if self.shared is not None:
+            try:
+                value = self.shared.get(key)
+            except Exception as e:
+                logger.warning(f"Shared cache lookup failed: {e}")
+                value = None
+            if value is not None:
+                with self._lock:
+                    self.shared_hits += 1
+                    self.hits += 1
+                self._store(key, value)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: bytes):
+        self._store(key, value)
+        if self.shared is not None:
+            try:
+                self.shared.set(key, value, self.ttl)
+            except Exception as e:
+                logger.warning(f"Shared cache update failed: {e}")
+
+    def _store(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._check_version(key)
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._bytes += len(value)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "shared_hits": self.shared_hits,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
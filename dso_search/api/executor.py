@@ -0,0 +1,154 @@
+"""
+Bounded worker pool for CPU-bound search work.
+
+Cone, batch and cross-match searches are NumPy-heavy and synchronous; run on
+the event loop, one wide query would stall every other request of the worker
+(including /health). They are run in a thread pool instead: NumPy releases
+the GIL in its array kernels and the catalog arrays are shared by all
+threads (memory-mapped when loaded from the binary artifact), so nothing is
+copied per task.
+
+Admission is bounded: at most `workers` tasks run and `queue_size` more
+wait. A request arriving when both are full is rejected at once (HTTP 429)
+rather than queued without limit, which keeps the latency of admitted
+requests flat under overload. A request waiting or running longer than the
+timeout gets HTTP 504. Python threads cannot be interrupted, so a task that
+already started runs to completion in the background and holds its slot
+until then; a task still queued is cancelled.
+
+Configured by DSO_SEARCH_WORKERS (0 runs searches inline on the event
+loop), DSO_SEARCH_QUEUE_SIZE and DSO_SEARCH_TIMEOUT (seconds, 0 for none).
+"""
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from .profiling import sampling_this_thread
+
+WORKERS_ENV = 'DSO_SEARCH_WORKERS'
+QUEUE_SIZE_ENV = 'DSO_SEARCH_QUEUE_SIZE'
+TIMEOUT_ENV = 'DSO_SEARCH_TIMEOUT'
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_TIMEOUT = 30.0
+
+
+class Overloaded(RuntimeError):
+    """Raised when every worker is busy and the queue is full."""
+
+
+class SearchTimeout(RuntimeError):
+    """Raised when a task does not finish within the executor's timeout."""
+
+
+def _run_task(func, *args):
+    with sampling_this_thread():
+        return func(*args)
+
+
+class SearchExecutor:
+    """
+    A thread pool with bounded admission and timeouts.
+
+    Args:
+        workers: Worker threads
+        queue_size: Tasks that may wait for a worker beyond those running
+        timeout: Seconds a task may take, including its wait; None for no limit
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.capacity = workers + queue_size
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='search')
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    @classmethod
+    def from_environment(cls) -> Optional["SearchExecutor"]:
+        """The executor configured by DSO_SEARCH_WORKERS etc.; None if searches run inline."""
+        workers = int(os.environ.get(WORKERS_ENV) or DEFAULT_WORKERS)
+        if workers <= 0:
+            return None
+        timeout = float(os.environ.get(TIMEOUT_ENV) or DEFAULT_TIMEOUT)
+        return cls(workers=workers,
+                   queue_size=int(os.environ.get(QUEUE_SIZE_ENV) or DEFAULT_QUEUE_SIZE),
+                   timeout=timeout if timeout > 0 else None)
+
+    def admit(self):
+        """Take a slot, or raise Overloaded; every admit() needs a release()."""
+        with self._lock:
+            if self._admitted >= self.capacity:
+                self.rejected += 1
+                raise Overloaded(f"{self._admitted} searches in progress")
+            self._admitted += 1
+
+    def release(self):
+        with self._lock:
+            self._admitted -= 1
+
+    def release_when_done(self, future=None):
+        """Release the slot once future (from submit()) has finished, or now if there is none."""
+        if future is None:
+            self.release()
+        else:
+            future.add_done_callback(lambda _: self.release())
+
+    def deadline(self) -> Optional[float]:
+        """Monotonic time by which a task admitted now must finish."""
+        return None if self.timeout is None else time.monotonic() + self.timeout
+
+    async def run(self, func, *args):
+        """Admit, run func(*args) in the pool and return its result."""
+        self.admit()
+        try:
+            future = self.submit(func, *args)
+        except BaseException:
+            self.release()
+            raise
+        # The slot is held until the task really finishes, even after a timeout
+        self.release_when_done(future)
+        return await self.wait(future, self.deadline())
+
+    def submit(self, func, *args):
+        """Start func(*args) in the pool within an already admitted slot; returns its future."""
+        # Tasks run in the submitting request's context, so a profile of the request samples them
+        context = contextvars.copy_context()
+        return self._pool.submit(context.run, _run_task, func, *args)
+
+    async def wait(self, future, deadline: float = None):
+        """Result of a submitted task; raises SearchTimeout if it does not finish by `deadline`."""
+        wrapped = asyncio.wrap_future(future)
+        if deadline is None:
+            return await wrapped
+        try:
+            return await asyncio.wait_for(wrapped, max(deadline - time.monotonic(), 0.0))
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise SearchTimeout(f"Search did not finish within {self.timeout:g} s")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_progress": self._admitted,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+            }
+
+    def shutdown(self):
+        """Cancel queued tasks and stop accepting new ones; running tasks finish in the background."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -2,112 +2,617 @@
 Main FastAPI application for the DSO Search API.
 Provides endpoints for searching deep space objects by coordinates.
 """
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.middleware.cors import CORSMiddleware
-import pandas as pd
-import numpy as np
-from pathlib import Path
 import logging
-from typing import List, Optional
+import os
+import secrets
+from contextlib import asynccontextmanager
+
+import numpy as np
+from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException, Path, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
-from .models import Coordinates, DeepSpaceObject, SearchResponse
+from .cache import QueryCache
+from .executor import Overloaded, SearchExecutor, SearchTimeout
+from .metrics import METRICS_ENV, NULL_TIMER, Metrics, MetricsMiddleware
+from .models import (
+    MAX_BATCH_OBJECTS, MAX_LIMIT, Coordinates, SearchOptions, SearchResponse, BatchSearchRequest,
+    BatchSearchResponse, FieldOfView,
+    BatchFieldOfViewRequest, VisibilityRequest, VisibilityResponse, TileResponse,
+    ObjectLookupResponse, AutocompleteResponse,
+)
+from .serialization import (
+    search_response, batch_search_response, visibility_response, tile_response, crossmatch_lines,
+    object_lookup_response, autocomplete_response,
+)
+from .profiling import SlowRequestProfiler
+from .state import (
+    WATCH_INTERVAL_ENV, CatalogHolder, CatalogSnapshot, load_catalog, load_catalog_data,
+)
+from .uploads import UploadError, parse_sources
+from ..search.density import cell_bounds, cell_rows, check_cell
+from ..search.engine import batch_search, cone_search, footprint_batch_search, iter_crossmatch
+from ..search.filters import AttributeFilter, cone_candidates, filtered_rows
+from ..search.footprints import Footprint, footprint_search
+from ..search.query import page_by_separation
+from ..search.store import CatalogStore
+from ..search.visibility import time_grid, visible_objects
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(
-    title="Deep Space Object Search API",
-    description="Search for deep space objects by coordinates across multiple astronomical catalogs",
-    version="1.0.0"
-)
+# Set to load the catalog when the app is created, e.g. in the master process
+# of a preloading server so that forked workers inherit it
+PRELOAD_ENV = 'DSO_SEARCH_PRELOAD'
+# Tiles at this level and deeper list their objects, not only cell statistics
+TILE_OBJECTS_LEVEL = 6
+# /admin and /debug endpoints require this value in the X-Admin-Token header,
+# and are disabled while it is unset
+ADMIN_TOKEN_ENV = 'DSO_SEARCH_ADMIN_TOKEN'
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+router = APIRouter()
 
-def load_catalog_data() -> pd.DataFrame:
-    """Load and combine processed catalog data."""
-    try:
-        dfs = []
-        data_dir = Path('data/processed')
-        for csv_file in data_dir.glob('processed_*.csv'):
-            df = pd.read_csv(csv_file)
-            dfs.append(df)
-        return pd.concat(dfs, ignore_index=True)
-    except Exception as e:
-        logger.error(f"Error loading catalog data: {e}")
-        raise HTTPException(status_code=500, detail="Failed to load catalog data")
 
-# Load catalog data at startup
-catalog_data = load_catalog_data()
+def get_snapshot(request: Request) -> CatalogSnapshot:
+    """Dependency returning the app's active catalog snapshot, loading it if needed."""
+    return request.app.state.catalog.snapshot()
+
+
+def get_catalog(snapshot: CatalogSnapshot = Depends(get_snapshot)) -> CatalogStore:
+    """Dependency returning the catalog store of the request's snapshot."""
+    return snapshot.store
+
 
-@app.get("/health")
-async def health_check():
+def attribute_filter(options: SearchOptions) -> AttributeFilter:
+    """Attribute filter described by a search request."""
+    return AttributeFilter(options.catalogs, options.min_size, options.max_size, options.name_prefix)
+
+
+def batch_limits(queries) -> list:
+    """Page size of each query of a batch: its limit, else MAX_LIMIT."""
+    return [MAX_LIMIT if options.limit is None else options.limit for options in queries]
+
+
+def check_batch_size(count: int):
+    """Reject a batch whose pages hold more than MAX_BATCH_OBJECTS objects in all."""
+    if count > MAX_BATCH_OBJECTS:
+        raise HTTPException(status_code=422, detail=(
+            f"The batch would return {count} objects, more than {MAX_BATCH_OBJECTS}; "
+            "use smaller radii or per-query limits"))
+
+
+def stage_timer(request: Request, endpoint: str):
+    """Stage timer of an endpoint, a no-op when metrics are disabled."""
+    metrics = request.app.state.metrics
+    return metrics.timer(endpoint) if metrics is not None else NULL_TIMER
+
+
+def observe_result_size(request: Request, endpoint: str, count: int):
+    metrics = request.app.state.metrics
+    if metrics is not None:
+        metrics.result_sizes.observe(count, endpoint)
+
+
+async def run_search(request: Request, func, *args):
+    """Run CPU-bound search work in the app's executor, or inline when there is none."""
+    executor = request.app.state.executor
+    if executor is None:
+        return func(*args)
+    return await executor.run(func, *args)
+
+
+def check_admin_token(x_admin_token: str = Header(None)):
+    """Dependency rejecting admin requests without the configured token; 404 when none is configured."""
+    token = os.environ.get(ADMIN_TOKEN_ENV)
+    if not token:
+        raise HTTPException(status_code=404, detail=f"Admin endpoints are disabled; set {ADMIN_TOKEN_ENV}")
+    if not secrets.compare_digest((x_admin_token or '').encode(), token.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@router.get("/health")
+async def health_check(snapshot: CatalogSnapshot = Depends(get_snapshot)):
     """Health check endpoint."""
-    return {"status": "healthy", "catalog_count": len(catalog_data)}
+    return {
+        "status": "healthy",
+        "catalog_count": len(snapshot.store),
+        "catalog_version": snapshot.version,
+        "catalog_loaded_at": snapshot.loaded_at,
+    }
 
-@app.post("/search", response_model=SearchResponse)
-async def search_objects(coords: Coordinates):
+@router.post("/search", response_model=SearchResponse)
+async def search_objects(coords: Coordinates, request: Request,
+                         snapshot: CatalogSnapshot = Depends(get_snapshot)):
     """
     Search for deep space objects near the specified coordinates.
 
     Args:
-        coords: Search coordinates and radius
+        coords: Search coordinates, radius, optional page (limit/offset)
+            and optional filters (catalogs, size range, name prefix)
 
     Returns:
-        List of matching deep space objects
+        Matching deep space objects, nearest first, with their separations
     """
     try:
-        # Calculate angular distances using numpy for better performance
-        ra_diff = catalog_data['ra'] - coords.ra
-        dec_diff = catalog_data['dec'] - coords.dec
-
-        # Use spherical trigonometry for accurate distances (Haversine formula)
-        distances = (
-            2 * np.arcsin(np.sqrt(
-                np.sin(np.deg2rad(dec_diff) / 2) ** 2 +
-                np.cos(np.deg2rad(coords.dec)) *
-                np.cos(np.deg2rad(catalog_data['dec'])) *
-                np.sin(np.deg2rad(ra_diff) / 2) ** 2
-            )) * 180 / np.pi
-        )
-
-        # Filter objects within search radius
-        matches = catalog_data[distances <= coords.radius]
-
-        # Convert to response model
-        objects = [
-            DeepSpaceObject(
-                name=row['name'],
-                catalog=row['catalog'],
-                ra=row['ra'],
-                dec=row['dec'],
-                size=row['size']
-            )
-            for _, row in matches.iterrows()
-        ]
-
-        return SearchResponse(objects=objects, count=len(objects))
+        timer = stage_timer(request, '/search')
+        filters = attribute_filter(coords)
+        cache = request.app.state.cache
+        if cache is not None:
+            key = cache.key(snapshot.version, 'search', coords.ra, coords.dec, coords.radius,
+                            (coords.offset, coords.limit, filters.key()))
+            body = cache.get(key)
+            timer.lap('cache')
+            if body is not None:
+                return Response(content=body, media_type="application/json")
+
+        response = await run_search(request, _cone_search, request, snapshot.store, coords, filters, timer)
+        if cache is not None:
+            cache.put(key, response.body)
+        return response
 
+    except (Overloaded, SearchTimeout):
+        raise
     except Exception as e:
         logger.error(f"Error processing search request: {e}")
         raise HTTPException(status_code=500, detail="Search operation failed")
 
-@app.get("/catalogs")
-async def list_catalogs():
+def _cone_search(request: Request, catalog: CatalogStore, coords: Coordinates, filters: AttributeFilter,
+                 timer) -> Response:
+    timer.lap('queue')
+    result = cone_search(catalog, coords.ra, coords.dec, coords.radius, filters, coords.offset, coords.limit,
+                         lap=timer.lap)
+    observe_result_size(request, '/search', result.total)
+
+    # Serialize the matched columns directly; the bytes follow SearchResponse
+    response = search_response(catalog, result.rows, result.separations, result.total, coords.offset)
+    timer.lap('serialize')
+    return response
+
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def batch_search_objects(request: BatchSearchRequest, http_request: Request,
+                               catalog: CatalogStore = Depends(get_catalog)):
+    """
+    Search several cones in a single vectorized pass over the spatial index.
+
+    Args:
+        request: List of search coordinates and radii
+
+    Returns:
+        Matching deep space objects for each query, keyed by query index
+    """
+    try:
+        timer = stage_timer(http_request, '/search/batch')
+        return await run_search(http_request, _batch_search, http_request, catalog, request.queries, timer)
+    except (Overloaded, SearchTimeout, HTTPException):
+        raise
+    except Exception as e:
+        logger.error(f"Error processing batch search request: {e}")
+        raise HTTPException(status_code=500, detail="Batch search operation failed")
+
+def _batch_search(request: Request, catalog: CatalogStore, queries, timer) -> Response:
+    timer.lap('queue')
+    offsets = [coords.offset for coords in queries]
+    result = batch_search(
+        catalog,
+        [coords.ra for coords in queries], [coords.dec for coords in queries],
+        np.array([coords.radius for coords in queries]),
+        [attribute_filter(coords) for coords in queries], offsets, batch_limits(queries),
+        lap=timer.lap,
+    )
+    observe_result_size(request, '/search/batch', int(result.totals.sum()))
+    check_batch_size(len(result.rows))
+    response = batch_search_response(catalog, *result, offsets)
+    timer.lap('serialize')
+    return response
+
+def make_footprint(fov: FieldOfView) -> Footprint:
+    """The footprint described by a field-of-view request; ValueError if it is not searchable."""
+    if fov.vertices is not None:
+        ra, dec = zip(*fov.vertices)
+        return Footprint(ra, dec)
+    return Footprint.rectangle(fov.ra, fov.dec, fov.width, fov.height, fov.position_angle)
+
+@router.post("/search/fov", response_model=SearchResponse)
+async def search_field_of_view(fov: FieldOfView, request: Request,
+                               catalog: CatalogStore = Depends(get_catalog)):
+    """
+    Search for deep space objects inside a field of view.
+
+    Args:
+        fov: Rotated rectangle (ra, dec, width, height, position_angle) or
+            polygon vertices, with the paging and filters of /search
+
+    Returns:
+        Matching deep space objects, nearest to the field's centre first
+    """
+    try:
+        footprint = make_footprint(fov)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    try:
+        timer = stage_timer(request, '/search/fov')
+        return await run_search(request, _footprint_search, request, catalog, footprint, fov, timer)
+    except (Overloaded, SearchTimeout):
+        raise
+    except Exception as e:
+        logger.error(f"Error processing field of view search: {e}")
+        raise HTTPException(status_code=500, detail="Field of view search failed")
+
+def _footprint_search(request: Request, catalog: CatalogStore, footprint: Footprint, fov: FieldOfView,
+                      timer) -> Response:
+    timer.lap('queue')
+    rows = cone_candidates(catalog, footprint.ra, footprint.dec, footprint.radius, attribute_filter(fov))
+    timer.lap('candidates')
+    rows, dots = footprint_search(catalog, footprint, rows)
+    timer.lap('exact')
+    observe_result_size(request, '/search/fov', len(rows))
+    page = rows[page_by_separation(rows, dots, fov.offset, fov.limit)]
+    separations = catalog.separations(page, footprint.ra, footprint.dec)
+    timer.lap('order')
+    response = search_response(catalog, page, separations, len(rows), fov.offset)
+    timer.lap('serialize')
+    return response
+
+@router.post("/search/fov/batch", response_model=BatchSearchResponse)
+async def batch_search_fields_of_view(request: BatchFieldOfViewRequest, http_request: Request,
+                                      catalog: CatalogStore = Depends(get_catalog)):
+    """
+    Search many fields of view (e.g. a mosaic plan) in one vectorized pass.
+
+    Returns:
+        Matching deep space objects for each field, keyed by its index
+    """
+    footprints = []
+    for i, fov in enumerate(request.footprints):
+        try:
+            footprints.append(make_footprint(fov))
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=f"footprints[{i}]: {e}")
+    try:
+        timer = stage_timer(http_request, '/search/fov/batch')
+        return await run_search(http_request, _batch_footprint_search, http_request, catalog, footprints,
+                                request.footprints, timer)
+    except (Overloaded, SearchTimeout, HTTPException):
+        raise
+    except Exception as e:
+        logger.error(f"Error processing batch field of view search: {e}")
+        raise HTTPException(status_code=500, detail="Batch field of view search failed")
+
+def _batch_footprint_search(request: Request, catalog: CatalogStore, footprints, fovs, timer) -> Response:
+    timer.lap('queue')
+    offsets = [fov.offset for fov in fovs]
+    result = footprint_batch_search(catalog, footprints, [attribute_filter(fov) for fov in fovs], offsets,
+                                    batch_limits(fovs), lap=timer.lap)
+    observe_result_size(request, '/search/fov/batch', int(result.totals.sum()))
+    check_batch_size(len(result.rows))
+    response = batch_search_response(catalog, *result, offsets)
+    timer.lap('serialize')
+    return response
+
+@router.post("/visible", response_model=VisibilityResponse)
+async def visible_objects_in_window(plan: VisibilityRequest, request: Request,
+                                    catalog: CatalogStore = Depends(get_catalog)):
+    """
+    Objects that rise above an altitude for an observer during a time window.
+
+    Args:
+        plan: Observer latitude/longitude, start/end, step_minutes and
+            min_altitude, with the paging and filters of /search
+
+    Returns:
+        Objects reaching min_altitude at some step, highest first, with
+        when they peak and how long they stay above the limit
+    """
+    try:
+        timer = stage_timer(request, '/visible')
+        return await run_search(request, _visible, request, catalog, plan, timer)
+    except (Overloaded, SearchTimeout):
+        raise
+    except Exception as e:
+        logger.error(f"Error processing visibility request: {e}")
+        raise HTTPException(status_code=500, detail="Visibility computation failed")
+
+def _visible(request: Request, catalog: CatalogStore, plan: VisibilityRequest, timer) -> Response:
+    timer.lap('queue')
+    rows = filtered_rows(catalog, attribute_filter(plan))
+    timer.lap('candidates')
+    times = time_grid(plan.start.timestamp(), plan.end.timestamp(), plan.step_minutes * 60)
+    visibility = visible_objects(catalog, plan.latitude, plan.longitude, times, plan.min_altitude, rows)
+    timer.lap('altaz')
+    observe_result_size(request, '/visible', len(visibility.rows))
+    # Highest first: the sine of the peak altitude ranks like a cone search's dot product
+    page = page_by_separation(visibility.rows, visibility.max_sin_altitude, plan.offset, plan.limit)
+    timer.lap('order')
+    response = visibility_response(catalog, visibility, page, times, plan.step_minutes, plan.offset)
+    timer.lap('serialize')
+    return response
+
+@router.get("/tiles/{level}/{x}/{y}", response_model=TileResponse)
+async def sky_tile(
+    request: Request,
+    level: int = Path(..., ge=0, le=20),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    depth: int = Query(4, ge=0, le=6, description="Levels below the tile at which to report cells"),
+    limit: int = Query(1000, ge=1, le=100000, description="Maximum number of objects to list"),
+    catalog: CatalogStore = Depends(get_catalog),
+):
+    """
+    Object counts and size statistics on a hierarchical sky grid, for map clients.
+
+    Level L splits the sky into 2**L rows and 2**(L+1) columns of cells. The
+    tile reports its non-empty cells `depth` levels further down from the
+    pyramid precomputed at load time; from level TILE_OBJECTS_LEVEL on it
+    also lists its objects, largest first.
+    """
+    try:
+        check_cell(level, x, y)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    try:
+        timer = stage_timer(request, '/tiles')
+        return await run_search(request, _sky_tile, catalog, level, x, y, depth, limit, timer)
+    except (Overloaded, SearchTimeout):
+        raise
+    except Exception as e:
+        logger.error(f"Error processing tile request: {e}")
+        raise HTTPException(status_code=500, detail="Tile computation failed")
+
+def _sky_tile(catalog: CatalogStore, level: int, x: int, y: int, depth: int, limit: int, timer) -> Response:
+    timer.lap('queue')
+    density = catalog.density
+    ra_min, ra_max, dec_min, dec_max = cell_bounds(level, x, y)
+    tile = {"level": level, "x": x, "y": y, "ra_min": ra_min, "ra_max": ra_max,
+            "dec_min": dec_min, "dec_max": dec_max}
+    rows = None
+    if level >= TILE_OBJECTS_LEVEL:
+        rows = cell_rows(catalog, level, x, y)
+        tile["total"] = len(rows)
+        # Largest first, objects without a size last
+        order = np.lexsort((rows, -np.nan_to_num(catalog.size[rows], nan=-np.inf)))
+        rows = rows[order[:limit]]
+    else:
+        tile["total"] = density.count(level, x, y)
+    timer.lap('objects')
+    cell_level, xs, ys, stats = density.cells(level, x, y, depth)
+    timer.lap('cells')
+    response = tile_response(catalog, tile, cell_level, xs, ys, stats, rows)
+    timer.lap('serialize')
+    return response
+
+@router.post("/crossmatch")
+async def crossmatch_sources(
+    request: Request,
+    radius: float = Query(..., gt=0, le=10, description="Match tolerance in degrees"),
+    mode: str = Query("nearest", pattern="^(nearest|all)$",
+                      description="'nearest' for the closest object per source, 'all' for every object within radius"),
+    limit: int = Query(MAX_LIMIT, ge=1, le=MAX_LIMIT,
+                       description="Maximum number of matches per source in 'all' mode, nearest first"),
+    catalog: CatalogStore = Depends(get_catalog),
+):
+    """
+    Cross-match an uploaded source list (CSV or JSON body) against the catalog.
+
+    Returns:
+        Newline-delimited JSON streamed in chunks, one line per match with the
+        object fields plus the source's index and the separation in degrees
+    """
+    body = await request.body()
+    content_type = request.headers.get('content-type')
+    executor = request.app.state.executor
+    if executor is None:
+        try:
+            ra, dec = parse_sources(body, content_type)
+        except UploadError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        chunks = iter_crossmatch(catalog, ra, dec, radius, nearest=(mode == "nearest"), limit=limit)
+        return StreamingResponse(crossmatch_lines(catalog, chunks), media_type="application/x-ndjson")
+
+    # The whole cross-match holds one executor slot until the stream ends
+    executor.admit()
+    deadline = executor.deadline()
+    parsing = None
+    try:
+        parsing = executor.submit(parse_sources, body, content_type)
+        ra, dec = await executor.wait(parsing, deadline)
+    except UploadError as e:
+        executor.release_when_done(parsing)
+        raise HTTPException(status_code=422, detail=str(e))
+    except BaseException:
+        executor.release_when_done(parsing)
+        raise
+    chunks = iter_crossmatch(catalog, ra, dec, radius, nearest=(mode == "nearest"), limit=limit)
+    return StreamingResponse(_stream_in_executor(executor, crossmatch_lines(catalog, chunks), deadline),
+                             media_type="application/x-ndjson")
+
+_END = object()
+
+async def _stream_in_executor(executor: SearchExecutor, blocks, deadline):
+    """Yield the blocks of a blocking iterator, each produced in the executor; releases the slot."""
+    pending = None
+    try:
+        while True:
+            pending = executor.submit(next, blocks, _END)
+            block = await executor.wait(pending, deadline)
+            if block is _END:
+                return
+            yield block
+    except SearchTimeout as e:
+        # The status line is already sent; cut the stream short
+        logger.error(f"Cross-match stream aborted: {e}")
+        raise
+    finally:
+        # After a timeout or disconnect the block being produced keeps the slot until it is done
+        executor.release_when_done(pending)
+
+@router.get("/objects/{name}", response_model=ObjectLookupResponse)
+async def lookup_object(name: str, catalog: CatalogStore = Depends(get_catalog)):
+    """
+    Look up an object by designation or common name.
+
+    Spacing, case and leading zeros do not matter, so "M 31", "m31",
+    "NGC0224" and "Andromeda Galaxy" all find M31; entries for the same
+    object in other catalogs are returned as `linked`.
+    """
+    row, linked = catalog.names.resolve(name)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"No object named {name!r}")
+    return object_lookup_response(catalog, row, linked)
+
+@router.get("/autocomplete", response_model=AutocompleteResponse)
+async def autocomplete_names(
+    q: str = Query(..., min_length=1, max_length=64, description="Beginning of a designation or common name"),
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of suggestions"),
+    catalog: CatalogStore = Depends(get_catalog),
+):
+    """Suggest objects whose designation or common name starts with `q`."""
+    return autocomplete_response(catalog, catalog.names.complete(q, limit))
+
+@router.get("/catalogs")
+async def list_catalogs(snapshot: CatalogSnapshot = Depends(get_snapshot)):
     """List available catalogs and their object counts."""
     try:
-        counts = catalog_data['catalog'].value_counts().to_dict()
         return {
-            "catalogs": counts,
-            "total_objects": len(catalog_data)
+            "catalogs": snapshot.store.catalog_counts(),
+            "total_objects": len(snapshot.store),
+            "version": snapshot.version
         }
     except Exception as e:
         logger.error(f"Error listing catalogs: {e}")
         raise HTTPException(status_code=500, detail="Failed to list catalogs")
+
+@router.get("/cache/stats")
+async def cache_stats(request: Request):
+    """Hit, miss and eviction counters of the query result cache."""
+    cache = request.app.state.cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+@router.get("/metrics")
+async def prometheus_metrics(request: Request):
+    """Request, search stage, cache and catalog metrics in the Prometheus text format."""
+    registry = request.app.state.metrics
+    if registry is None:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    body = registry.render(request.app.state.catalog, request.app.state.cache, request.app.state.executor)
+    return Response(content=body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@router.get("/debug/profiles", dependencies=[Depends(check_admin_token)])
+async def slow_request_profiles(request: Request):
+    """Sampled stacks of the most recent slow requests, if profiling is enabled."""
+    profiler = request.app.state.profiler
+    if profiler is None:
+        return {"enabled": False}
+    return {"enabled": True, "threshold_ms": profiler.threshold * 1000, "profiles": profiler.profiles()}
+
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(status_code=429, headers={"Retry-After": "1"},
+                        content={"detail": "Too many searches in progress, retry later"})
+
+async def search_timeout_handler(request: Request, exc: SearchTimeout):
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+@router.post("/admin/reload", dependencies=[Depends(check_admin_token)])
+async def reload_catalog(
+    request: Request,
+    wait: bool = Query(False, description="Wait for the new version to be active before responding"),
+    force: bool = Query(False, description="Reload even if the catalog files are unchanged"),
+):
+    """
+    Load the catalog files again and atomically swap in the new version.
+
+    Searches already running finish against the version they started with.
+    """
+    holder = request.app.state.catalog
+    if not wait:
+        version = holder.snapshot().version
+        holder.reload_in_background(force=force)
+        return JSONResponse(status_code=202, content={"status": "reloading", "version": version})
+    try:
+        reloaded = await run_in_threadpool(holder.reload, force)
+    except Exception as e:
+        logger.error(f"Error reloading catalog: {e}")
+        raise HTTPException(status_code=500, detail="Failed to reload catalog")
+    return {"status": "reloaded" if reloaded else "unchanged", "version": holder.snapshot().version}
+
+
+def create_app(catalog_dir=None, preload: bool = None, watch_interval: float = None,
+               cache: QueryCache = None, metrics: bool = None,
+               profiler: SlowRequestProfiler = None, executor: SearchExecutor = None) -> FastAPI:
+    """
+    Build the API application.
+
+    Args:
+        catalog_dir: Directory with the processed catalogs; defaults to
+            $DSO_SEARCH_CATALOG_DIR or the repository's data/processed
+        preload: Load the catalog immediately instead of at startup;
+            defaults to whether $DSO_SEARCH_PRELOAD is set
+        watch_interval: Seconds between checks of the catalog files for
+            changes while the app runs; defaults to
+            $DSO_SEARCH_WATCH_INTERVAL, and 0 disables the watcher
+        cache: Result cache for /search; defaults to one configured by the
+            $DSO_SEARCH_CACHE_* variables
+        metrics: Collect the metrics served at /metrics; defaults to
+            true unless $DSO_SEARCH_METRICS is 0
+        profiler: Slow request profiler; defaults to one configured by the
+            $DSO_SEARCH_PROFILE_* variables (off unless set)
+        executor: Worker pool for search work; defaults to one configured
+            by $DSO_SEARCH_WORKERS, $DSO_SEARCH_QUEUE_SIZE and
+            $DSO_SEARCH_TIMEOUT
+
+    Returns:
+        FastAPI application whose catalog is loaded once, by the lifespan
+        handler or on the first request, whichever comes first
+    """
+    holder = CatalogHolder(catalog_dir)
+    if preload is None:
+        preload = bool(os.environ.get(PRELOAD_ENV))
+    if preload:
+        holder.get()
+
+    if watch_interval is None:
+        watch_interval = float(os.environ.get(WATCH_INTERVAL_ENV) or 0)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        holder.get()
+        if watch_interval > 0:
+            holder.start_watching(watch_interval)
+        yield
+        holder.stop_watching()
+        if app.state.executor is not None:
+            app.state.executor.shutdown()
+
+    app = FastAPI(
+        title="Deep Space Object Search API",
+        description="Search for deep space objects by coordinates across multiple astronomical catalogs",
+        version="1.0.0",
+        lifespan=lifespan,
+    )
+    app.state.catalog = holder
+    app.state.cache = cache if cache is not None else QueryCache.from_environment()
+    if metrics is None:
+        metrics = os.environ.get(METRICS_ENV, '1') != '0'
+    app.state.metrics = Metrics() if metrics else None
+    app.state.profiler = profiler if profiler is not None else SlowRequestProfiler.from_environment()
+    app.state.executor = executor if executor is not None else SearchExecutor.from_environment()
+    app.add_exception_handler(Overloaded, overloaded_handler)
+    app.add_exception_handler(SearchTimeout, search_timeout_handler)
+
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    if app.state.metrics is not None or app.state.profiler is not None:
+        app.add_middleware(MetricsMiddleware, metrics=app.state.metrics, profiler=app.state.profiler)
+    app.include_router(router)
+    return app
+
+
+app = create_app()
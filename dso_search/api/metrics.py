@@ -0,0 +1,283 @@
+"""
+Prometheus-style metrics for the API.
+
+A small in-process registry of counters, gauges and histograms, rendered in
+the Prometheus text exposition format at GET /metrics. It records:
+
+    dso_requests_total                 requests by method, endpoint and status
+    dso_request_duration_seconds       latency histogram per endpoint
+    dso_search_stage_seconds           time per stage inside the search
+                                       endpoints (candidates, exact, order,
+                                       serialize)
+    dso_search_result_objects          histogram of matched objects per request
+    dso_cache_*                        result cache counters
+    dso_executor_*                     search worker pool load and rejections
+    dso_catalog_*                      size and load time of the active catalog
+
+Every update is a dictionary lookup and an addition under a lock, so the
+overhead is a few microseconds per request. Set DSO_SEARCH_METRICS=0 to turn
+it off entirely: requests are not timed, the stage timers are no-ops and
+/metrics answers 404.
+"""
+import bisect
+import math
+import threading
+import time
+from typing import Optional
+
+# Set to 0 to disable metrics collection
+METRICS_ENV = 'DSO_SEARCH_METRICS'
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (0, 1, 10, 100, 1000, 10_000, 100_000, 1_000_000)
+
+
+def _format_labels(names, values) -> str:
+    if not names:
+        return ''
+    pairs = (f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + ','.join(pairs) + '}'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Base of the metric types: a name, help text and label names."""
+
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> list:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+
+
+class Counter(Metric):
+    """A monotonically increasing value per label set."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels=()):
+        super().__init__(name, documentation, labels)
+        self._values = {}
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f'{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}'
+                                for labels, value in items]
+
+
+class Gauge(Counter):
+    """A value per label set that can go up and down."""
+
+    kind = 'gauge'
+
+    def set(self, *labels, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    """Observations counted in cumulative buckets, with their sum and count."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def count(self, *labels) -> int:
+        entry = self._values.get(labels)
+        return sum(entry[0]) if entry else 0
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+        lines = self.header()
+        names = self.labels + ('le',)
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} '
+                             f'{cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labels, labels)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(self.labels, labels)} {cumulative}')
+        return lines
+
+
+class StageTimer:
+    """Records the time since the previous lap as one stage of an endpoint."""
+
+    __slots__ = ('_histogram', '_endpoint', '_last')
+
+    def __init__(self, histogram: Histogram, endpoint: str):
+        self._histogram = histogram
+        self._endpoint = endpoint
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        self._histogram.observe(now - self._last, self._endpoint, stage)
+        self._last = now
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def lap(self, stage: str):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """The metrics of one application."""
+
+    def __init__(self):
+        self.requests = Counter('dso_requests_total', 'HTTP requests handled.',
+                                ('method', 'endpoint', 'status'))
+        self.latency = Histogram('dso_request_duration_seconds', 'Time to answer a request.',
+                                 ('endpoint',))
+        self.stages = Histogram('dso_search_stage_seconds', 'Time spent in each stage of a search.',
+                                ('endpoint', 'stage'))
+        self.result_sizes = Histogram('dso_search_result_objects', 'Objects matched per search request.',
+                                      ('endpoint',), buckets=SIZE_BUCKETS)
+        self._metrics = [self.requests, self.latency, self.stages, self.result_sizes]
+
+    def timer(self, endpoint: str) -> StageTimer:
+        """A stage timer starting now; call lap(stage) at the end of every stage."""
+        return StageTimer(self.stages, endpoint)
+
+    def observe_request(self, method: str, endpoint: str, status: int, seconds: float):
+        self.requests.inc(method, endpoint, str(status))
+        self.latency.observe(seconds, endpoint)
+
+    def render(self, holder=None, cache=None, executor=None) -> str:
+        """
+        All metrics in the text exposition format.
+
+        Args:
+            holder: CatalogHolder, for the catalog metrics
+            cache: QueryCache, for the cache counters
+            executor: SearchExecutor, for the worker pool counters
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        if holder is not None:
+            lines.extend(_single(Counter, 'dso_catalog_loads_total', 'Catalog snapshots loaded.', holder.loads))
+        if holder is not None and holder.loaded:
+            snapshot = holder.snapshot()
+            lines.extend(_single(Gauge, 'dso_catalog_load_seconds', 'Time taken to load the active catalog.',
+                                 snapshot.load_seconds))
+            objects = Gauge('dso_catalog_objects', 'Objects in the active catalog.', ('catalog',))
+            for catalog, count in snapshot.store.catalog_counts().items():
+                objects.set(catalog, value=count)
+            lines.extend(objects.render())
+        if cache is not None:
+            stats = cache.stats()
+            for key in ('hits', 'misses', 'evictions', 'shared_hits'):
+                lines.extend(_single(Counter, f'dso_cache_{key}_total', f'Result cache {key.replace("_", " ")}.',
+                                     stats[key]))
+            for key in ('entries', 'bytes', 'max_entries', 'max_bytes'):
+                lines.extend(_single(Gauge, f'dso_cache_{key}', f'Result cache {key.replace("_", " ")}.',
+                                     stats[key]))
+        if executor is not None:
+            stats = executor.stats()
+            lines.extend(_single(Gauge, 'dso_executor_in_progress', 'Searches running or queued.',
+                                 stats['in_progress']))
+            lines.extend(_single(Gauge, 'dso_executor_capacity', 'Searches that may run or queue at once.',
+                                 stats['workers'] + stats['queue_size']))
+            lines.extend(_single(Counter, 'dso_executor_rejected_total', 'Searches rejected with 429.',
+                                 stats['rejected']))
+            lines.extend(_single(Counter, 'dso_executor_timeouts_total', 'Searches that timed out (504).',
+                                 stats['timeouts']))
+        return '\n'.join(lines) + '\n'
+
+
+def _single(kind, name: str, documentation: str, value) -> list:
+    metric = kind(name, documentation)
+    metric._values[()] = value
+    return metric.render()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording count and latency of every HTTP request.
+
+    Requests are labelled with their route template (e.g. /objects/{name}),
+    so path parameters do not create a series each. Latency runs until the
+    last body chunk is sent, which includes streamed responses. When a
+    SlowRequestProfiler is given, it samples every request.
+    """
+
+    def __init__(self, app, metrics: Optional[Metrics], profiler=None):
+        self.app = app
+        self.metrics = metrics
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = [500]
+        done = [False]
+
+        def finish():
+            if done[0]:
+                return
+            done[0] = True
+            endpoint = getattr(scope.get('route'), 'path', None) or 'unmatched'
+            elapsed = time.perf_counter() - start
+            if self.metrics is not None:
+                self.metrics.observe_request(scope['method'], endpoint, status[0], elapsed)
+            if sample is not None:
+                self.profiler.finish(sample, f"{scope['method']} {scope['path']}", elapsed)
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+            await send(message)
+            if message['type'] == 'http.response.body' and not message.get('more_body', False):
+                finish()
+
+        sample = self.profiler.start() if self.profiler is not None else None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish()
@@ -2,17 +2,80 @@
 Models for the DSO Search API.
 Defines Pydantic models for request/response validation and documentation.
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Tuple
 
+from pydantic import BaseModel, Field, model_validator
 
-class Coordinates(BaseModel):
+# Longest time grid accepted by /visible
+MAX_TIME_STEPS = 10000
+# Largest page of objects per query; also the page size of batch queries without a limit
+MAX_LIMIT = 100000
+# Most objects one batch response may hold across all of its queries
+MAX_BATCH_OBJECTS = 1000000
+
+
+class SearchOptions(BaseModel):
+    """Paging and attribute filters shared by every search type."""
+    limit: Optional[int] = Field(None, ge=1, le=MAX_LIMIT,
+                                 description="Maximum number of objects to return, nearest first")
+    offset: int = Field(0, ge=0, description="Number of nearest objects to skip")
+    catalogs: Optional[List[str]] = Field(None, description="Only return objects from these catalogs (e.g., NGC)")
+    min_size: Optional[float] = Field(None, ge=0, description="Minimum object size in arcminutes")
+    max_size: Optional[float] = Field(None, ge=0, description="Maximum object size in arcminutes")
+    name_prefix: Optional[str] = Field(None, min_length=1, max_length=64,
+                                       description="Only return objects whose designation starts with this (e.g., NGC 70)")
+
+    @model_validator(mode='after')
+    def check_size_range(self):
+        if self.min_size is not None and self.max_size is not None and self.min_size > self.max_size:
+            raise ValueError("min_size must not exceed max_size")
+        return self
+
+
+class Coordinates(SearchOptions):
     """Coordinates for searching deep space objects."""
     ra: float = Field(..., ge=0, lt=360, description="Right Ascension in degrees (J2000)")
     dec: float = Field(..., ge=-90, le=90, description="Declination in degrees (J2000)")
     radius: Optional[float] = Field(1.0, gt=0, le=180, description="Search radius in degrees")
 
 
+class FieldOfView(SearchOptions):
+    """
+    A field of view: a rotated rectangle around a centre, or a spherical polygon.
+
+    Give either ra/dec/width/height (and optionally position_angle) or vertices.
+    """
+    ra: Optional[float] = Field(None, ge=0, lt=360, description="Right Ascension of the centre in degrees (J2000)")
+    dec: Optional[float] = Field(None, ge=-90, le=90, description="Declination of the centre in degrees (J2000)")
+    width: Optional[float] = Field(None, gt=0, lt=180, description="Width of the field in degrees")
+    height: Optional[float] = Field(None, gt=0, lt=180, description="Height of the field in degrees")
+    position_angle: float = Field(0.0, ge=-360, le=360,
+                                  description="Angle of the height axis from north through east in degrees")
+    vertices: Optional[List[Tuple[float, float]]] = Field(
+        None, min_length=3, max_length=1000,
+        description="Polygon vertices as [ra, dec] pairs in degrees, joined by great circles")
+
+    @model_validator(mode='after')
+    def check_shape(self):
+        rectangle = (self.ra, self.dec, self.width, self.height)
+        if self.vertices is not None:
+            if any(value is not None for value in rectangle):
+                raise ValueError("Give either vertices or ra/dec/width/height, not both")
+            for ra, dec in self.vertices:
+                if not (0 <= ra < 360 and -90 <= dec <= 90):
+                    raise ValueError("Vertex coordinates must satisfy 0 <= ra < 360 and -90 <= dec <= 90")
+        elif any(value is None for value in rectangle):
+            raise ValueError("Give either vertices or all of ra, dec, width and height")
+        return self
+
+
+class BatchFieldOfViewRequest(BaseModel):
+    """Several fields of view submitted together, e.g. the tiles of a mosaic."""
+    footprints: List[FieldOfView] = Field(..., min_length=1, max_length=10000,
+                                          description="Fields of view to search, answered in one pass")
+
+
 class DeepSpaceObject(BaseModel):
     """Deep space object information."""
     name: str = Field(..., description="Object designation (e.g., M31, NGC 7000)")
@@ -20,9 +83,120 @@ class DeepSpaceObject(BaseModel):
     ra: float = Field(..., description="Right Ascension in degrees (J2000)")
     dec: float = Field(..., description="Declination in degrees (J2000)")
     size: Optional[float] = Field(None, description="Object size in arcminutes")
+    separation: Optional[float] = Field(None, description="Angular distance from the search position in degrees")
 
 
 class SearchResponse(BaseModel):
     """Response model for object searches."""
-    objects: List[DeepSpaceObject] = Field(..., description="List of matching deep space objects")
-    count: int = Field(..., description="Total number of objects found")
+    objects: List[DeepSpaceObject] = Field(..., description="Matching deep space objects, nearest first")
+    count: int = Field(..., description="Number of objects returned")
+    total: Optional[int] = Field(None, description="Total number of objects found")
+    next_offset: Optional[int] = Field(None, description="Offset of the next page, if there are more objects")
+
+
+class BatchSearchRequest(BaseModel):
+    """Several cone searches submitted together."""
+    queries: List[Coordinates] = Field(..., min_length=1, max_length=10000,
+                                       description="Cones to search, answered in one pass")
+
+
+class BatchSearchResponse(BaseModel):
+    """Response model for batch searches."""
+    results: Dict[int, SearchResponse] = Field(
+        ..., description="Search results keyed by the position of the query in the request")
+    count: int = Field(..., description="Number of queries answered")
+
+
+class VisibilityRequest(SearchOptions):
+    """An observer, a time window and an altitude limit for planning a night."""
+    latitude: float = Field(..., ge=-90, le=90, description="Observer latitude in degrees")
+    longitude: float = Field(..., ge=-180, le=360, description="Observer longitude in degrees, east positive")
+    start: datetime = Field(..., description="Start of the window (UTC unless an offset is given)")
+    end: datetime = Field(..., description="End of the window (UTC unless an offset is given)")
+    step_minutes: float = Field(5.0, gt=0, le=1440, description="Spacing of the time grid in minutes")
+    min_altitude: float = Field(30.0, ge=-90, lt=90, description="Minimum altitude in degrees")
+
+    @model_validator(mode='after')
+    def check_window(self):
+        if self.start.tzinfo is None:
+            self.start = self.start.replace(tzinfo=timezone.utc)
+        if self.end.tzinfo is None:
+            self.end = self.end.replace(tzinfo=timezone.utc)
+        if self.end < self.start:
+            raise ValueError("end must not be before start")
+        if (self.end - self.start).total_seconds() / (self.step_minutes * 60) >= MAX_TIME_STEPS:
+            raise ValueError(f"The time window may have at most {MAX_TIME_STEPS} steps")
+        return self
+
+
+class VisibleObject(BaseModel):
+    """A deep space object with its visibility over the time window."""
+    name: str = Field(..., description="Object designation (e.g., M31, NGC 7000)")
+    catalog: str = Field(..., description="Source catalog (e.g., Messier, NGC)")
+    ra: float = Field(..., description="Right Ascension in degrees (J2000)")
+    dec: float = Field(..., description="Declination in degrees (J2000)")
+    size: Optional[float] = Field(None, description="Object size in arcminutes")
+    max_altitude: float = Field(..., description="Highest altitude over the time grid in degrees")
+    min_airmass: Optional[float] = Field(
+        None, description="Airmass at the highest altitude (secant of the zenith angle); null below the horizon")
+    best_time: datetime = Field(..., description="Time step of the highest altitude")
+    first_visible: datetime = Field(..., description="First time step above the altitude limit")
+    last_visible: datetime = Field(..., description="Last time step above the altitude limit")
+    visible_minutes: float = Field(..., description="Time above the altitude limit, in grid steps times the step")
+
+
+class VisibilityResponse(BaseModel):
+    """Response model for visibility planning."""
+    objects: List[VisibleObject] = Field(..., description="Objects above the altitude limit, highest first")
+    count: int = Field(..., description="Number of objects returned")
+    total: int = Field(..., description="Total number of objects above the altitude limit")
+    next_offset: Optional[int] = Field(None, description="Offset of the next page, if there are more objects")
+    steps: int = Field(..., description="Number of time steps evaluated")
+
+
+class SkyCell(BaseModel):
+    """Object count and size statistics of one sky cell."""
+    x: int = Field(..., description="Column of the cell at the response's cell_level")
+    y: int = Field(..., description="Row of the cell at the response's cell_level")
+    count: int = Field(..., description="Objects in the cell")
+    sized: int = Field(..., description="Objects in the cell with a known size")
+    mean_size: Optional[float] = Field(None, description="Mean size of those objects in arcminutes")
+    min_size: Optional[float] = Field(None, description="Smallest size in arcminutes")
+    max_size: Optional[float] = Field(None, description="Largest size in arcminutes")
+
+
+class TileResponse(BaseModel):
+    """Response model for sky tiles."""
+    level: int = Field(..., description="Level of the tile")
+    x: int = Field(..., description="Column of the tile")
+    y: int = Field(..., description="Row of the tile")
+    ra_min: float = Field(..., description="Lower Right Ascension bound in degrees")
+    ra_max: float = Field(..., description="Upper Right Ascension bound in degrees")
+    dec_min: float = Field(..., description="Lower Declination bound in degrees")
+    dec_max: float = Field(..., description="Upper Declination bound in degrees")
+    total: int = Field(..., description="Objects in the tile")
+    cell_level: Optional[int] = Field(None, description="Level of the cells; null below the deepest precomputed level")
+    cells: List[SkyCell] = Field(..., description="Non-empty cells of the tile in row-major order")
+    objects: Optional[List[DeepSpaceObject]] = Field(
+        None, description="Objects in the tile, largest first; only listed at deep levels")
+
+
+class ObjectLookupResponse(BaseModel):
+    """Response model for name lookups."""
+    object: DeepSpaceObject = Field(..., description="Best match for the requested name")
+    common_name: Optional[str] = Field(None, description="Common name of the object (e.g., Andromeda Galaxy)")
+    aliases: List[str] = Field(..., description="Other designations of the object (e.g., NGC 224 for M31)")
+    linked: List[DeepSpaceObject] = Field(
+        ..., description="Entries in other catalogs for the same object")
+
+
+class NameSuggestion(BaseModel):
+    """One autocomplete suggestion."""
+    match: str = Field(..., description="Designation or common name that matched the prefix")
+    name: str = Field(..., description="Designation of the suggested object")
+    catalog: str = Field(..., description="Source catalog of the suggested object")
+
+
+class AutocompleteResponse(BaseModel):
+    """Response model for name autocompletion."""
+    suggestions: List[NameSuggestion] = Field(..., description="Suggestions in name order")
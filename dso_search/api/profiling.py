@@ -0,0 +1,161 @@
+"""
+Opt-in sampling profiler for slow requests.
+
+While a request is running, a background thread samples the stack of the
+thread serving it every few milliseconds. If the request then takes longer
+than the threshold, the sampled stacks are kept (the most recent few are
+served at GET /debug/profiles) and the hottest ones are logged; otherwise
+they are discarded. Searches run in SearchExecutor worker threads: while a
+worker runs a task for the request, that worker is sampled instead of the
+request's own thread. Async endpoint code runs on the event loop thread, so
+when several requests overlap its samples can include work done for another.
+
+Enable it with DSO_SEARCH_PROFILE_SLOW_MS=<threshold in ms>; the sampling
+interval is DSO_SEARCH_PROFILE_INTERVAL_MS (default 5). When disabled nothing
+is sampled and the sampler thread is never started.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SLOW_MS_ENV = 'DSO_SEARCH_PROFILE_SLOW_MS'
+PROFILE_INTERVAL_MS_ENV = 'DSO_SEARCH_PROFILE_INTERVAL_MS'
+
+DEFAULT_INTERVAL = 0.005
+DEFAULT_KEEP = 20
+MAX_DEPTH = 64
+TOP_STACKS = 20
+
+
+class _Sample:
+    __slots__ = ('threads', 'stacks')
+
+    def __init__(self, thread_id: int):
+        # The request's own thread, then workers running tasks for it; the last is sampled
+        self.threads = [thread_id]
+        self.stacks = Counter()
+
+
+# Sample of the request served in the current context, if it is being profiled
+_current_sample = ContextVar('profiled_request', default=None)
+
+
+@contextmanager
+def sampling_this_thread():
+    """
+    Sample the calling thread for the current context's request, if any,
+    until the block exits. Worker threads use it with the submitting
+    request's context.
+    """
+    sample = _current_sample.get()
+    if sample is None:
+        yield
+        return
+    thread_id = threading.get_ident()
+    sample.threads.append(thread_id)
+    try:
+        yield
+    finally:
+        sample.threads.remove(thread_id)
+
+
+def _collapse(frame) -> str:
+    """A stack as 'outer;...;inner' with function (file:line) entries."""
+    entries = []
+    while frame is not None and len(entries) < MAX_DEPTH:
+        code = frame.f_code
+        entries.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(entries))
+
+
+class SlowRequestProfiler:
+    """
+    Samples the stacks of running requests and keeps those of slow ones.
+
+    Args:
+        threshold: Seconds a request must take for its profile to be kept
+        interval: Seconds between samples
+        keep: Number of recent slow-request profiles to keep
+    """
+
+    def __init__(self, threshold: float, interval: float = DEFAULT_INTERVAL, keep: int = DEFAULT_KEEP):
+        self.threshold = threshold
+        self.interval = interval
+        self._profiles = deque(maxlen=keep)
+        self._active = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._sampler = None
+
+    @classmethod
+    def from_environment(cls) -> Optional["SlowRequestProfiler"]:
+        """The profiler configured by DSO_SEARCH_PROFILE_*; None if disabled."""
+        threshold_ms = os.environ.get(PROFILE_SLOW_MS_ENV)
+        if not threshold_ms:
+            return None
+        interval_ms = float(os.environ.get(PROFILE_INTERVAL_MS_ENV) or DEFAULT_INTERVAL * 1000)
+        return cls(float(threshold_ms) / 1000, interval_ms / 1000)
+
+    def start(self) -> _Sample:
+        """
+        Begin sampling the calling thread; pass the result to finish(). Work
+        run within sampling_this_thread() in the calling context is sampled too.
+        """
+        sample = _Sample(threading.get_ident())
+        _current_sample.set(sample)
+        with self._lock:
+            self._active.add(sample)
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._sampler.start()
+        self._wake.set()
+        return sample
+
+    def finish(self, sample: _Sample, label: str, elapsed: float):
+        """Stop sampling; keep and log the profile if the request was slow."""
+        if _current_sample.get() is sample:
+            _current_sample.set(None)
+        with self._lock:
+            self._active.discard(sample)
+            stacks = list(sample.stacks.most_common(TOP_STACKS))
+            total = sum(sample.stacks.values())
+        if elapsed < self.threshold:
+            return
+        profile = {
+            'request': label,
+            'duration_ms': round(elapsed * 1000, 3),
+            'samples': total,
+            'stacks': [{'stack': stack, 'samples': count} for stack, count in stacks],
+        }
+        self._profiles.append(profile)
+        hottest = '; '.join(f"{count}x {stack.rsplit(';', 1)[-1]}" for stack, count in stacks[:3])
+        logger.warning(f"Slow request {label}: {elapsed * 1000:.1f} ms, {total} samples; hottest: {hottest}")
+
+    def profiles(self) -> list:
+        """Kept profiles, most recent first."""
+        return list(reversed(self._profiles))
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            if not self._active:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for sample in self._active:
+                    thread_id = sample.threads[-1]
+                    frame = frames.get(thread_id)
+                    if frame is not None and thread_id != own:
+                        sample.stacks[_collapse(frame)] += 1
@@ -0,0 +1,162 @@
+"""
+Bulk JSON encoding of search results.
+
+Responses are assembled column-wise from the catalog store and encoded in a
+single pydantic-core call instead of instantiating one DeepSpaceObject per
+match. The bytes are identical to what FastAPI emits for the equivalent
+SearchResponse model, so the documented schema is unchanged.
+"""
+import numpy as np
+from fastapi import Response
+from pydantic_core import to_json
+
+
+def object_records(catalog, rows, separations=None) -> list:
+    """Build DeepSpaceObject-shaped dicts for the given store rows."""
+    separations = [None] * len(rows) if separations is None else separations.tolist()
+    return [
+        {"name": name, "catalog": catalog_name, "ra": ra, "dec": dec, "size": size,
+         "separation": separation}
+        for name, catalog_name, ra, dec, size, separation in zip(
+            catalog.name[rows].tolist(),
+            catalog.catalog_of(rows).tolist(),
+            catalog.ra[rows].tolist(),
+            catalog.dec[rows].tolist(),
+            catalog.size[rows].tolist(),
+            separations,
+        )
+    ]
+
+
+def _page(objects, total, offset):
+    """SearchResponse-shaped dict for one page of objects."""
+    end = offset + len(objects)
+    return {"objects": objects, "count": len(objects), "total": total,
+            "next_offset": end if end < total else None}
+
+
+def json_response(content) -> Response:
+    """Encode already-shaped content; NaN sizes become null like the models do."""
+    return Response(content=to_json(content, inf_nan_mode='null'), media_type="application/json")
+
+
+def search_response(catalog, rows, separations=None, total=None, offset=0) -> Response:
+    """Serialized SearchResponse for one page of store rows."""
+    objects = object_records(catalog, rows, separations)
+    return json_response(_page(objects, len(objects) if total is None else total, offset))
+
+
+def batch_search_response(catalog, query_ids, rows, separations, totals, offsets) -> Response:
+    """Serialized BatchSearchResponse for pages of rows grouped by query."""
+    objects = object_records(catalog, rows, separations)
+    n_queries = len(totals)
+    bounds = np.searchsorted(query_ids, np.arange(n_queries + 1)).tolist()
+    results = {
+        i: _page(objects[start:stop], total, offset)
+        for i, (start, stop, total, offset) in enumerate(
+            zip(bounds[:-1], bounds[1:], totals.tolist(), offsets))
+    }
+    return json_response({"results": results, "count": n_queries})
+
+
+def _timestamps(unix_seconds) -> list:
+    """ISO 8601 UTC strings, to the second, for POSIX timestamps."""
+    seconds = np.round(np.asarray(unix_seconds, dtype=np.float64)).astype(np.int64).astype('datetime64[s]')
+    return np.datetime_as_string(seconds, timezone='UTC').tolist()
+
+
+def visibility_response(catalog, visibility, page, times, step_minutes: float, offset: int) -> Response:
+    """
+    Serialized VisibilityResponse for one page of a Visibility result.
+
+    Args:
+        page: Positions into the visibility arrays, in response order
+        times: The time grid as POSIX timestamps
+    """
+    rows = visibility.rows[page]
+    sin_altitude = visibility.max_sin_altitude[page]
+    objects = [
+        dict(record, max_altitude=altitude, min_airmass=airmass, best_time=best, first_visible=first,
+             last_visible=last, visible_minutes=minutes)
+        for record, altitude, airmass, best, first, last, minutes in zip(
+            object_records(catalog, rows),
+            np.rad2deg(np.arcsin(np.clip(sin_altitude, -1.0, 1.0))).tolist(),
+            np.where(sin_altitude > 0, 1.0 / np.maximum(sin_altitude, 1e-12), np.inf).tolist(),
+            _timestamps(times[visibility.best_step[page]]),
+            _timestamps(times[visibility.first_step[page]]),
+            _timestamps(times[visibility.last_step[page]]),
+            (visibility.visible_steps[page] * step_minutes).tolist(),
+        )
+    ]
+    for record in objects:
+        del record["separation"]
+    return json_response(dict(_page(objects, len(visibility.rows), offset), steps=len(times)))
+
+
+def tile_response(catalog, tile: dict, cell_level, xs, ys, stats, rows=None) -> Response:
+    """
+    Serialized TileResponse.
+
+    Args:
+        tile: level, x, y, bounds and total of the tile
+        xs, ys, stats: Non-empty cells and their CellStats, from
+            DensityPyramid.cells()
+        rows: Store rows to list as objects, or None at shallow levels
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = stats.size_sum / stats.sized
+    cells = [
+        {"x": x, "y": y, "count": count, "sized": sized, "mean_size": mean_size,
+         "min_size": min_size, "max_size": max_size}
+        for x, y, count, sized, mean_size, min_size, max_size in zip(
+            xs.tolist(), ys.tolist(), stats.count.tolist(), stats.sized.tolist(), mean.tolist(),
+            stats.size_min.tolist(), stats.size_max.tolist())
+    ]
+    objects = None if rows is None else object_records(catalog, rows)
+    return json_response(dict(tile, cell_level=cell_level, cells=cells, objects=objects))
+
+
+def object_lookup_response(catalog, row: int, linked) -> Response:
+    """Serialized ObjectLookupResponse for a resolved row and its linked rows."""
+    rows = np.concatenate([[row], linked]).astype(np.int64)
+    record, *linked_records = object_records(catalog, rows)
+    aliases = []
+    for column in ('name', 'ngc_name', 'aliases', 'common_name'):
+        for value in getattr(catalog, column)[rows].tolist():
+            for alias in value.split(';') if value else ():
+                if alias != record["name"] and alias not in aliases:
+                    aliases.append(alias)
+    common_name = catalog.common_name[row] or None
+    if common_name in aliases:
+        aliases.remove(common_name)
+    return json_response({"object": record, "common_name": common_name, "aliases": aliases,
+                          "linked": linked_records})
+
+
+def autocomplete_response(catalog, suggestions) -> Response:
+    """Serialized AutocompleteResponse for (match, row) pairs."""
+    rows = np.array([row for _, row in suggestions], dtype=np.int64)
+    return json_response({"suggestions": [
+        {"match": match, "name": name, "catalog": catalog_name}
+        for (match, _), name, catalog_name in zip(
+            suggestions, catalog.name[rows].tolist(), catalog.catalog_of(rows).tolist())
+    ]})
+
+
+def crossmatch_lines(catalog, chunks):
+    """
+    Encode cross-match chunks as newline-delimited JSON, one match per line.
+
+    Each line carries the DeepSpaceObject fields, with the separation from
+    the source in degrees, plus `source_index`. One bytes block is yielded
+    per chunk.
+    """
+    for source_ids, rows, separations in chunks:
+        if not len(rows):
+            continue
+        lines = [
+            to_json(dict(record, source_index=source), inf_nan_mode='null')
+            for record, source in zip(
+                object_records(catalog, rows, separations), source_ids.tolist())
+        ]
+        yield b"\n".join(lines) + b"\n"
@@ -0,0 +1,178 @@
+"""
+Catalog loading and per-process catalog state for the API.
+
+Nothing is loaded at import time: the catalog is read by the application's
+lifespan handler, or on first use when the app runs without one, and at most
+once per process. Later versions are loaded into a new immutable snapshot
+which then replaces the current one with a single reference assignment;
+requests that already hold the old snapshot finish against it.
+"""
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fastapi import HTTPException
+
+from ..catalog.binary import BINARY_DIR_NAME
+from ..search.engine import (
+    CATALOG_DIR_ENV, DEFAULT_CATALOG_DIR, default_catalog_dir, open_catalog, read_catalog_frame,
+)
+from ..search.store import CatalogStore
+
+logger = logging.getLogger(__name__)
+
+# Environment variable with the polling interval (seconds) of the file watcher
+WATCH_INTERVAL_ENV = 'DSO_SEARCH_WATCH_INTERVAL'
+
+
+def load_catalog_data(data_dir=None):
+    """Load and combine processed catalog data, merging cross-identified entries."""
+    try:
+        return read_catalog_frame(data_dir)
+    except Exception as e:
+        logger.error(f"Error loading catalog data: {e}")
+        raise HTTPException(status_code=500, detail="Failed to load catalog data")
+
+
+def load_catalog(data_dir=None) -> CatalogStore:
+    """
+    Load the catalog store with engine.open_catalog(): the memory-mapped
+    binary artifact when it is up to date, else the processed CSVs.
+    """
+    try:
+        return open_catalog(data_dir)
+    except Exception as e:
+        logger.error(f"Error loading catalog data: {e}")
+        raise HTTPException(status_code=500, detail="Failed to load catalog data")
+
+
+def catalog_version(data_dir) -> str:
+    """
+    Short fingerprint of the catalog files in data_dir.
+
+    Derived from the names, sizes and modification times of the processed
+    CSVs and the binary manifest, so every worker reading the same files
+    reports the same version.
+    """
+    data_dir = Path(data_dir)
+    digest = hashlib.sha1()
+    files = sorted(data_dir.glob('processed_*.csv')) + [data_dir / BINARY_DIR_NAME / 'manifest.json']
+    for path in files:
+        if path.exists():
+            stat = path.stat()
+            digest.update(f'{path.name}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+    return digest.hexdigest()[:12]
+
+
+class CatalogSnapshot:
+    """An immutable catalog store together with its version information."""
+
+    def __init__(self, store: CatalogStore, version: str, load_seconds: float = None):
+        self.store = store
+        self.version = version
+        self.load_seconds = load_seconds
+        self.loaded_at = datetime.now(timezone.utc).isoformat()
+
+    def info(self) -> dict:
+        return {"version": self.version, "loaded_at": self.loaded_at}
+
+
+class CatalogHolder:
+    """
+    Holds the active catalog snapshot of a process.
+
+    The first snapshot is loaded on first use, exactly once. reload() builds
+    a new snapshot off to the side and swaps it in atomically.
+    """
+
+    def __init__(self, data_dir=None):
+        self.data_dir = Path(data_dir) if data_dir is not None else default_catalog_dir()
+        self._snapshot = None
+        # Number of snapshots loaded so far
+        self.loads = 0
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._stop_watching = threading.Event()
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def _load_snapshot(self) -> CatalogSnapshot:
+        version = catalog_version(self.data_dir)
+        logger.info(f"Loading catalog version {version} from {self.data_dir}")
+        start = time.perf_counter()
+        store = load_catalog(self.data_dir)
+        # Build the name index and the density pyramid now rather than on
+        # the first lookup
+        store.names
+        store.density
+        self.loads += 1
+        return CatalogSnapshot(store, version, time.perf_counter() - start)
+
+    def snapshot(self) -> CatalogSnapshot:
+        """The active snapshot; callers should use one snapshot per request."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._load_snapshot()
+                snapshot = self._snapshot
+        return snapshot
+
+    def get(self) -> CatalogStore:
+        return self.snapshot().store
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Load the catalog files again and swap in the new snapshot.
+
+        Unless forced, nothing is loaded when the files' version matches the
+        active one. Returns True if a new snapshot was swapped in.
+        """
+        with self._reload_lock:
+            current = self._snapshot
+            if not force and current is not None and current.version == catalog_version(self.data_dir):
+                return False
+            snapshot = self._load_snapshot()
+            self._snapshot = snapshot
+            logger.info(f"Catalog version {snapshot.version} is now active")
+            return True
+
+    def reload_in_background(self, force: bool = False) -> threading.Thread:
+        """Run reload() in a daemon thread, logging instead of raising errors."""
+        def run():
+            try:
+                self.reload(force=force)
+            except Exception as e:
+                logger.error(f"Error reloading catalog: {e}")
+
+        thread = threading.Thread(target=run, name="catalog-reload", daemon=True)
+        thread.start()
+        return thread
+
+    def start_watching(self, interval: float):
+        """Poll the catalog files every interval seconds and reload on change."""
+        if self._watcher is not None:
+            return
+
+        def watch():
+            while not self._stop_watching.wait(interval):
+                try:
+                    self.reload()
+                except Exception as e:
+                    logger.error(f"Error reloading catalog: {e}")
+
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=watch, name="catalog-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        if self._watcher is not None:
+            self._stop_watching.set()
+            self._watcher.join()
+            self._watcher = None
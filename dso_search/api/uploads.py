@@ -0,0 +1,66 @@
+"""
+Parsing of uploaded source lists for the cross-match endpoint.
+
+Accepted bodies:
+    text/csv          - header row with `ra` and `dec` columns (any case)
+    application/json  - [[ra, dec], ...], [{"ra": .., "dec": ..}, ...]
+                        or either of those under a "sources" key
+"""
+import io
+import json
+
+import numpy as np
+
+
+class UploadError(ValueError):
+    """Raised when an uploaded source list cannot be used."""
+
+
+def _from_csv(body: bytes):
+    import pandas as pd
+
+    try:
+        df = pd.read_csv(io.BytesIO(body))
+    except (ValueError, pd.errors.ParserError) as e:
+        raise UploadError(f"Could not parse CSV: {e}")
+    columns = {str(col).strip().lower(): col for col in df.columns}
+    if 'ra' not in columns or 'dec' not in columns:
+        raise UploadError("CSV must have 'ra' and 'dec' columns")
+    return (pd.to_numeric(df[columns['ra']], errors='coerce').to_numpy(dtype=np.float64),
+            pd.to_numeric(df[columns['dec']], errors='coerce').to_numpy(dtype=np.float64))
+
+
+def _from_json(body: bytes):
+    try:
+        data = json.loads(body)
+    except ValueError as e:
+        raise UploadError(f"Could not parse JSON: {e}")
+    if isinstance(data, dict):
+        data = data.get('sources')
+    if not isinstance(data, list):
+        raise UploadError("JSON must be a list of sources or an object with a 'sources' list")
+    try:
+        if data and isinstance(data[0], dict):
+            pairs = [(source['ra'], source['dec']) for source in data]
+        else:
+            pairs = [(source[0], source[1]) for source in data]
+        coords = np.array(pairs, dtype=np.float64).reshape(-1, 2)
+    except (KeyError, IndexError, TypeError, ValueError):
+        raise UploadError("Each source needs numeric ra and dec values")
+    return coords[:, 0], coords[:, 1]
+
+
+def parse_sources(body: bytes, content_type: str):
+    """Return validated (ra, dec) arrays from an uploaded body."""
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    if media_type in ('text/csv', 'application/csv', 'text/plain'):
+        ra, dec = _from_csv(body)
+    elif media_type == 'application/json' or media_type.endswith('+json'):
+        ra, dec = _from_json(body)
+    else:
+        raise UploadError(f"Unsupported content type: {content_type!r}")
+
+    invalid = ~((ra >= 0) & (ra < 360) & (dec >= -90) & (dec <= 90))
+    if invalid.any():
+        raise UploadError(f"Source {int(np.argmax(invalid))} has invalid coordinates")
+    return ra, dec
@@ -0,0 +1,183 @@
+"""
+Binary, memory-mappable catalog artifact.
+
+The processing pipeline combines every processed_*.csv into one directory of
+.npy files (the CatalogStore columns, including the precomputed trigonometry
+and the zone index) plus a small JSON manifest. The API maps these files
+read-only, so startup does no parsing and all workers on a host share the
+same physical pages through the OS page cache.
+"""
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from ..search.store import ARRAY_COLUMNS, STRING_COLUMNS, CatalogStore
+from .merge import merge_catalogs
+
+logger = logging.getLogger(__name__)
+
+BINARY_DIR_NAME = 'catalog.bin'
+MANIFEST_NAME = 'manifest.json'
+FORMAT_NAME = 'dso_search.catalog'
+FORMAT_VERSION = 4
+
+# String columns (STRING_COLUMNS) are stored as a UTF-8 blob plus row offsets.
+INDEX_COLUMNS = ('index_keys', 'index_order')
+
+
+class StringColumn:
+    """Read-only UTF-8 string column backed by a byte blob and row offsets."""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    @staticmethod
+    def encode(values):
+        """Return (blob, offsets) arrays for a sequence of strings."""
+        encoded = [str(value).encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return blob, offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _get(self, i: int) -> str:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return self._get(int(key) % len(self))
+        if isinstance(key, slice):
+            rows = np.arange(*key.indices(len(self)))
+        else:
+            rows = np.asarray(key)
+            rows = np.nonzero(rows)[0] if rows.dtype == bool else rows.astype(np.int64, copy=False)
+        # Decode from a plain buffer: slicing the memmap itself costs an array object per row
+        data = memoryview(self.blob.view(np.ndarray))
+        starts, ends = self.offsets[rows].tolist(), self.offsets[np.add(rows, 1)].tolist()
+        return np.array([str(data[start:end], 'utf-8') for start, end in zip(starts, ends)], dtype=object)
+
+
+def source_stamps(csv_files) -> list:
+    """Name, size and modification time of each processed CSV, sorted by name."""
+    stamps = []
+    for path in sorted(Path(path) for path in csv_files):
+        stat = path.stat()
+        stamps.append({'name': path.name, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns})
+    return stamps
+
+
+def write_binary_catalog(store: CatalogStore, out_dir, sources=()) -> Path:
+    """
+    Write a CatalogStore as a memory-mappable artifact.
+
+    sources are the source_stamps() of the CSVs the store was built from,
+    taken before they were read; binary_catalog_is_current() compares them
+    with the CSVs present later.
+
+    The files are written to a sibling directory first and swapped into
+    place, so readers never see a half-written artifact.
+    """
+    out_dir = Path(out_dir)
+    tmp_dir = out_dir.with_name(f'{out_dir.name}.tmp-{os.getpid()}')
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    manifest = {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'rows': len(store),
+        'zone_height': store.index.zone_height,
+        'catalog_names': list(store.catalog_names),
+        'source_files': list(sources),
+        'arrays': {},
+        'strings': {},
+    }
+
+    columns = store.to_columns()
+    for column in ARRAY_COLUMNS + INDEX_COLUMNS:
+        array = np.ascontiguousarray(columns[column])
+        np.save(tmp_dir / f'{column}.npy', array)
+        manifest['arrays'][column] = {'dtype': array.dtype.str, 'shape': list(array.shape)}
+    for column in STRING_COLUMNS:
+        blob, offsets = StringColumn.encode(columns[column])
+        np.save(tmp_dir / f'{column}.blob.npy', blob)
+        np.save(tmp_dir / f'{column}.offsets.npy', offsets)
+        manifest['strings'][column] = {'bytes': int(len(blob))}
+
+    with open(tmp_dir / MANIFEST_NAME, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    old_dir = out_dir.with_name(f'{out_dir.name}.old-{os.getpid()}')
+    if out_dir.exists():
+        out_dir.rename(old_dir)
+    tmp_dir.rename(out_dir)
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+    return out_dir
+
+
+def load_binary_catalog(path) -> CatalogStore:
+    """Memory-map an artifact written by write_binary_catalog (read-only)."""
+    path = Path(path)
+    with open(path / MANIFEST_NAME) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != FORMAT_NAME or manifest.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported catalog artifact in {path}")
+
+    columns = {
+        column: np.load(path / f'{column}.npy', mmap_mode='r')
+        for column in manifest['arrays']
+    }
+    for column in manifest['strings']:
+        columns[column] = StringColumn(np.load(path / f'{column}.blob.npy', mmap_mode='r'),
+                                       np.load(path / f'{column}.offsets.npy', mmap_mode='r'))
+    return CatalogStore.from_columns(columns, manifest['catalog_names'], manifest['zone_height'])
+
+
+def binary_catalog_is_current(processed_dir='data/processed') -> bool:
+    """
+    True if the artifact exists and was built from exactly the processed CSVs
+    now in processed_dir: the same names, sizes and modification times.
+    """
+    processed_dir = Path(processed_dir)
+    try:
+        with open(processed_dir / BINARY_DIR_NAME / MANIFEST_NAME) as f:
+            recorded = json.load(f).get('source_files')
+        return recorded == source_stamps(processed_dir.glob('processed_*.csv'))
+    except (OSError, ValueError):
+        # Missing or unreadable manifest, or a CSV removed while stamping
+        return False
+
+
+def build_binary_catalog(processed_dir='data/processed') -> Path:
+    """Combine every processed_*.csv into the binary artifact, merging cross-identified entries."""
+    import pandas as pd
+
+    processed_dir = Path(processed_dir)
+    csv_files = sorted(processed_dir.glob('processed_*.csv'))
+    if not csv_files:
+        raise ValueError(f"No processed catalogs found in {processed_dir}")
+
+    # Stamp before reading, so a CSV rewritten meanwhile leaves the artifact stale
+    stamps = source_stamps(csv_files)
+    df = merge_catalogs(pd.concat([pd.read_csv(csv_file) for csv_file in csv_files], ignore_index=True))
+    store = CatalogStore.from_frame(df)
+    out_dir = write_binary_catalog(store, processed_dir / BINARY_DIR_NAME, stamps)
+    logger.info(f"Wrote binary catalog with {len(store)} objects to {out_dir}")
+    return out_dir
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    build_binary_catalog()
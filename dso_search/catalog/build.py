@@ -0,0 +1,288 @@
+"""
+Incremental build of the catalog pipeline.
+
+The pipeline is a small graph of stages (raw -> intermediate/processed ->
+index -> visualizations). Each stage declares its input and output files.
+After a stage runs, the content hashes of its inputs and outputs are
+recorded in a state file; a later build skips the stage while its inputs
+hash the same and its outputs are unchanged. Since the hashes cover file
+contents, a stage whose upstream reran but produced identical files is still
+skipped. File hashes are cached by size and modification time, so an
+unchanged tree is checked without reading the data again.
+
+Stages without dependencies between them (the per-catalog ingestion, the
+figures) run in parallel in a process pool.
+
+    python -m dso_search.catalog.build [--force] [--jobs N] [--refresh]
+
+With --refresh the raw files are first revalidated against their upstream
+copies; a file that did not change is not rewritten, so nothing downstream of
+it is rebuilt.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = '.build_state.json'
+_BLOCK_SIZE = 1 << 20
+
+
+class Stage:
+    """
+    One step of the build.
+
+    Args:
+        name: Unique stage name
+        action: Module-level function run as action(*args), so that it can
+            be sent to a worker process
+        args: Arguments of the action; part of the stage's fingerprint
+        inputs: Input paths, or a function returning them (evaluated when the
+            stage is checked, after its dependencies ran)
+        outputs: Output paths; a missing output always triggers a rebuild
+        after: Names of stages that must run first
+    """
+
+    def __init__(self, name: str, action, args=(), inputs=(), outputs=(), after=()):
+        self.name = name
+        self.action = action
+        self.args = tuple(args)
+        self._inputs = inputs
+        self.outputs = [Path(path) for path in outputs]
+        self.after = tuple(after)
+
+    @property
+    def inputs(self) -> list:
+        inputs = self._inputs() if callable(self._inputs) else self._inputs
+        return sorted(Path(path) for path in inputs)
+
+    def run(self):
+        return self.action(*self.args)
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BuildGraph:
+    """A set of stages with a persistent record of what they were built from."""
+
+    def __init__(self, stages, state_path):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = Path(state_path)
+        for stage in stages:
+            missing = [name for name in stage.after if name not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages {missing}")
+        self._state = self._load_state()
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault('files', {})
+        state.setdefault('stages', {})
+        return state
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(f'{self.state_path.name}.tmp-{os.getpid()}')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def file_hash(self, path: Path):
+        """Content hash of a file (a directory hashes its files), None if it does not exist."""
+        path = Path(path)
+        if path.is_dir():
+            files = sorted(p for p in path.rglob('*') if p.is_file())
+            digest = hashlib.sha256()
+            for file in files:
+                digest.update(f'{file.relative_to(path)}\0{self.file_hash(file)}\0'.encode())
+            return digest.hexdigest()
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        key = str(path.resolve())
+        cached = self._state['files'].get(key)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+        sha256 = _hash_file(path)
+        self._state['files'][key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                                     'sha256': sha256}
+        return sha256
+
+    def fingerprint(self, stage: Stage) -> dict:
+        """What a stage is built from: its action, arguments and input hashes."""
+        return {
+            'action': f'{stage.action.__module__}.{stage.action.__qualname__}',
+            'args': repr(stage.args),
+            'inputs': {str(path): self.file_hash(path) for path in stage.inputs},
+        }
+
+    def outputs_of(self, stage: Stage) -> dict:
+        return {str(path): self.file_hash(path) for path in stage.outputs}
+
+    def is_current(self, stage: Stage) -> bool:
+        record = self._state['stages'].get(stage.name)
+        if record is None or record['fingerprint'] != self.fingerprint(stage):
+            return False
+        outputs = self.outputs_of(stage)
+        return None not in outputs.values() and outputs == record['outputs']
+
+    def _record(self, stage: Stage):
+        self._state['stages'][stage.name] = {
+            'fingerprint': self.fingerprint(stage),
+            'outputs': self.outputs_of(stage),
+        }
+
+    def waves(self) -> list:
+        """Stages grouped in dependency order; stages within a group are independent."""
+        done = set()
+        waves = []
+        remaining = dict(self.stages)
+        while remaining:
+            wave = [stage for stage in remaining.values() if set(stage.after) <= done]
+            if not wave:
+                raise ValueError(f"Dependency cycle among stages {sorted(remaining)}")
+            waves.append(wave)
+            for stage in wave:
+                done.add(stage.name)
+                del remaining[stage.name]
+        return waves
+
+    def run(self, force: bool = False, jobs: int = None) -> list:
+        """
+        Run every stage that is out of date (or all, if forced).
+
+        Args:
+            force: Rebuild every stage
+            jobs: Worker processes for independent stages; 1 runs everything
+                in this process, None uses one per CPU
+
+        Returns:
+            Names of the stages that ran
+        """
+        ran = []
+        for wave in self.waves():
+            stale = [stage for stage in wave if force or not self.is_current(stage)]
+            for stage in wave:
+                if stage not in stale:
+                    logger.info(f"{stage.name}: up to date")
+            if len(stale) > 1 and jobs != 1:
+                with ProcessPoolExecutor(max_workers=jobs) as pool:
+                    futures = [pool.submit(stage.action, *stage.args) for stage in stale]
+                    for future in futures:
+                        future.result()
+            else:
+                for stage in stale:
+                    stage.run()
+            for stage in stale:
+                logger.info(f"{stage.name}: built")
+                self._record(stage)
+                ran.append(stage.name)
+            self._save_state()
+        return ran
+
+
+def _process_source(name: str, raw_dir, processed_dir, intermediate_dir):
+    from .ingest import get_source
+
+    get_source(name)(raw_dir=raw_dir, processed_dir=processed_dir,
+                     intermediate_dir=intermediate_dir).process()
+
+
+def _build_index(processed_dir):
+    from .binary import build_binary_catalog
+
+    build_binary_catalog(processed_dir)
+
+
+def _summarize_figures(processed_dir, summary_dir):
+    from ..utils.visualize_data import write_summaries
+
+    write_summaries(processed_dir, summary_dir)
+
+
+def _render_figure(figure: str, summary_file, out_path):
+    from ..utils.visualize_data import render_figure
+
+    render_figure(figure, summary_file, out_path)
+
+
+def pipeline(data_dir='data', sources=None, visualizations: bool = True) -> BuildGraph:
+    """
+    The catalog pipeline as a build graph.
+
+    One ingestion stage per catalog source (raw -> intermediate/processed),
+    then the merged binary index and the figure summaries, then one stage
+    per figure.
+    """
+    from .binary import BINARY_DIR_NAME, MANIFEST_NAME
+    from .ingest import available_sources, get_source
+
+    data_dir = Path(data_dir)
+    dirs = (data_dir / 'raw', data_dir / 'processed', data_dir / 'intermediate')
+    stages = []
+    for name in sources or available_sources():
+        source = get_source(name)(*dirs)
+        stages.append(Stage(f'ingest:{name}', _process_source, (name, *map(str, dirs)),
+                            inputs=source.input_paths, outputs=source.output_paths()))
+    ingest_stages = [stage.name for stage in stages]
+
+    def processed():
+        return dirs[1].glob('processed_*.csv')
+
+    stages.append(Stage('index', _build_index, (str(dirs[1]),), inputs=processed,
+                        outputs=[dirs[1] / BINARY_DIR_NAME / MANIFEST_NAME], after=ingest_stages))
+    if visualizations:
+        from ..utils.visualize_data import FIGURES, summary_path
+
+        # Figures are drawn from per-figure summaries, so a figure whose
+        # summary came out identical is skipped and the others render in parallel
+        summary_dir = dirs[2] / 'figures'
+        out_dir = data_dir / 'visualizations'
+        summaries = [summary_path(summary_dir, figure) for figure in FIGURES]
+        stages.append(Stage('figures', _summarize_figures, (str(dirs[1]), str(summary_dir)),
+                            inputs=processed, outputs=summaries, after=ingest_stages))
+        for figure, summary in zip(FIGURES, summaries):
+            stages.append(Stage(f'figure:{Path(figure).stem}', _render_figure,
+                                (figure, str(summary), str(out_dir / figure)),
+                                inputs=[summary], outputs=[out_dir / figure], after=['figures']))
+    return BuildGraph(stages, data_dir / STATE_NAME)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Rebuild the out-of-date parts of the catalog pipeline.")
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--force', action='store_true', help="Rebuild every stage")
+    parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--no-visualizations', action='store_true')
+    parser.add_argument('--refresh', action='store_true',
+                        help="Revalidate raw files against their upstream copies first")
+    args = parser.parse_args()
+    if args.refresh:
+        from .ingest import refresh
+
+        data_dir = Path(args.data_dir)
+        refresh(raw_dir=data_dir / 'raw', processed_dir=data_dir / 'processed',
+                intermediate_dir=data_dir / 'intermediate')
+    ran = pipeline(args.data_dir, visualizations=not args.no_visualizations).run(args.force, args.jobs)
+    print(f"Rebuilt {len(ran)} stage(s): {', '.join(ran)}" if ran else "Everything is up to date")
+
+
+if __name__ == "__main__":
+    main()
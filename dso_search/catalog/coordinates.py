@@ -0,0 +1,179 @@
+"""
+Vectorized parsing of catalog coordinates.
+
+Whole columns of sexagesimal strings ("05:34:31.94", "-05 23 28",
+"00 42.7") or decimal degrees are converted at once: the strings are laid
+out as a 2-D byte array and the fields, digits, signs and decimal points are
+located with array operations instead of a Python loop per row.
+
+Malformed entries do not raise. Each parser returns the values together with
+a validity mask; invalid entries are NaN. The sign is read from the text, so
+"-00 30 00" is -0.5 degrees even though its degree field is zero.
+"""
+import numpy as np
+
+# Byte codes used by the parser
+_SPACE, _TAB, _PLUS, _MINUS, _DOT, _COLON = (ord(char) for char in ' \t+-.:')
+_ZERO, _NINE = ord('0'), ord('9')
+# Character classes
+_OTHER, _DIGIT, _BLANK, _SIGN, _PUNCTUATION = range(5)
+_KIND = np.full(256, _OTHER, dtype=np.uint8)
+_KIND[_ZERO:_NINE + 1] = _DIGIT
+_KIND[[0, _SPACE, _TAB]] = _BLANK
+_KIND[[_PLUS, _MINUS]] = _SIGN
+_KIND[[_DOT, _COLON]] = _PUNCTUATION
+# Powers of ten by digit place, for places -_POW10_OFFSET to _POW10_OFFSET
+_POW10_OFFSET = 64
+_POW10 = 10.0 ** np.arange(-_POW10_OFFSET, _POW10_OFFSET + 1)
+
+# Up to this many fields (degrees or hours, minutes, seconds)
+MAX_FIELDS = 3
+
+
+def _as_bytes(values) -> np.ndarray:
+    """Return the values as a 2-D uint8 array, one zero-padded row per string."""
+    try:
+        encoded = np.array(values, dtype=np.bytes_).ravel()
+    except UnicodeEncodeError:
+        encoded = np.array([str(value).encode('ascii', 'replace') for value in values],
+                           dtype=np.bytes_).ravel()
+    width = max(encoded.dtype.itemsize, 1)
+    return encoded.astype(f'S{width}').view(np.uint8).reshape(len(encoded), width)
+
+
+def _field_points(chars, token, starts, dot, field):
+    """
+    Locate the digits of every (row, field) pair.
+
+    Returns the flat (row, field) key and column of every token character,
+    the digit place of each of them, and the length and number of dots of
+    every field as (rows, MAX_FIELDS) arrays.
+    """
+    n = len(chars)
+
+    def keys(mask):
+        r, c = np.nonzero(mask)
+        return r * MAX_FIELDS + np.minimum(field[r, c], MAX_FIELDS - 1), c
+
+    key, column = keys(token)
+    start_key, start_column = keys(starts)
+    dot_key, dot_column = keys(dot)
+    size = n * MAX_FIELDS
+    length = np.bincount(key, minlength=size)
+    dots = np.bincount(dot_key, minlength=size)
+    # The fraction point of each field, or its end when there is none
+    point = np.zeros(size, dtype=np.int64)
+    point[start_key] = start_column
+    point += length
+    point[dot_key] = dot_column
+    place = point[key] - column - (column < point[key])
+    return key, column, place, length.reshape(n, MAX_FIELDS), dots.reshape(n, MAX_FIELDS)
+
+
+def _field_numbers(chars, token, starts, dot, field):
+    """Numeric value, length and dot count of every field, for arbitrary layouts."""
+    n = len(chars)
+    key, column, place, length, dots = _field_points(chars, token, starts, dot, field)
+    text = chars[key // MAX_FIELDS, column]
+    value = (text.astype(np.float64) - _ZERO) * _POW10[place + _POW10_OFFSET]
+    value[text == _DOT] = 0.0
+    numbers = np.bincount(key, weights=value, minlength=n * MAX_FIELDS).reshape(n, MAX_FIELDS)
+    return numbers, length, dots
+
+
+def _field_layout(chars, token, starts, dot, field):
+    """
+    Column weights of a single row's layout.
+
+    Returns a (width, MAX_FIELDS) matrix mapping digit values by column to
+    field values, and the row's field lengths and dot counts.
+    """
+    key, column, place, length, dots = _field_points(chars, token, starts, dot, field)
+    weights = np.zeros((chars.shape[1], MAX_FIELDS))
+    digits = chars[0, column] != _DOT
+    weights[column[digits], key[digits]] = _POW10[place[digits] + _POW10_OFFSET]
+    return weights, length[0], dots[0]
+
+
+def parse_sexagesimal(values, hours: bool = False):
+    """
+    Convert a column of coordinates to degrees.
+
+    Args:
+        values: Strings with one to three fields separated by ':' or spaces,
+            optionally signed; only the last field may have a fraction. A
+            single field is taken as decimal degrees.
+        hours: Multiply sexagesimal values by 15 (right ascension)
+
+    Returns:
+        (degrees, valid): float64 values (NaN where invalid) and a boolean
+        mask of the entries that parsed, with minutes and seconds below 60
+    """
+    chars = _as_bytes(values)
+    n, width = chars.shape
+    if n == 0:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=bool)
+
+    kind = _KIND[chars]
+    valid = (kind != _OTHER).all(axis=1)
+    digit = kind == _DIGIT
+    dot = chars == _DOT
+    token = digit | dot
+
+    # A sign is only allowed as the first non-blank character
+    rows = np.arange(n)
+    first = np.argmax(kind != _BLANK, axis=1)
+    leading = kind[rows, first] == _SIGN
+    negative = leading & (chars[rows, first] == _MINUS)
+    valid &= (kind == _SIGN).sum(axis=1) == leading
+    colons = (chars == _COLON).sum(axis=1)
+
+    # Fields are runs of digits and dots
+    starts = token.copy()
+    if n > 1 and (token == token[0]).all() and (dot == dot[0]).all():
+        # Fixed layout, as in most catalog dumps: every row has its digits in
+        # the same places, so each field is a weighted sum of byte columns
+        starts = starts[:1]
+        starts[:, 1:] &= ~token[:1, :-1]
+        field = np.cumsum(starts, axis=1, dtype=np.int16) - 1
+        weights, length, dots = _field_layout(chars[:1], token[:1], starts, dot[:1], field)
+        used = np.nonzero(weights.any(axis=1))[0]
+        numbers = (chars[:, used].astype(np.float64) - _ZERO) @ weights[used]
+        n_fields = np.full(n, field[0, -1] + 1, dtype=np.int64)
+        length = np.broadcast_to(length, (n, MAX_FIELDS))
+        dots = np.broadcast_to(dots, (n, MAX_FIELDS))
+    else:
+        starts[:, 1:] &= ~token[:, :-1]
+        field = np.cumsum(starts, axis=1, dtype=np.int16) - 1
+        numbers, length, dots = _field_numbers(chars, token, starts, dot, field)
+        n_fields = field[:, -1].astype(np.int64) + 1
+
+    valid &= (n_fields >= 1) & (n_fields <= MAX_FIELDS)
+    # Colons may only separate fields, not lead or trail them
+    valid &= (colons == 0) | (colons == n_fields - 1)
+    present = length > 0
+    digits = length - dots
+    valid &= (~present | ((dots <= 1) & (digits >= 1))).all(axis=1)
+    # Only the last field may carry a fraction
+    valid &= ~((dots > 0) & (np.arange(MAX_FIELDS) + 1 < n_fields[:, None])).any(axis=1)
+    valid &= (~present[:, 1:] | (numbers[:, 1:] < 60.0)).all(axis=1)
+
+    value = numbers @ (1.0 / 60.0 ** np.arange(MAX_FIELDS))
+    if hours:
+        value = np.where(n_fields > 1, value * 15.0, value)
+    value = np.where(negative, -value, value)
+    return np.where(valid, value, np.nan), valid
+
+
+def parse_ra(values):
+    """Right ascensions (sexagesimal hours or decimal degrees) as degrees in [0, 360)."""
+    ra, valid = parse_sexagesimal(values, hours=True)
+    valid &= (ra >= 0.0) & (ra < 360.0)
+    return np.where(valid, ra, np.nan), valid
+
+
+def parse_dec(values):
+    """Declinations (sexagesimal or decimal degrees) as degrees in [-90, 90]."""
+    dec, valid = parse_sexagesimal(values)
+    valid &= np.abs(dec) <= 90.0
+    return np.where(valid, dec, np.nan), valid
@@ -0,0 +1,280 @@
+"""
+Streaming ingestion of raw catalog dumps.
+
+Every catalog is a CatalogSource plugin: it knows where its raw file lives,
+how to read it in chunks and how to turn one chunk of raw columns into the
+processed schema. Sources register themselves with @register_source and are
+looked up by name. Chunks are converted with vectorized column operations
+(positions with catalog.coordinates) and appended to the processed CSV as
+they arrive, so memory use is bounded by the chunk size rather than by the
+catalog size. The processed file is
+written next to its final location and moved into place when complete.
+
+Run all registered sources with:
+
+    python -m dso_search.catalog.ingest [names...] [--chunk-size N]
+"""
+import argparse
+import importlib
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Columns of the processed catalog files, in order
+PROCESSED_COLUMNS = ('name', 'catalog', 'common_name', 'ngc_name', 'size', 'ra', 'dec')
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Modules defining the built-in sources; importing them registers the sources
+BUILTIN_SOURCE_MODULES = (
+    'dso_search.catalog.process_messier',
+    'dso_search.catalog.process_ngc',
+)
+
+_SOURCES = {}
+
+
+def register_source(cls):
+    """Class decorator adding a CatalogSource subclass to the registry."""
+    if not cls.name:
+        raise ValueError(f"{cls.__name__} must define a name")
+    _SOURCES[cls.name] = cls
+    return cls
+
+
+def _load_builtin_sources():
+    for module in BUILTIN_SOURCE_MODULES:
+        importlib.import_module(module)
+
+
+def available_sources() -> list:
+    """Names of every registered source, sorted."""
+    _load_builtin_sources()
+    return sorted(_SOURCES)
+
+
+def get_source(name: str):
+    """The CatalogSource subclass registered under `name`."""
+    _load_builtin_sources()
+    try:
+        return _SOURCES[name]
+    except KeyError:
+        raise ValueError(f"Unknown catalog source {name!r}; available: {', '.join(sorted(_SOURCES))}")
+
+
+def read_delimited(path, chunk_size: int = DEFAULT_CHUNK_SIZE, sep: str = ',', names=None,
+                   comment: str = '#'):
+    """Iterate over a delimited text file in DataFrame chunks of raw strings."""
+    import pandas as pd
+
+    return pd.read_csv(path, sep=sep, names=names, header=None if names else 'infer',
+                       comment=comment, dtype=str, keep_default_na=False,
+                       skipinitialspace=True, chunksize=chunk_size)
+
+
+def read_vizier_tsv(path, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Iterate over a VizieR TSV dump in DataFrame chunks of raw strings.
+
+    The '#' preamble, the units line and the dashes line under the header
+    are skipped; columns are named after the header line.
+    """
+    import pandas as pd
+
+    def is_dashes(line):
+        return line.strip() and not line.strip('-\t \r\n')
+
+    with open(path, newline='') as f:
+        header = None
+        while header is None:
+            line = f.readline()
+            if not line:
+                return
+            if line.strip() and not line.startswith('#'):
+                header = [column.strip() for column in line.rstrip('\r\n').split('\t')]
+
+        # Up to two lines (units, dashes) separate the header from the data
+        start = f.tell()
+        lines = [f.readline(), f.readline()]
+        if is_dashes(lines[1]):
+            start = f.tell()
+        elif is_dashes(lines[0]):
+            f.seek(start)
+            f.readline()
+            start = f.tell()
+        f.seek(start)
+
+        yield from pd.read_csv(f, sep='\t', names=header, header=None, comment='#', dtype=str,
+                               keep_default_na=False, chunksize=chunk_size)
+
+
+def read_fixed_width(path, colspecs, names, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Iterate over a fixed-width file (0-based, half-open colspecs) in chunks of raw strings."""
+    import pandas as pd
+
+    return pd.read_fwf(path, colspecs=colspecs, names=names, header=None, dtype=str,
+                       keep_default_na=False, chunksize=chunk_size)
+
+
+class ChunkWriter:
+    """Append DataFrame chunks to a delimited file that appears only when complete."""
+
+    def __init__(self, path, sep: str = ','):
+        self.path = Path(path)
+        self.sep = sep
+        self.rows = 0
+        self._tmp = self.path.with_name(f'{self.path.name}.tmp-{os.getpid()}')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._tmp, 'w', newline='')
+        self._header = True
+
+    def write(self, chunk):
+        chunk.to_csv(self._file, sep=self.sep, index=False, header=self._header)
+        self._header = False
+        self.rows += len(chunk)
+
+    def close(self):
+        """Move the file into place."""
+        self._file.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        self._file.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+class CatalogSource:
+    """
+    Base class of catalog ingestion plugins.
+
+    Subclasses set `name` (registry key, also used for processed_<name>.csv)
+    and `catalog` (value of the catalog column), and implement read_chunks()
+    and transform(). fetch() may download the raw file when it is missing;
+    sources with an upstream copy list it in downloads() so that refresh()
+    can revalidate it.
+    """
+
+    name = None
+    catalog = None
+    # Optional file name in intermediate_dir receiving the processed rows as TSV
+    intermediate_name = None
+
+    def __init__(self, raw_dir='data/raw', processed_dir='data/processed',
+                 intermediate_dir='data/intermediate'):
+        self.raw_dir = Path(raw_dir)
+        self.processed_dir = Path(processed_dir)
+        self.intermediate_dir = Path(intermediate_dir)
+        self.skipped = 0
+
+    @property
+    def output_path(self) -> Path:
+        return self.processed_dir / f'processed_{self.name}.csv'
+
+    def output_paths(self) -> list:
+        """Files written by process()."""
+        paths = [self.output_path]
+        if self.intermediate_name:
+            paths.append(self.intermediate_dir / self.intermediate_name)
+        return paths
+
+    def input_paths(self) -> list:
+        """Raw files read by the source, e.g. for change detection."""
+        return []
+
+    def downloads(self) -> list:
+        """(url, path, params) of the raw files that have an upstream copy."""
+        return []
+
+    def fetch(self):
+        """Make sure the raw input exists; the default expects it to be present."""
+
+    def read_chunks(self, chunk_size: int):
+        """Iterate over the raw input in DataFrame chunks."""
+        raise NotImplementedError
+
+    def transform(self, chunk):
+        """Convert one raw chunk into a frame with (a subset of) PROCESSED_COLUMNS."""
+        raise NotImplementedError
+
+    def conform(self, frame):
+        """Order the processed columns, fill missing ones and drop rows without a valid position."""
+        frame = frame.reindex(columns=list(PROCESSED_COLUMNS))
+        frame['catalog'] = frame['catalog'].fillna(self.catalog)
+        keep = (np.isfinite(frame['ra'].to_numpy(dtype=np.float64)) &
+                np.isfinite(frame['dec'].to_numpy(dtype=np.float64)))
+        self.skipped += int((~keep).sum())
+        return frame[keep]
+
+    def process(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """Ingest the raw input into the processed store; returns the number of rows written."""
+        self.fetch()
+        self.skipped = 0
+        writers = [ChunkWriter(self.output_path)]
+        if self.intermediate_name:
+            writers.append(ChunkWriter(self.intermediate_dir / self.intermediate_name, sep='\t'))
+        try:
+            for chunk in self.read_chunks(chunk_size):
+                frame = self.conform(self.transform(chunk))
+                for writer in writers:
+                    writer.write(frame)
+            if writers[0].rows == 0:
+                # Keep the header so that empty catalogs still load
+                import pandas as pd
+
+                for writer in writers:
+                    writer.write(pd.DataFrame(columns=list(PROCESSED_COLUMNS)))
+        except BaseException:
+            for writer in writers:
+                writer.abort()
+            raise
+        for writer in writers:
+            writer.close()
+        if self.skipped:
+            logger.warning(f"Skipped {self.skipped} {self.catalog} rows without a valid position")
+        logger.info(f"Processed {writers[0].rows} {self.catalog} objects into {self.output_path}")
+        return writers[0].rows
+
+
+def ingest(names=None, chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs) -> dict:
+    """Run the named sources (default: all); returns rows written per source."""
+    names = available_sources() if names is None else names
+    return {name: get_source(name)(**kwargs).process(chunk_size) for name in names}
+
+
+def refresh(names=None, **kwargs) -> list:
+    """
+    Revalidate the raw files of the named sources (default: all) against
+    their upstream copies, concurrently. Unchanged files are not transferred
+    again (conditional requests), so neither are they rewritten.
+
+    Returns:
+        FetchResults of every download
+    """
+    from ..utils.fetch import fetch_many
+
+    names = available_sources() if names is None else names
+    downloads = [download for name in names for download in get_source(name)(**kwargs).downloads()]
+    results = fetch_many(downloads)
+    for result in results:
+        logger.info(f"{result.path.name}: {result.status}, {result.transferred} bytes transferred")
+    return results
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Ingest raw catalog dumps into data/processed.")
+    parser.add_argument('names', nargs='*', help="Sources to run (default: all)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--refresh', action='store_true',
+                        help="Revalidate raw files against their upstream copies first")
+    args = parser.parse_args()
+    if args.refresh:
+        refresh(args.names or None)
+    ingest(args.names or None, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
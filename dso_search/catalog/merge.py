@@ -0,0 +1,190 @@
+"""
+Merging of cross-identified objects across catalogs.
+
+Many objects appear in more than one catalog (M31 is also NGC 224). The
+merge stage links such entries and keeps one canonical row per object, with
+the other designations in an `aliases` column. Two kinds of links are used:
+
+- designation links, where an entry's `ngc_name` names another entry, found
+  with a hash join on the normalized designation and accepted if the two
+  positions roughly agree;
+- positional links between entries of different catalogs within a small
+  tolerance, found with a spatial self-join through the zone index, when
+  their designations confirm the match (the same name, or the same
+  cross-identification). Close pairs without such evidence, e.g. a Messier
+  entry without `ngc_name` next to an NGC object or an NGC/IC double, stay
+  separate objects.
+
+Links are accepted closest first, and never put two entries of the same
+catalog into one object.
+"""
+import logging
+import re
+
+import numpy as np
+
+from ..search.crossmatch import crossmatch
+from ..search.geometry import angular_separation
+from ..search.names import designation_key
+from ..search.store import CatalogStore
+
+logger = logging.getLogger(__name__)
+
+# Maximum separation (degrees) of a purely positional match
+DEFAULT_TOLERANCE = 1.0 / 60.0
+# Maximum separation (degrees) of entries linked through their designations
+DEFAULT_DESIGNATION_TOLERANCE = 0.5
+# Catalogs in order of preference for the canonical row; others come after
+DEFAULT_PRIORITY = ('Messier', 'Caldwell', 'NGC', 'IC', 'PGC')
+
+# Sizes (arcminutes) that sources fill in for catalogs without measured sizes;
+# when merging, another entry's measured size takes precedence
+PLACEHOLDER_SIZES = {'Messier': 10.0}
+
+ALIAS_SEPARATOR = ';'
+
+_FAMILY = re.compile(r'^[A-Z]*')
+
+
+def _keys(values) -> np.ndarray:
+    return np.array([designation_key(value) if isinstance(value, str) and value.strip() else ''
+                     for value in values], dtype=object)
+
+
+def _families(keys) -> np.ndarray:
+    """Alphabetic prefix of each designation key (e.g. NGC for NGC224)."""
+    return np.array([_FAMILY.match(key).group() for key in keys], dtype=object)
+
+
+def _designation_pairs(name_keys, cross_keys):
+    """(a, b) pairs where the cross-identification of a is the name of b."""
+    import pandas as pd
+
+    has_cross = np.nonzero(cross_keys != '')[0]
+    left = pd.DataFrame({'a': has_cross, 'key': cross_keys[has_cross]})
+    right = pd.DataFrame({'b': np.arange(len(name_keys)), 'key': name_keys})
+    pairs = left.merge(right, on='key')
+    return pairs['a'].to_numpy(dtype=np.int64), pairs['b'].to_numpy(dtype=np.int64)
+
+
+def _conflicting(a, b, name_keys, cross_keys):
+    """Mask of pairs where one entry's cross-identification names a different object."""
+    name_families = _families(name_keys)
+    cross_families = _families(cross_keys)
+
+    def names_other(x, y):
+        return ((cross_keys[x] != '') & (cross_families[x] == name_families[y]) &
+                (cross_keys[x] != name_keys[y]))
+
+    return names_other(a, b) | names_other(b, a)
+
+
+def _agreeing(a, b, name_keys, cross_keys):
+    """Mask of pairs whose designations confirm they are the same object."""
+    same_name = (name_keys[a] != '') & (name_keys[a] == name_keys[b])
+    same_cross = (cross_keys[a] != '') & (cross_keys[a] == cross_keys[b])
+    names_a = (cross_keys[b] != '') & (cross_keys[b] == name_keys[a])
+    names_b = (cross_keys[a] != '') & (cross_keys[a] == name_keys[b])
+    return same_name | same_cross | names_a | names_b
+
+
+def link_entries(df, tolerance: float = DEFAULT_TOLERANCE,
+                 designation_tolerance: float = DEFAULT_DESIGNATION_TOLERANCE) -> np.ndarray:
+    """
+    Group the rows of a combined catalog frame that describe the same object.
+
+    Returns the group id of every row: the lowest row number in its group.
+    """
+    n = len(df)
+    ra = df['ra'].to_numpy(dtype=np.float64)
+    dec = df['dec'].to_numpy(dtype=np.float64)
+    catalogs = df['catalog'].astype(str).to_numpy()
+    name_keys = _keys(df['name'])
+    cross_keys = _keys(df['ngc_name']) if 'ngc_name' in df.columns else np.full(n, '', dtype=object)
+
+    # Designation links through a hash join
+    a, b = _designation_pairs(name_keys, cross_keys)
+    separation = angular_separation(ra[a], dec[a], ra[b], dec[b])
+    keep = (a != b) & (separation <= designation_tolerance)
+    a, b, separation = a[keep], b[keep], separation[keep]
+    order = np.argsort(separation, kind='stable')
+    designation_links = (a[order], b[order])
+
+    # Positional links through a spatial self-join
+    store = CatalogStore(name=df['name'].to_numpy(), catalog=catalogs, ra=ra, dec=dec,
+                         size=np.zeros(n))
+    a, b, separation = crossmatch(store, ra, dec, tolerance, nearest=False)
+    keep = ((a < b) & (catalogs[a] != catalogs[b]) & _agreeing(a, b, name_keys, cross_keys) &
+            ~_conflicting(a, b, name_keys, cross_keys))
+    a, b, separation = a[keep], b[keep], separation[keep]
+    order = np.argsort(separation, kind='stable')
+    positional_links = (a[order], b[order])
+
+    # Union closest links first, never joining two entries of one catalog
+    parent = np.arange(n)
+    members = {}
+
+    def find(row):
+        while parent[row] != row:
+            parent[row] = parent[parent[row]]
+            row = parent[row]
+        return row
+
+    merged = 0
+    for a, b in (designation_links, positional_links):
+        for x, y in zip(a.tolist(), b.tolist()):
+            x, y = find(x), find(y)
+            if x == y:
+                continue
+            x_catalogs = members.get(x, {catalogs[x]})
+            y_catalogs = members.get(y, {catalogs[y]})
+            if x_catalogs & y_catalogs:
+                continue
+            root, child = min(x, y), max(x, y)
+            parent[child] = root
+            members[root] = x_catalogs | y_catalogs
+            members.pop(child, None)
+            merged += 1
+    logger.info(f"Linked {merged} cross-identified entries")
+    return np.array([find(row) for row in range(n)], dtype=np.int64)
+
+
+def merge_catalogs(df, tolerance: float = DEFAULT_TOLERANCE,
+                   designation_tolerance: float = DEFAULT_DESIGNATION_TOLERANCE,
+                   priority=DEFAULT_PRIORITY, placeholder_sizes=PLACEHOLDER_SIZES):
+    """
+    Merge cross-identified entries of a combined catalog frame.
+
+    Each object keeps the row of its most preferred catalog (see `priority`).
+    Missing common names and NGC designations are filled in from the other
+    entries, whose names are listed in the `aliases` column. The size is the
+    first measured one, i.e. not a catalog's placeholder (see
+    `placeholder_sizes`), falling back to the placeholder.
+
+    Returns a new frame with one row per object, in original row order.
+    """
+    df = df.reset_index(drop=True)
+    group = link_entries(df, tolerance, designation_tolerance)
+
+    ranks = {catalog: i for i, catalog in enumerate(priority)}
+    rank = df['catalog'].map(lambda catalog: ranks.get(catalog, len(ranks)))
+    ordered = df.assign(_group=group, _rank=rank.to_numpy()).sort_values(
+        ['_group', '_rank'], kind='stable')
+
+    canonical = ordered.drop_duplicates('_group')
+    grouped = ordered.groupby('_group', sort=False)
+    merged = canonical.set_index('_group')
+    for column in ('common_name', 'ngc_name'):
+        if column in ordered.columns:
+            merged[column] = grouped[column].first()
+    placeholder = ordered['catalog'].map(placeholder_sizes).to_numpy(dtype=np.float64)
+    measured = ordered['size'].mask(ordered['size'].to_numpy(dtype=np.float64) == placeholder)
+    merged['size'] = measured.groupby(ordered['_group'], sort=False).first().fillna(grouped['size'].first())
+
+    others = ordered.drop(index=canonical.index)
+    aliases = others.groupby('_group', sort=False)['name'].agg(
+        lambda names: ALIAS_SEPARATOR.join(str(name) for name in names))
+    merged['aliases'] = aliases.reindex(merged.index).fillna('')
+
+    merged = merged.drop(columns='_rank').set_index(canonical.index)
+    return merged.sort_index().reset_index(drop=True)
@@ -1,77 +1,56 @@
 import logging
-import pandas as pd
-from pathlib import Path
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+from .binary import build_binary_catalog
+from .coordinates import parse_dec, parse_ra
+from .ingest import DEFAULT_CHUNK_SIZE, CatalogSource, read_delimited, register_source
+from .merge import PLACEHOLDER_SIZES
 
-def parse_messier_info():
-    logger.info("Parsing Messier catalog info...")
-    Path("data/intermediate").mkdir(parents=True, exist_ok=True)
-    Path("data/processed").mkdir(parents=True, exist_ok=True)
+logger = logging.getLogger(__name__)
 
-    messier_data = []
-    with open("data/raw/messier_catalog_info.txt", 'r') as f:
-        for line in f:
-            if line.strip() and not line.startswith('#'):
-                fields = line.strip().split(',')
-                if len(fields) >= 5:  # Ensure we have all required fields
-                    obj = {
-                        'name': fields[0].strip(),
-                        'catalog': 'Messier',
-                        'common_name': fields[1].strip(),
-                        'ngc_name': fields[2].strip() if fields[2].strip() else None,
-                        'size': 10.0  # Default size in arcminutes
-                    }
+# Default size in arcminutes; the source file carries no sizes
+DEFAULT_SIZE = PLACEHOLDER_SIZES['Messier']
 
-                    try:
-                        ra_str = fields[3].strip()
-                        dec_str = fields[4].strip()
 
-                        # Convert RA from HH:MM:SS.SS to decimal degrees (J2000)
-                        ra_parts = ra_str.split(':')
-                        if len(ra_parts) == 3:
-                            ra_h = float(ra_parts[0])
-                            ra_m = float(ra_parts[1])
-                            ra_s = float(ra_parts[2])
-                            ra = (ra_h + ra_m/60 + ra_s/3600) * 15  # Convert to degrees
-                            obj['ra'] = round(ra, 6)
+@register_source
+class MessierSource(CatalogSource):
+    """Messier objects from data/raw/messier_catalog_info.txt (Name,CommonName,NGCName,RA,Dec)."""
 
-                        # Convert Dec from DD:MM:SS.S to decimal degrees (J2000)
-                        dec_parts = dec_str.replace('+', '').split(':')
-                        if len(dec_parts) == 3:
-                            dec_sign = -1 if dec_str.startswith('-') else 1
-                            dec_d = float(dec_parts[0])
-                            dec_m = float(dec_parts[1])
-                            dec_s = float(dec_parts[2])
-                            dec = dec_d + dec_m/60 + dec_s/3600
-                            dec *= dec_sign
-                            obj['dec'] = round(dec, 6)
+    name = 'messier'
+    catalog = 'Messier'
+    intermediate_name = 'messier_names.tsv'
+    raw_name = 'messier_catalog_info.txt'
 
-                        messier_data.append(obj)
-                    except (ValueError, IndexError) as e:
-                        logger.warning(f"Error parsing coordinates for {obj['name']}: {e}")
-                        continue
+    def input_paths(self):
+        return [self.raw_dir / self.raw_name]
 
-    df = pd.DataFrame(messier_data)
+    def read_chunks(self, chunk_size):
+        return read_delimited(self.raw_dir / self.raw_name, chunk_size,
+                              names=['name', 'common_name', 'ngc_name', 'ra', 'dec'])
 
-    # Ensure all required columns are present
-    required_columns = ['name', 'catalog', 'common_name', 'ngc_name', 'ra', 'dec', 'size']
-    for col in required_columns:
-        if col not in df.columns:
-            logger.error(f"Missing required column: {col}")
-            raise ValueError(f"Missing required column: {col}")
+    def transform(self, chunk):
+        # RA is HH:MM:SS.SS and Dec is ±DD:MM:SS.S (J2000)
+        ngc_name = chunk['ngc_name'].str.strip()
+        return chunk.assign(
+            catalog=self.catalog,
+            name=chunk['name'].str.strip(),
+            common_name=chunk['common_name'].str.strip(),
+            # Blank designations are missing; replace('', None) would pad-fill them on pandas 1.x
+            ngc_name=ngc_name.mask(ngc_name == ''),
+            size=DEFAULT_SIZE,
+            ra=parse_ra(chunk['ra'])[0].round(6),
+            dec=parse_dec(chunk['dec'])[0].round(6),
+        )
 
-    # Save both intermediate and processed data
-    df.to_csv("data/intermediate/messier_names.tsv", sep='\t', index=False)
-    df.to_csv("data/processed/processed_messier.csv", index=False)
 
-    logger.info(f"Processed {len(messier_data)} Messier objects")
-    return len(messier_data)
+def parse_messier_info(chunk_size=DEFAULT_CHUNK_SIZE):
+    logger.info("Parsing Messier catalog info...")
+    return MessierSource().process(chunk_size)
 
 def process_messier_catalog():
     logger.info("Processing Messier catalog data...")
     return parse_messier_info()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     process_messier_catalog()
+    build_binary_catalog()
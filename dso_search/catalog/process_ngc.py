@@ -1,66 +1,103 @@
-import pandas as pd
-import requests
 from pathlib import Path
 import logging
 
-logging.basicConfig(level=logging.INFO)
+from .binary import build_binary_catalog
+from .coordinates import parse_dec, parse_ra
+from .ingest import (
+    DEFAULT_CHUNK_SIZE, CatalogSource, read_fixed_width, read_vizier_tsv, register_source,
+)
+
 logger = logging.getLogger(__name__)
 
-def download_ngc_catalog():
-    url = "https://vizier.cds.unistra.fr/viz-bin/VizieR-4"
-    params = {
-        '-source': 'VII/118/ngc2000',
-        '-out.form': 'TSV',
-        '-out.max': '-1',  # No limit
-        '-out': 'Name,RAJ2000,DEJ2000,Diam',
-        '-out.meta': ''
-    }
+# Byte ranges (0-based, half-open) of the columns used from the NGC 2000.0
+# fixed-width table (VizieR VII/118, ngc2000.dat)
+NGC2000_COLSPECS = [(0, 5), (10, 12), (13, 17), (19, 20), (20, 22), (23, 25), (33, 38)]
+NGC2000_NAMES = ['Name', 'RAh', 'RAm', 'DE-', 'DEd', 'DEm', 'Diam']
+
+
+NGC_URL = "https://vizier.cds.unistra.fr/viz-bin/VizieR-4"
+NGC_PARAMS = {
+    '-source': 'VII/118/ngc2000',
+    '-out.form': 'TSV',
+    '-out.max': '-1',  # No limit
+    '-out': 'Name,RAJ2000,DEJ2000,Diam',
+    '-out.meta': ''
+}
+
+
+def download_ngc_catalog(out_path="data/raw/ngc2000.tsv"):
+    """Download (or revalidate) the VizieR TSV dump; returns the FetchResult."""
+    from ..utils.fetch import fetch
 
     logger.info("Downloading NGC catalog data...")
-    response = requests.get(url, params=params)
-    Path("data/raw").mkdir(parents=True, exist_ok=True)
+    return fetch(NGC_URL, out_path, NGC_PARAMS)
 
-    lines = response.text.split('\n')
-    data_start = 0
-    for i, line in enumerate(lines):
-        if not line.startswith('#'):
-            data_start = i
-            break
 
-    if data_start >= len(lines):
-        raise ValueError("No data found in VizieR response")
+@register_source
+class NGCSource(CatalogSource):
+    """
+    NGC objects, from the fixed-width ngc2000.dat when present and otherwise
+    from a VizieR TSV dump (ngc2000.tsv, downloaded when missing). IC
+    entries of the table are skipped.
+    """
 
-    header = lines[data_start]
-    data_lines = [line for line in lines[data_start+1:] if line.strip() and not line.startswith('I')]
+    name = 'ngc'
+    catalog = 'NGC'
 
-    with open("data/raw/ngc2000.tsv", "w") as f:
-        f.write(header + '\n')
-        f.write('\n'.join(data_lines))
+    @property
+    def fixed_width_path(self) -> Path:
+        return self.raw_dir / 'ngc2000.dat'
 
-    return len(data_lines)
+    @property
+    def tsv_path(self) -> Path:
+        return self.raw_dir / 'ngc2000.tsv'
 
-def process_ngc_catalog():
-    if not Path("data/raw/ngc2000.tsv").exists():
-        num_objects = download_ngc_catalog()
-        logger.info(f"Downloaded {num_objects} NGC objects")
+    def _use_fixed_width(self) -> bool:
+        return self.fixed_width_path.exists() and self.fixed_width_path.stat().st_size > 0
 
-    logger.info("Processing NGC catalog data...")
-    df = pd.read_csv("data/raw/ngc2000.tsv", sep='\t', comment='#')
+    def input_paths(self):
+        return [self.fixed_width_path if self._use_fixed_width() else self.tsv_path]
 
-    processed_df = pd.DataFrame({
-        'name': 'NGC' + df['Name'].astype(str).str.strip(),
-        'catalog': 'NGC',
-        'ra': pd.to_numeric(df['RAJ2000'], errors='coerce'),
-        'dec': pd.to_numeric(df['DEJ2000'], errors='coerce'),
-        'size': pd.to_numeric(df['Diam'], errors='coerce')
-    })
+    def downloads(self):
+        if self._use_fixed_width():
+            return []
+        return [(NGC_URL, self.tsv_path, NGC_PARAMS)]
 
-    processed_df = processed_df.dropna(subset=['ra', 'dec'])
+    def fetch(self):
+        if not self._use_fixed_width() and not self.tsv_path.exists():
+            download_ngc_catalog(self.tsv_path)
 
-    Path("data/processed").mkdir(parents=True, exist_ok=True)
-    processed_df.to_csv('data/processed/processed_ngc.csv', index=False)
-    logger.info(f"Processed {len(processed_df)} NGC objects")
-    return processed_df
+    def read_chunks(self, chunk_size):
+        if self._use_fixed_width():
+            return read_fixed_width(self.fixed_width_path, NGC2000_COLSPECS, NGC2000_NAMES, chunk_size)
+        return read_vizier_tsv(self.tsv_path, chunk_size)
+
+    def transform(self, chunk):
+        import pandas as pd
+
+        name = chunk['Name'].str.strip()
+        chunk = chunk[~name.str.startswith('I')]
+        name = name[chunk.index]
+        if 'RAh' in chunk.columns:
+            ra, _ = parse_ra(chunk['RAh'] + ':' + chunk['RAm'])
+            dec, _ = parse_dec(chunk['DE-'] + chunk['DEd'] + ':' + chunk['DEm'])
+        else:
+            ra, _ = parse_ra(chunk['RAJ2000'])
+            dec, _ = parse_dec(chunk['DEJ2000'])
+        return pd.DataFrame({
+            'name': 'NGC' + name,
+            'catalog': self.catalog,
+            'ra': ra,
+            'dec': dec,
+            'size': pd.to_numeric(chunk['Diam'].str.strip(), errors='coerce'),
+        }, index=chunk.index)
+
+
+def process_ngc_catalog(chunk_size=DEFAULT_CHUNK_SIZE):
+    logger.info("Processing NGC catalog data...")
+    return NGCSource().process(chunk_size)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     process_ngc_catalog()
+    build_binary_catalog()
@@ -0,0 +1,308 @@
+"""
+Offline cone searches and cross-matches of coordinate files.
+
+    python -m dso_search cone sources.csv matches.csv --radius 0.5 --limit 10
+    python -m dso_search crossmatch sources.parquet matches.jsonl --radius 0.01
+
+The input (CSV, or Parquet with pyarrow installed) is read in chunks of
+--chunk-size sources. Chunks are searched in a pool of --jobs worker
+processes, each holding the catalog store: the memory-mapped binary artifact
+shares its pages between workers, and forked workers inherit the store the
+parent loaded. Results are appended to the output (CSV, Parquet or JSON
+lines, by extension) in input order as chunks finish, with a bounded number
+of chunks in flight, so memory use does not grow with the input.
+
+Each output row is one match: the source's 0-based row in the input
+(`source_index`), the object's fields and the separation in degrees.
+"""
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .search.engine import CATALOG_DIR_ENV, batch_search, crossmatch, default_catalog_dir, open_catalog
+from .search.filters import AttributeFilter
+
+DEFAULT_CHUNK_SIZE = 10000
+# Chunks submitted per worker ahead of the one being written
+CHUNKS_IN_FLIGHT_PER_JOB = 2
+
+COLUMNS = ('source_index', 'name', 'catalog', 'ra', 'dec', 'size', 'separation')
+
+# Catalog store of this process, loaded once by _use_catalog
+_store = None
+_store_dir = None
+
+
+def cone_task(radius: float, attribute_filter: AttributeFilter = None, limit: int = None):
+    """Task searching each source's cone, nearest first, optionally filtered and limited to `limit` objects."""
+    return partial(_cone_chunk, radius=radius, attribute_filter=attribute_filter, limit=limit)
+
+
+def crossmatch_task(radius: float, nearest: bool = True):
+    """Task matching each source to its nearest object (or all objects) within radius."""
+    return partial(_crossmatch_chunk, radius=radius, nearest=nearest)
+
+
+def _cone_chunk(store, ra, dec, radius, attribute_filter, limit):
+    filters = [attribute_filter] * len(ra) if attribute_filter is not None and attribute_filter.active else None
+    limits = [limit] * len(ra) if limit is not None else None
+    query_ids, rows, separations, _ = batch_search(store, ra, dec, radius, filters, limits=limits)
+    return query_ids, rows, separations
+
+
+def _crossmatch_chunk(store, ra, dec, radius, nearest):
+    return crossmatch(store, ra, dec, radius, nearest=nearest, chunk_size=max(len(ra), 1))
+
+
+def _use_catalog(catalog_dir):
+    """Load the catalog store of this process, unless it already holds (e.g. inherited) that one."""
+    global _store, _store_dir
+    if _store is None or _store_dir != catalog_dir:
+        _store = open_catalog(catalog_dir)
+        _store_dir = catalog_dir
+    return _store
+
+
+def _result_frame(store, source_ids, rows, separations) -> pd.DataFrame:
+    return pd.DataFrame({
+        'source_index': np.asarray(source_ids, dtype=np.int64),
+        'name': store.name[rows],
+        'catalog': store.catalog_of(rows),
+        'ra': store.ra[rows],
+        'dec': store.dec[rows],
+        'size': store.size[rows],
+        'separation': separations,
+    }, columns=COLUMNS)
+
+
+def _run_chunk(task, encode, start: int, ra, dec):
+    """Search one chunk and encode its matches for the output, returning (matches, block)."""
+    source_ids, rows, separations = task(_store, ra, dec)
+    return len(rows), encode(_result_frame(_store, source_ids + start, rows, separations))
+
+
+def read_chunks(path, chunk_size: int = DEFAULT_CHUNK_SIZE, ra_column: str = 'ra', dec_column: str = 'dec'):
+    """
+    Read source coordinates from a CSV or Parquet file chunk by chunk.
+
+    Yields:
+        (start, ra, dec) with the input row of the chunk's first source;
+        raises ValueError for a missing column or invalid coordinates
+    """
+    path = Path(path)
+    if path.suffix.lower() in ('.parquet', '.pq'):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        missing = {ra_column, dec_column} - set(parquet.schema_arrow.names)
+        if missing:
+            raise ValueError(f"{path} has no column(s) {', '.join(sorted(missing))}")
+        frames = (batch.to_pandas() for batch in parquet.iter_batches(batch_size=chunk_size,
+                                                                       columns=[ra_column, dec_column]))
+    else:
+        header = pd.read_csv(path, nrows=0).columns
+        missing = {ra_column, dec_column} - set(header)
+        if missing:
+            raise ValueError(f"{path} has no column(s) {', '.join(sorted(missing))}")
+        frames = pd.read_csv(path, usecols=[ra_column, dec_column], chunksize=chunk_size)
+
+    start = 0
+    for frame in frames:
+        ra = pd.to_numeric(frame[ra_column], errors='coerce').to_numpy(dtype=np.float64)
+        dec = pd.to_numeric(frame[dec_column], errors='coerce').to_numpy(dtype=np.float64)
+        invalid = ~((ra >= 0) & (ra < 360) & (dec >= -90) & (dec <= 90))
+        if invalid.any():
+            raise ValueError(f"Source {start + int(np.argmax(invalid))} has invalid coordinates")
+        yield start, ra, dec
+        start += len(ra)
+
+
+# Output writers. Chunks are encoded by encode() in the worker that searched
+# them, so the parent only appends finished blocks to the file.
+
+class _CsvWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='')
+        pd.DataFrame(columns=COLUMNS).to_csv(self.file, index=False)
+
+    @staticmethod
+    def encode(frame) -> str:
+        return frame.to_csv(header=False, index=False)
+
+    def write(self, block):
+        self.file.write(block)
+
+    def close(self):
+        self.file.close()
+
+
+class _JsonLinesWriter(_CsvWriter):
+    def __init__(self, path):
+        self.file = open(path, 'w')
+
+    @staticmethod
+    def encode(frame) -> str:
+        # NaN sizes become null
+        return frame.to_json(orient='records', lines=True).rstrip('\n') + '\n' if len(frame) else ''
+
+
+def _parquet_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ('source_index', pa.int64()), ('name', pa.string()), ('catalog', pa.string()),
+        ('ra', pa.float64()), ('dec', pa.float64()), ('size', pa.float64()), ('separation', pa.float64()),
+    ])
+
+
+class _ParquetWriter:
+    def __init__(self, path):
+        import pyarrow.parquet as pq
+
+        self.writer = pq.ParquetWriter(path, _parquet_schema())
+
+    @staticmethod
+    def encode(frame):
+        import pyarrow as pa
+
+        return pa.Table.from_pandas(frame, schema=_parquet_schema(), preserve_index=False)
+
+    def write(self, block):
+        self.writer.write_table(block)
+
+    def close(self):
+        self.writer.close()
+
+
+def open_writer(path):
+    """
+    Incremental writer for the output file's format: .parquet/.pq,
+    .jsonl/.ndjson, else CSV. Blocks passed to write() come from its encode().
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.parquet', '.pq'):
+        return _ParquetWriter(path)
+    if suffix in ('.jsonl', '.ndjson'):
+        return _JsonLinesWriter(path)
+    return _CsvWriter(path)
+
+
+def search_file(task, input_path, output_path, catalog_dir, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                jobs: int = None, ra_column: str = 'ra', dec_column: str = 'dec'):
+    """
+    Run a cone or cross-match task over every source of input_path.
+
+    Args:
+        task: From cone_task() or crossmatch_task()
+        jobs: Worker processes; 1 searches in this process, None uses one per CPU
+
+    Returns:
+        (sources, matches) counts
+    """
+    catalog_dir = str(catalog_dir)
+    # Forked workers inherit this store instead of loading their own
+    _use_catalog(catalog_dir)
+    chunks = read_chunks(input_path, chunk_size, ra_column, dec_column)
+    sources = matches = 0
+    writer = open_writer(output_path)
+    encode = type(writer).encode
+    try:
+        if jobs == 1:
+            for start, ra, dec in chunks:
+                count, block = _run_chunk(task, encode, start, ra, dec)
+                writer.write(block)
+                sources, matches = start + len(ra), matches + count
+            return sources, matches
+
+        jobs = jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_use_catalog, initargs=(catalog_dir,)) as pool:
+            pending = deque()
+            for start, ra, dec in chunks:
+                pending.append(pool.submit(_run_chunk, task, encode, start, ra, dec))
+                sources = start + len(ra)
+                # Write finished chunks in input order, keeping at most a few per worker queued
+                while len(pending) >= jobs * CHUNKS_IN_FLIGHT_PER_JOB or (pending and pending[0].done()):
+                    count, block = pending.popleft().result()
+                    writer.write(block)
+                    matches += count
+            while pending:
+                count, block = pending.popleft().result()
+                writer.write(block)
+                matches += count
+        return sources, matches
+    finally:
+        writer.close()
+
+
+def _add_common_arguments(parser):
+    parser.add_argument('input', help="CSV or Parquet file of source coordinates")
+    parser.add_argument('output', help="Output file: .csv, .parquet or .jsonl")
+    parser.add_argument('--radius', type=float, required=True, help="Search radius in degrees")
+    parser.add_argument('--catalog-dir', default=default_catalog_dir(),
+                        help=f"Processed catalog directory (default: ${CATALOG_DIR_ENV} or the repository's "
+                             "data/processed)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Sources per chunk")
+    parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--ra-column', default='ra')
+    parser.add_argument('--dec-column', default='dec')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='dso-search',
+                                     description="Search or cross-match coordinate files against the catalog.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    cone = commands.add_parser('cone', help="Objects within --radius of each source, nearest first")
+    _add_common_arguments(cone)
+    cone.add_argument('--limit', type=int, default=None, help="Objects per source (default: all)")
+    cone.add_argument('--catalogs', nargs='+', default=None, help="Only these catalogs, e.g. Messier NGC")
+    cone.add_argument('--min-size', type=float, default=None, help="Minimum size in arcminutes")
+    cone.add_argument('--max-size', type=float, default=None, help="Maximum size in arcminutes")
+    cone.add_argument('--name-prefix', default=None)
+
+    match = commands.add_parser('crossmatch', help="Match each source to the catalog within --radius")
+    _add_common_arguments(match)
+    match.add_argument('--mode', choices=('nearest', 'all'), default='nearest')
+
+    args = parser.parse_args(argv)
+    if args.radius <= 0:
+        parser.error("--radius must be positive")
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+    if args.jobs is not None and args.jobs <= 0:
+        parser.error("--jobs must be positive")
+    if args.command == 'cone':
+        if args.limit is not None and args.limit < 0:
+            parser.error("--limit must not be negative")
+        task = cone_task(args.radius, AttributeFilter(args.catalogs, args.min_size, args.max_size,
+                                                      args.name_prefix), args.limit)
+    else:
+        task = crossmatch_task(args.radius, nearest=(args.mode == 'nearest'))
+
+    try:
+        store = _use_catalog(str(args.catalog_dir))
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
+    unknown = [name for name in getattr(args, 'catalogs', None) or () if store.catalog_code_of(name) is None]
+    if unknown:
+        parser.error(f"unknown catalog(s) {', '.join(unknown)}; available: {', '.join(store.catalog_names)}")
+
+    try:
+        sources, matches = search_file(task, args.input, args.output, args.catalog_dir, args.chunk_size,
+                                       args.jobs, args.ra_column, args.dec_column)
+    except ImportError as e:
+        parser.exit(1, f"{parser.prog}: error: Parquet files need pyarrow ({e})\n")
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
+    print(f"Wrote {matches} match(es) for {sources} source(s) to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
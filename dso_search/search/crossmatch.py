@@ -0,0 +1,78 @@
+"""
+Cross-matching of source lists against the catalog store.
+
+Sources are matched in chunks through the store's zone index, which sweeps
+each source's declination band instead of comparing every source with every
+catalog object, so the cost grows with the number of nearby candidates.
+"""
+import numpy as np
+
+from .geometry import angular_separation
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def _nearest_only(source_ids, rows, separations):
+    """Keep the closest match of each source (ties go to the lower row)."""
+    order = np.lexsort((rows, separations, source_ids))
+    source_ids, rows, separations = source_ids[order], rows[order], separations[order]
+    first = np.ones(len(source_ids), dtype=bool)
+    first[1:] = source_ids[1:] != source_ids[:-1]
+    return source_ids[first], rows[first], separations[first]
+
+
+def iter_crossmatch(catalog, ra, dec, radius: float, nearest: bool = True,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, limit: int = None):
+    """
+    Cross-match sources chunk by chunk.
+
+    Args:
+        catalog: CatalogStore to match against
+        ra, dec: Source coordinates in degrees
+        radius: Match tolerance in degrees
+        nearest: Keep only the closest object per source instead of all
+            objects within the tolerance
+        chunk_size: Number of sources matched per step, bounding memory use
+        limit: Keep at most this many of each source's nearest matches;
+            None for all
+
+    Yields:
+        (source_ids, rows, separations) arrays for each chunk, sorted by
+        source and then by separation. Sources without a match are absent.
+    """
+    ra = np.asarray(ra, dtype=np.float64)
+    dec = np.asarray(dec, dtype=np.float64)
+    if ra.shape != dec.shape or ra.ndim != 1:
+        raise ValueError("ra and dec must be 1-D arrays of the same length")
+
+    for start in range(0, len(ra), chunk_size):
+        chunk_ra = ra[start:start + chunk_size]
+        chunk_dec = dec[start:start + chunk_size]
+        query_ids, rows = catalog.cone_many(chunk_ra, chunk_dec, radius)
+        separations = angular_separation(catalog.ra[rows], catalog.dec[rows],
+                                         chunk_ra[query_ids], chunk_dec[query_ids])
+        if nearest:
+            query_ids, rows, separations = _nearest_only(query_ids, rows, separations)
+        else:
+            order = np.lexsort((rows, separations, query_ids))
+            if limit is not None:
+                # Rank of each match within its source
+                ranks = np.arange(len(order)) - np.searchsorted(query_ids[order], query_ids[order])
+                order = order[ranks < limit]
+            query_ids, rows, separations = query_ids[order], rows[order], separations[order]
+        yield query_ids + start, rows, separations
+
+
+def crossmatch(catalog, ra, dec, radius: float, nearest: bool = True,
+               chunk_size: int = DEFAULT_CHUNK_SIZE, limit: int = None):
+    """
+    Cross-match sources against the catalog in one call.
+
+    Returns (source_ids, rows, separations) as described in iter_crossmatch.
+    """
+    chunks = list(iter_crossmatch(catalog, ra, dec, radius, nearest, chunk_size, limit))
+    if not chunks:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.copy(), np.empty(0, dtype=np.float64)
+    source_ids, rows, separations = zip(*chunks)
+    return np.concatenate(source_ids), np.concatenate(rows), np.concatenate(separations)
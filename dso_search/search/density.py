@@ -0,0 +1,147 @@
+"""
+Multi-resolution sky density: object counts and size statistics per cell.
+
+The sky is divided into a quadtree of equal-angle cells. Level L has 2**L
+rows in declination and 2**(L+1) columns in right ascension, so every cell
+is 180 / 2**L degrees on a side and splits into four cells of level L+1.
+Cell (x, y) of level L spans RA [x, x+1) * 360 / 2**(L+1) and Dec
+[y, y+1) * 180 / 2**L - 90.
+
+The pyramid is computed once per catalog: objects are binned at the deepest
+level with bincount, and every coarser level is a 2x2 reduction of the one
+below. Map clients at low zoom then read cell statistics in O(cells) instead
+of serializing objects; only tiles at deep levels list objects.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from .geometry import angular_separation
+
+# Deepest precomputed level: 256 x 512 cells of 0.7 degrees
+MAX_LEVEL = 8
+
+
+class CellStats(NamedTuple):
+    """Per-cell statistics of one level, as (rows, columns) arrays."""
+    count: np.ndarray
+    sized: np.ndarray       # objects with a known size
+    size_sum: np.ndarray
+    size_min: np.ndarray    # +inf where no object has a size
+    size_max: np.ndarray    # -inf where no object has a size
+
+
+def grid_shape(level: int):
+    """(rows, columns) of the grid at a level."""
+    return 1 << level, 1 << (level + 1)
+
+
+def cell_size(level: int) -> float:
+    """Side of a cell in degrees."""
+    return 180.0 / (1 << level)
+
+
+def cell_of(ra, dec, level: int):
+    """Column and row of the cells containing (ra, dec)."""
+    rows, columns = grid_shape(level)
+    side = cell_size(level)
+    x = np.clip(np.floor(np.mod(ra, 360.0) / side).astype(np.int64), 0, columns - 1)
+    y = np.clip(np.floor((np.asarray(dec, dtype=np.float64) + 90.0) / side).astype(np.int64), 0, rows - 1)
+    return x, y
+
+
+def cell_bounds(level: int, x: int, y: int):
+    """(ra_min, ra_max, dec_min, dec_max) of a cell in degrees."""
+    side = cell_size(level)
+    return x * side, (x + 1) * side, y * side - 90.0, (y + 1) * side - 90.0
+
+
+def check_cell(level: int, x: int, y: int):
+    """Raise ValueError unless (level, x, y) names a cell."""
+    rows, columns = grid_shape(level)
+    if level < 0 or not (0 <= x < columns and 0 <= y < rows):
+        raise ValueError(f"Level {level} has columns 0-{columns - 1} and rows 0-{rows - 1}")
+
+
+def _coarsen(stats: CellStats) -> CellStats:
+    """Statistics of the next coarser level, by 2x2 reduction."""
+    def blocks(array):
+        rows, columns = array.shape
+        return array.reshape(rows // 2, 2, columns // 2, 2)
+    return CellStats(
+        blocks(stats.count).sum(axis=(1, 3)),
+        blocks(stats.sized).sum(axis=(1, 3)),
+        blocks(stats.size_sum).sum(axis=(1, 3)),
+        blocks(stats.size_min).min(axis=(1, 3)),
+        blocks(stats.size_max).max(axis=(1, 3)),
+    )
+
+
+class DensityPyramid:
+    """Cell statistics for every level from 0 to max_level."""
+
+    def __init__(self, ra, dec, size, max_level: int = MAX_LEVEL):
+        self.max_level = max_level
+        rows, columns = grid_shape(max_level)
+        x, y = cell_of(ra, dec, max_level)
+        cell = y * columns + x
+        n = rows * columns
+        size = np.asarray(size, dtype=np.float64)
+        known = ~np.isnan(size)
+        size_min = np.full(n, np.inf)
+        size_max = np.full(n, -np.inf)
+        np.minimum.at(size_min, cell[known], size[known])
+        np.maximum.at(size_max, cell[known], size[known])
+        finest = CellStats(
+            np.bincount(cell, minlength=n).reshape(rows, columns),
+            np.bincount(cell[known], minlength=n).reshape(rows, columns),
+            np.bincount(cell[known], weights=size[known], minlength=n).reshape(rows, columns),
+            size_min.reshape(rows, columns),
+            size_max.reshape(rows, columns),
+        )
+        self.levels = [finest]
+        for _ in range(max_level):
+            self.levels.append(_coarsen(self.levels[-1]))
+        self.levels.reverse()
+
+    @classmethod
+    def from_store(cls, store, max_level: int = MAX_LEVEL) -> "DensityPyramid":
+        return cls(store.ra, store.dec, store.size, max_level)
+
+    def count(self, level: int, x: int, y: int) -> int:
+        """Objects in a cell; the level must be precomputed."""
+        return int(self.levels[level].count[y, x])
+
+    def cells(self, level: int, x: int, y: int, depth: int):
+        """
+        Non-empty sub-cells of a cell, `depth` levels further down.
+
+        The sub-cell level is capped at max_level. Returns (cell_level, xs,
+        ys, stats) with stats a CellStats of flat arrays parallel to xs/ys,
+        in row-major order. Cells deeper than max_level have no statistics:
+        cell_level is None and the arrays are empty.
+        """
+        if level > self.max_level:
+            empty = np.empty(0, dtype=np.int64)
+            return None, empty, empty, CellStats(*(array.ravel()[:0] for array in self.levels[0]))
+        cell_level = min(level + depth, self.max_level)
+        scale = 1 << (cell_level - level)
+        stats = self.levels[cell_level]
+        window = (slice(y * scale, (y + 1) * scale), slice(x * scale, (x + 1) * scale))
+        ys, xs = np.nonzero(stats.count[window])
+        values = CellStats(*(array[window][ys, xs] for array in stats))
+        return cell_level, xs + x * scale, ys + y * scale, values
+
+
+def cell_rows(store, level: int, x: int, y: int) -> np.ndarray:
+    """Ascending rows of the objects in a cell of any level."""
+    ra_min, ra_max, dec_min, dec_max = cell_bounds(level, x, y)
+    # The cell's corners bound it: candidates from the cone around its centre
+    # reaching the farthest corner, then the exact box test on cell indices
+    center_ra, center_dec = (ra_min + ra_max) / 2, (dec_min + dec_max) / 2
+    corners = np.array([[ra_min, dec_min], [ra_min, dec_max], [ra_max, dec_min], [ra_max, dec_max]])
+    radius = float(angular_separation(corners[:, 0], corners[:, 1], center_ra, center_dec).max())
+    rows = store.index.candidates(center_ra, center_dec, min(radius, 180.0))
+    cx, cy = cell_of(store.ra[rows], store.dec[rows], level)
+    return rows[(cx == x) & (cy == y)]
+
@@ -0,0 +1,177 @@
+"""
+Search engine: cone, batch and cross-match searches on a CatalogStore.
+
+These are the searches behind the API's /search, /search/batch,
+/search/fov/batch and /crossmatch endpoints, without any HTTP: they take and
+return NumPy arrays, so offline jobs (see dso_search.cli) run exactly the
+same code as the server. Results are ordered nearest first within each
+query, with ties broken by row.
+
+The optional `lap` callback is called with a stage name at the end of each
+stage (e.g. a metrics StageTimer's lap method).
+"""
+import logging
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from .crossmatch import crossmatch, iter_crossmatch
+from .filters import AttributeFilter, cone_candidates
+from .footprints import footprint_search_many
+from .query import page_by_separation, page_groups_by_separation
+from .store import CatalogStore
+from ..catalog.binary import BINARY_DIR_NAME, binary_catalog_is_current, load_binary_catalog
+from ..catalog.merge import merge_catalogs
+
+__all__ = [
+    'CATALOG_DIR_ENV', 'DEFAULT_CATALOG_DIR', 'default_catalog_dir', 'read_catalog_frame', 'open_catalog',
+    'SearchResult', 'BatchResult', 'cone_search', 'batch_search', 'footprint_batch_search',
+    'filter_pairs', 'crossmatch', 'iter_crossmatch',
+]
+
+logger = logging.getLogger(__name__)
+
+# Environment variable overriding the directory with the processed catalogs
+CATALOG_DIR_ENV = 'DSO_SEARCH_CATALOG_DIR'
+DEFAULT_CATALOG_DIR = Path(__file__).resolve().parents[2] / 'data' / 'processed'
+
+
+def _no_lap(stage: str):
+    pass
+
+
+class SearchResult(NamedTuple):
+    """One page of a cone search: rows nearest first, their separations and the match count."""
+    rows: np.ndarray
+    separations: np.ndarray
+    total: int
+
+
+class BatchResult(NamedTuple):
+    """
+    Pages of many cone searches as parallel arrays grouped by query, with
+    each query's match count in totals.
+    """
+    query_ids: np.ndarray
+    rows: np.ndarray
+    separations: np.ndarray
+    totals: np.ndarray
+
+
+def default_catalog_dir() -> Path:
+    """Catalog directory from the environment, else the repository's data/processed."""
+    return Path(os.environ.get(CATALOG_DIR_ENV) or DEFAULT_CATALOG_DIR)
+
+
+def read_catalog_frame(data_dir=None):
+    """Processed CSVs of data_dir combined, merging cross-identified entries."""
+    import pandas as pd
+
+    data_dir = Path(data_dir) if data_dir is not None else default_catalog_dir()
+    csv_files = sorted(data_dir.glob('processed_*.csv'))
+    if not csv_files:
+        raise ValueError(f"No processed catalogs found in {data_dir}")
+    return merge_catalogs(pd.concat([pd.read_csv(f) for f in csv_files], ignore_index=True))
+
+
+def open_catalog(data_dir=None) -> CatalogStore:
+    """
+    Catalog store of the processed catalogs in data_dir (default:
+    default_catalog_dir()): the memory-mapped binary artifact when it is up
+    to date and maps cleanly, else the merged processed CSVs.
+    """
+    data_dir = Path(data_dir) if data_dir is not None else default_catalog_dir()
+    if binary_catalog_is_current(data_dir):
+        try:
+            return load_binary_catalog(data_dir / BINARY_DIR_NAME)
+        except Exception as e:
+            logger.warning(f"Could not map binary catalog, reading CSVs instead: {e}")
+    else:
+        logger.warning(f"Binary catalog in {data_dir} is missing or stale, reading CSVs instead")
+    return CatalogStore.from_frame(read_catalog_frame(data_dir))
+
+
+def cone_search(store, ra: float, dec: float, radius: float, attribute_filter: AttributeFilter = None,
+                offset: int = 0, limit: int = None, lap=_no_lap) -> SearchResult:
+    """Objects within radius degrees of (ra, dec) that satisfy the filter, one page of them."""
+    rows = cone_candidates(store, ra, dec, radius, attribute_filter)
+    lap('candidates')
+    rows, dots = store.within(rows, ra, dec, radius)
+    lap('exact')
+    # Only the rows on the requested page are ordered and materialized
+    page = rows[page_by_separation(rows, dots, offset, limit)]
+    separations = store.separations(page, ra, dec)
+    lap('order')
+    return SearchResult(page, separations, len(rows))
+
+
+def filter_pairs(store, query_ids: np.ndarray, rows: np.ndarray, filters) -> np.ndarray:
+    """
+    Mask of the (query, row) pairs that satisfy their query's filter.
+
+    Args:
+        filters: One AttributeFilter (or None) per query; each distinct
+            filter is evaluated once over all pairs it applies to
+    """
+    keep = np.ones(len(rows), dtype=bool)
+    filters = [f if f is not None else AttributeFilter() for f in filters]
+    for key in {f.key() for f in filters if f.active}:
+        selected = np.array([f.key() == key for f in filters])[query_ids]
+        keep[selected] = AttributeFilter(*key).mask(store, rows[selected])
+    return keep
+
+
+def _page_batch(store, query_ids, rows, dots, ra, dec, offsets, limits) -> BatchResult:
+    n = len(ra)
+    offsets = np.zeros(n, dtype=np.int64) if offsets is None else offsets
+    limits = np.full(n, -1, dtype=np.int64) if limits is None else [-1 if limit is None else limit
+                                                                      for limit in limits]
+    keep, totals = page_groups_by_separation(query_ids, rows, dots, n, offsets, limits)
+    query_ids, rows = query_ids[keep], rows[keep]
+    separations = store.separations(rows, ra[query_ids], dec[query_ids])
+    return BatchResult(query_ids, rows, separations, totals)
+
+
+def batch_search(store, ra, dec, radius, filters=None, offsets=None, limits=None,
+                 lap=_no_lap) -> BatchResult:
+    """
+    Many cone searches in one vectorized pass over the spatial index.
+
+    Args:
+        ra, dec, radius: Per-query arrays (radius may be a scalar)
+        filters: Per-query AttributeFilters (or None); None for no filtering
+        offsets: Per-query number of nearest matches to skip; None for 0
+        limits: Per-query page size, None or -1 for no limit
+    """
+    ra = np.atleast_1d(np.asarray(ra, dtype=np.float64))
+    dec = np.atleast_1d(np.asarray(dec, dtype=np.float64))
+    query_ids, rows, dots = store.cone_many(ra, dec, radius, return_dots=True)
+    lap('cone')
+    if filters is not None:
+        keep = filter_pairs(store, query_ids, rows, filters)
+        query_ids, rows, dots = query_ids[keep], rows[keep], dots[keep]
+    lap('filter')
+    result = _page_batch(store, query_ids, rows, dots, ra, dec, offsets, limits)
+    lap('order')
+    return result
+
+
+def footprint_batch_search(store, footprints, filters=None, offsets=None, limits=None,
+                           lap=_no_lap) -> BatchResult:
+    """
+    Many field-of-view searches in one pass, ordered by separation from
+    each footprint's centre; arguments as in batch_search().
+    """
+    query_ids, rows, dots = footprint_search_many(store, footprints)
+    lap('footprint')
+    if filters is not None:
+        keep = filter_pairs(store, query_ids, rows, filters)
+        query_ids, rows, dots = query_ids[keep], rows[keep], dots[keep]
+    lap('filter')
+    ra = np.array([footprint.ra for footprint in footprints], dtype=np.float64)
+    dec = np.array([footprint.dec for footprint in footprints], dtype=np.float64)
+    result = _page_batch(store, query_ids, rows, dots, ra, dec, offsets, limits)
+    lap('order')
+    return result
@@ -0,0 +1,123 @@
+"""
+Attribute filters (catalog, size range, name prefix) evaluated inside the search.
+
+A filtered cone search picks the smallest of its candidate sources before
+any row is materialized: the zone index slices of the cone, the rows of the
+requested catalogs, the size range in the sorted size array or the name
+range in the sorted name array. The remaining conditions are then applied
+as vectorized masks on those candidates, followed by the exact cone test.
+"""
+import numpy as np
+
+
+class AttributeFilter:
+    """Conditions on object attributes; unset conditions match everything."""
+
+    def __init__(self, catalogs=None, min_size: float = None, max_size: float = None,
+                 name_prefix: str = None):
+        self.catalogs = tuple(catalogs) if catalogs else None
+        self.min_size = min_size
+        self.max_size = max_size
+        self.name_prefix = name_prefix or None
+
+    @property
+    def active(self) -> bool:
+        return any(value is not None for value in self.key())
+
+    def key(self) -> tuple:
+        """Hashable description of the filter, e.g. for cache keys."""
+        return (self.catalogs, self.min_size, self.max_size, self.name_prefix)
+
+    def resolve(self, store) -> dict:
+        """
+        Translate the filter into store terms.
+
+        Returns a dict with the allowed catalog codes (or None), the bounds
+        into size_order (or None) and the bounds into name_order (or None).
+        """
+        codes = None
+        if self.catalogs is not None:
+            codes = [store.catalog_code_of(catalog) for catalog in self.catalogs]
+            codes = np.array(sorted({code for code in codes if code is not None}), dtype=np.int64)
+        sizes = None
+        if self.min_size is not None or self.max_size is not None:
+            sizes = store.size_range(self.min_size, self.max_size)
+        names = None
+        if self.name_prefix is not None:
+            names = store.name_prefix_range(self.name_prefix)
+        return {'codes': codes, 'sizes': sizes, 'names': names}
+
+    def mask(self, store, rows, resolved: dict = None) -> np.ndarray:
+        """Boolean mask of the given rows that satisfy every condition."""
+        resolved = self.resolve(store) if resolved is None else resolved
+        keep = np.ones(len(rows), dtype=bool)
+        if resolved['codes'] is not None:
+            allowed = np.zeros(len(store.catalog_names), dtype=bool)
+            allowed[resolved['codes']] = True
+            keep &= allowed[store.catalog_code[rows]]
+        if resolved['sizes'] is not None:
+            size = store.size[rows]
+            if self.min_size is not None:
+                keep &= size >= self.min_size
+            if self.max_size is not None:
+                keep &= size <= self.max_size
+        if resolved['names'] is not None:
+            lo, hi = resolved['names']
+            rank = store.name_rank[rows]
+            keep &= (rank >= lo) & (rank < hi)
+        return keep
+
+    def candidate_sources(self, store, resolved: dict) -> list:
+        """(count, fetch) pairs for every attribute-based candidate source."""
+        sources = []
+        codes = resolved['codes']
+        if codes is not None:
+            count = sum(len(store.catalog_rows(code)) for code in codes)
+            sources.append((count, lambda: np.concatenate(
+                [store.catalog_rows(code) for code in codes] + [np.empty(0, dtype=np.int64)])))
+        if resolved['sizes'] is not None:
+            lo, hi = resolved['sizes']
+            sources.append((hi - lo, lambda: store.size_order[lo:hi]))
+        if resolved['names'] is not None:
+            lo, hi = resolved['names']
+            sources.append((hi - lo, lambda: store.name_order[lo:hi]))
+        return sources
+
+
+def cone_candidates(store, ra: float, dec: float, radius: float, attribute_filter: AttributeFilter = None):
+    """
+    Ascending rows that may lie in the cone and satisfy the filter.
+
+    The cheaper of the spatial index and the filter's own row ranges supplies
+    the candidates, which are then narrowed by the filter. The exact cone
+    test is left to CatalogStore.within().
+    """
+    if attribute_filter is None or not attribute_filter.active:
+        return store.index.candidates(ra, dec, radius)
+
+    resolved = attribute_filter.resolve(store)
+    spatial_count = store.index.count_candidates(ra, dec, radius)
+    sources = attribute_filter.candidate_sources(store, resolved)
+    count, fetch = min(sources, key=lambda source: source[0])
+
+    if count < spatial_count:
+        rows = np.sort(np.asarray(fetch(), dtype=np.int64))
+    else:
+        rows = store.index.candidates(ra, dec, radius)
+    return rows[attribute_filter.mask(store, rows, resolved)]
+
+
+def filtered_rows(store, attribute_filter: AttributeFilter = None) -> np.ndarray:
+    """
+    Ascending rows of the whole catalog that satisfy the filter.
+
+    For searches without a spatial constraint: the smallest of the filter's
+    own row ranges supplies the candidates, and every row is scanned only
+    when the filter is inactive.
+    """
+    if attribute_filter is None or not attribute_filter.active:
+        return np.arange(len(store), dtype=np.int64)
+    resolved = attribute_filter.resolve(store)
+    _, fetch = min(attribute_filter.candidate_sources(store, resolved), key=lambda source: source[0])
+    rows = np.sort(np.asarray(fetch(), dtype=np.int64))
+    return rows[attribute_filter.mask(store, rows, resolved)]
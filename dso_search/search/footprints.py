@@ -0,0 +1,169 @@
+"""
+Field-of-view searches: objects inside rotated rectangles or spherical polygons.
+
+A footprint is a spherical polygon whose edges are great-circle arcs, which
+is exactly the shape of a camera's field of view. It is searched in two
+steps. First, the spatial index supplies the candidates inside the
+footprint's bounding cone (the cone around the vertices' mean direction
+that contains every vertex). Then each candidate is projected onto the
+plane tangent at the cone's centre (gnomonic projection) and tested against
+the polygon there. The gnomonic projection maps great circles to straight
+lines, so the planar even-odd test is exact. All candidates of all
+footprints are tested together, one polygon edge at a time.
+
+Footprints must fit in a hemisphere (bounding cone under 90 degrees).
+"""
+import numpy as np
+
+from .store import unit_vectors
+
+MAX_VERTICES = 1000
+
+
+def _tangent_basis(center: np.ndarray):
+    """East and north unit vectors of the plane tangent at a unit vector."""
+    ra = np.arctan2(center[..., 1], center[..., 0])
+    dec = np.arcsin(np.clip(center[..., 2], -1.0, 1.0))
+    east = np.stack([-np.sin(ra), np.cos(ra), np.zeros_like(ra)], axis=-1)
+    north = np.stack([-np.sin(dec) * np.cos(ra), -np.sin(dec) * np.sin(ra), np.cos(dec)], axis=-1)
+    return east, north
+
+
+class Footprint:
+    """
+    A spherical polygon given by its vertices in degrees, in either order.
+
+    Raises ValueError for fewer than three vertices or a polygon that does
+    not fit in a hemisphere.
+    """
+
+    def __init__(self, ra, dec):
+        ra = np.atleast_1d(np.asarray(ra, dtype=np.float64))
+        dec = np.atleast_1d(np.asarray(dec, dtype=np.float64))
+        if ra.shape != dec.shape or ra.ndim != 1:
+            raise ValueError("Vertex ra and dec must be 1-D arrays of the same length")
+        if not 3 <= len(ra) <= MAX_VERTICES:
+            raise ValueError(f"A footprint needs 3 to {MAX_VERTICES} vertices")
+        vertices = unit_vectors(ra, dec)
+        center = vertices.sum(axis=0)
+        norm = np.linalg.norm(center)
+        if norm < 1e-9:
+            raise ValueError("Footprint must fit in a hemisphere")
+        center /= norm
+        min_dot = (vertices @ center).min()
+        if min_dot <= 1e-9:
+            raise ValueError("Footprint must fit in a hemisphere")
+
+        self.vertices_ra = ra
+        self.vertices_dec = dec
+        self.center = center
+        self.ra = float(np.rad2deg(np.arctan2(center[1], center[0])) % 360.0)
+        self.dec = float(np.rad2deg(np.arcsin(np.clip(center[2], -1.0, 1.0))))
+        self.radius = float(np.rad2deg(np.arccos(min(min_dot, 1.0))))
+        self.east, self.north = _tangent_basis(center)
+        depth = vertices @ center
+        self.x = (vertices @ self.east) / depth
+        self.y = (vertices @ self.north) / depth
+
+    @classmethod
+    def rectangle(cls, ra: float, dec: float, width: float, height: float,
+                  position_angle: float = 0.0) -> "Footprint":
+        """
+        A camera field of view centred on (ra, dec).
+
+        Args:
+            width, height: Angular extent in degrees across the centre
+            position_angle: Angle of the `height` axis from north through
+                east, in degrees
+        """
+        if not (0 < width < 180 and 0 < height < 180):
+            raise ValueError("width and height must be between 0 and 180 degrees")
+        center = unit_vectors([ra], [dec])[0]
+        east, north = _tangent_basis(center)
+        pa = np.deg2rad(position_angle)
+        up = np.sin(pa) * east + np.cos(pa) * north
+        right = np.cos(pa) * east - np.sin(pa) * north
+        half_width = np.tan(np.deg2rad(width) / 2)
+        half_height = np.tan(np.deg2rad(height) / 2)
+        corners = np.array([
+            center + sx * half_width * right + sy * half_height * up
+            for sx, sy in ((-1, -1), (1, -1), (1, 1), (-1, 1))
+        ])
+        corners /= np.linalg.norm(corners, axis=1, keepdims=True)
+        corner_ra = np.rad2deg(np.arctan2(corners[:, 1], corners[:, 0])) % 360.0
+        corner_dec = np.rad2deg(np.arcsin(np.clip(corners[:, 2], -1.0, 1.0)))
+        return cls(corner_ra, corner_dec)
+
+
+class _FootprintArrays:
+    """Footprints stacked for vectorized tests, with vertex lists closed and padded."""
+
+    def __init__(self, footprints):
+        self.center = np.array([footprint.center for footprint in footprints])
+        self.east = np.array([footprint.east for footprint in footprints])
+        self.north = np.array([footprint.north for footprint in footprints])
+        self.ra = np.array([footprint.ra for footprint in footprints])
+        self.dec = np.array([footprint.dec for footprint in footprints])
+        self.radius = np.array([footprint.radius for footprint in footprints])
+        # Close every polygon and pad it by repeating its first vertex; the
+        # padding edges are degenerate and never cross a test ray
+        n = max(len(footprint.x) for footprint in footprints) + 1
+        self.x = np.empty((len(footprints), n))
+        self.y = np.empty((len(footprints), n))
+        for i, footprint in enumerate(footprints):
+            k = len(footprint.x)
+            self.x[i, :k], self.x[i, k:] = footprint.x, footprint.x[0]
+            self.y[i, :k], self.y[i, k:] = footprint.y, footprint.y[0]
+
+    def contains(self, ids, points):
+        """
+        Which (footprint, point) pairs have the point inside the footprint.
+
+        Returns the mask and each point's dot product with its footprint's
+        centre (larger is closer), which orders matches like cone searches.
+        """
+        depth = np.einsum('ij,ij->i', points, self.center[ids])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = np.einsum('ij,ij->i', points, self.east[ids]) / depth
+            y = np.einsum('ij,ij->i', points, self.north[ids]) / depth
+        inside = np.zeros(len(ids), dtype=bool)
+        for k in range(self.x.shape[1] - 1):
+            x1, y1 = self.x[ids, k], self.y[ids, k]
+            x2, y2 = self.x[ids, k + 1], self.y[ids, k + 1]
+            crosses = (y1 > y) != (y2 > y)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                edge_x = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+            inside ^= crosses & (x < edge_x)
+        return inside & (depth > 0), depth
+
+
+def footprint_search_many(store, footprints):
+    """
+    Objects inside each of many footprints, in one pass over the spatial index.
+
+    Returns (footprint_ids, rows, dots) like CatalogStore.cone_many(...,
+    return_dots=True), with dots taken against each footprint's centre.
+    """
+    if not footprints:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.copy(), np.empty(0, dtype=np.float64)
+    arrays = _FootprintArrays(footprints)
+    ids, rows = store.index.candidates_many(arrays.ra, arrays.dec, arrays.radius)
+    keep, dots = arrays.contains(ids, store.xyz[rows])
+    return ids[keep], rows[keep], dots[keep]
+
+
+def footprint_search(store, footprint: Footprint, candidates=None):
+    """
+    Objects inside one footprint, as ascending (rows, dots).
+
+    Args:
+        candidates: Ascending rows to test instead of those in the bounding
+            cone, e.g. from filters.cone_candidates() with an attribute filter
+    """
+    if candidates is None:
+        candidates = store.index.candidates(footprint.ra, footprint.dec, footprint.radius)
+    rows = np.asarray(candidates, dtype=np.int64)
+    keep, dots = _FootprintArrays([footprint]).contains(np.zeros(len(rows), dtype=np.int64),
+                                                          store.xyz[rows])
+    return rows[keep], dots[keep]
@@ -0,0 +1,23 @@
+"""
+Spherical geometry helpers shared by the search code.
+"""
+import numpy as np
+
+
+def angular_separation(ra, dec, ra0, dec0):
+    """
+    Great-circle distance in degrees between (ra, dec) and (ra0, dec0).
+
+    Uses the haversine formula, which stays accurate for small separations.
+    All arguments are in degrees and may be scalars or arrays.
+    """
+    ra_diff = ra - ra0
+    dec_diff = dec - dec0
+    return (
+        2 * np.arcsin(np.sqrt(
+            np.sin(np.deg2rad(dec_diff) / 2) ** 2 +
+            np.cos(np.deg2rad(dec0)) *
+            np.cos(np.deg2rad(dec)) *
+            np.sin(np.deg2rad(ra_diff) / 2) ** 2
+        )) * 180 / np.pi
+    )
@@ -0,0 +1,140 @@
+"""
+Normalization of object designations and the name lookup index.
+
+Designations are compared in a canonical form, so "NGC 224", "ngc224" and
+"NGC 0224" are the same key and "Messier 31" matches "M31". Every object is
+indexed under its own name, its NGC cross-identification, the aliases left
+by the catalog merge and its common name. Objects sharing any key (e.g. M31
+and NGC224) are linked into one group, so a lookup through either
+designation finds both entries.
+"""
+import bisect
+import re
+
+import numpy as np
+
+_DESIGNATION = re.compile(r'^(MESSIER|M|NGC|IC)0*(\d+)(.*)$')
+
+
+def normalize_name(value) -> str:
+    """Canonical lookup form of a designation: upper case without whitespace."""
+    return ''.join(str(value).split()).upper()
+
+
+def designation_key(value) -> str:
+    """
+    Key used by the name index.
+
+    Like normalize_name, but also drops punctuation, spells out Messier
+    designations as M and strips leading zeros from catalog numbers.
+    """
+    key = ''.join(char for char in normalize_name(value) if char.isalnum())
+    match = _DESIGNATION.match(key)
+    if match:
+        prefix, number, rest = match.groups()
+        key = ('M' if prefix == 'MESSIER' else prefix) + number + rest
+    return key
+
+
+class NameIndex:
+    """Hash and sorted-prefix index over the designations of a CatalogStore."""
+
+    # Columns indexed for every row, in order of preference for display
+    COLUMNS = ('name', 'ngc_name', 'aliases', 'common_name')
+    # Separator of several designations in one column (see catalog.merge)
+    SEPARATOR = ';'
+
+    def __init__(self, store):
+        self.store = store
+        n = len(store)
+        entries = []
+        for column in self.COLUMNS:
+            values = getattr(store, column, None)
+            if values is None:
+                continue
+            for row, value in enumerate(values[:n]):
+                for text in str(value).split(self.SEPARATOR) if value else ():
+                    key = designation_key(text)
+                    if key:
+                        entries.append((key, row, text.strip()))
+
+        self._rows = {}
+        for key, row, _ in entries:
+            rows = self._rows.setdefault(key, [])
+            if row not in rows:
+                rows.append(row)
+
+        # Link rows that share a key, using union-find over row numbers
+        parent = np.arange(n)
+
+        def find(row):
+            while parent[row] != row:
+                parent[row] = parent[parent[row]]
+                row = parent[row]
+            return row
+
+        for rows in self._rows.values():
+            root = find(rows[0])
+            for row in rows[1:]:
+                other = find(row)
+                if other != root:
+                    parent[max(root, other)] = min(root, other)
+                    root = min(root, other)
+        self.group = np.array([find(row) for row in range(n)], dtype=np.int64)
+        # Members of each group with more than one row, from a single stable sort
+        order = np.argsort(self.group, kind='stable')
+        roots, starts, counts = np.unique(self.group[order], return_index=True, return_counts=True)
+        linked = counts > 1
+        self._members = {int(root): order[start:start + count]
+                         for root, start, count in zip(roots[linked], starts[linked], counts[linked])}
+
+        entries.sort()
+        self._keys = [key for key, _, _ in entries]
+        self._entries = [(row, text) for _, row, text in entries]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def linked(self, row: int) -> np.ndarray:
+        """Every row in the same group as `row`, ascending, including itself."""
+        members = self._members.get(int(self.group[row]))
+        return members if members is not None else np.array([row], dtype=np.int64)
+
+    def resolve(self, name: str):
+        """
+        Look up a designation or common name.
+
+        Returns (row, linked): the best matching row and the other rows of its
+        group, or (None, empty array) if nothing matches. An object whose own
+        name matches is preferred over one matching through a cross-identification.
+        """
+        key = designation_key(name)
+        rows = self._rows.get(key)
+        if not rows:
+            return None, np.empty(0, dtype=np.int64)
+        own = [row for row in rows if designation_key(self.store.name[row]) == key]
+        row = own[0] if own else rows[0]
+        linked = self.linked(row)
+        return row, linked[linked != row]
+
+    def complete(self, prefix: str, limit: int = 10) -> list:
+        """
+        Suggestions for a partial name: (text, row) pairs in key order.
+
+        At most one suggestion is returned per linked group.
+        """
+        prefix = designation_key(prefix)
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self._keys, prefix)
+        suggestions = []
+        seen = set()
+        for i in range(start, len(self._keys)):
+            if not self._keys[i].startswith(prefix) or len(suggestions) >= limit:
+                break
+            row, text = self._entries[i]
+            group = int(self.group[row])
+            if group not in seen:
+                seen.add(group)
+                suggestions.append((text, row))
+        return suggestions
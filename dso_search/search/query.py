@@ -0,0 +1,64 @@
+"""
+Ordering and paging of cone search results.
+
+Matches are ordered nearest first using the dot products already computed by
+the store (a larger dot product means a smaller separation), with ties broken
+by row number so pages are stable. When only a page is requested, a partial
+selection (argpartition) finds the rows that can be on it, and only those are
+sorted and materialized.
+"""
+import numpy as np
+
+
+def page_by_separation(rows, dots, offset: int = 0, limit: int = None) -> np.ndarray:
+    """
+    Positions (into rows/dots) of one page of matches, nearest first.
+
+    Args:
+        rows: Row numbers of the matches
+        dots: Dot products of the matches with the query's unit vector
+        offset: Number of nearest matches to skip
+        limit: Maximum number of matches to return; None for all
+    """
+    n = len(rows)
+    stop = n if limit is None else min(n, offset + limit)
+    if offset >= stop:
+        return np.empty(0, dtype=np.int64)
+
+    keys = -np.asarray(dots)
+    if stop < n:
+        # Everything up to the stop-th nearest, keeping all ties at the cut
+        kth = keys[np.argpartition(keys, stop - 1)[stop - 1]]
+        subset = np.nonzero(keys <= kth)[0]
+    else:
+        subset = np.arange(n)
+    ordered = subset[np.lexsort((rows[subset], keys[subset]))]
+    return ordered[offset:stop]
+
+
+def page_groups_by_separation(query_ids, rows, dots, n_queries: int, offsets, limits):
+    """
+    Page the matches of many queries at once.
+
+    Args:
+        query_ids, rows, dots: Parallel arrays of (query, match) pairs
+        n_queries: Number of queries
+        offsets: Per-query number of nearest matches to skip
+        limits: Per-query page size, with -1 meaning no limit
+
+    Returns:
+        (positions, totals): positions of the kept pairs, grouped by query
+        and nearest first within each query, and the number of matches of
+        each query before paging
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    limits = np.asarray(limits, dtype=np.int64)
+    totals = np.bincount(query_ids, minlength=n_queries)
+
+    order = np.lexsort((rows, -np.asarray(dots), query_ids))
+    ordered_queries = query_ids[order]
+    starts = np.cumsum(totals) - totals
+    rank = np.arange(len(order)) - starts[ordered_queries]
+    stops = np.where(limits < 0, np.iinfo(np.int64).max, offsets + limits)
+    keep = (rank >= offsets[ordered_queries]) & (rank < stops[ordered_queries])
+    return order[keep], totals
@@ -0,0 +1,270 @@
+"""
+Columnar catalog store used by the search endpoints.
+
+All per-object quantities the search needs are computed once when the store
+is built and kept as contiguous float64 arrays, so a request only does array
+indexing and a few products against the query's unit vector.
+"""
+import bisect
+import sys
+import threading
+
+import numpy as np
+
+from .density import DensityPyramid
+from .geometry import angular_separation
+from .names import NameIndex, normalize_name
+from .zones import DEFAULT_ZONE_HEIGHT, ZoneIndex
+
+# Numeric columns kept by the store, in the order they are persisted.
+ARRAY_COLUMNS = (
+    'ra', 'dec', 'size', 'catalog_code', 'ra_rad', 'dec_rad', 'sin_dec', 'cos_dec', 'xyz',
+    'catalog_order', 'size_order', 'size_sorted', 'name_order', 'name_rank',
+)
+# String columns kept by the store; missing values are empty strings.
+STRING_COLUMNS = ('name', 'common_name', 'ngc_name', 'aliases')
+
+
+def unit_vectors(ra, dec) -> np.ndarray:
+    """Return an (N, 3) C-contiguous array of unit vectors for (ra, dec) in degrees."""
+    ra_rad = np.deg2rad(np.asarray(ra, dtype=np.float64))
+    dec_rad = np.deg2rad(np.asarray(dec, dtype=np.float64))
+    cos_dec = np.cos(dec_rad)
+    return np.ascontiguousarray(np.stack(
+        [cos_dec * np.cos(ra_rad), cos_dec * np.sin(ra_rad), np.sin(dec_rad)],
+        axis=-1,
+    ))
+
+
+class CatalogStore:
+    """Immutable columnar view of the catalog with a spatial index."""
+
+    def __init__(self, name, catalog, ra, dec, size, common_name=None, ngc_name=None,
+                 aliases=None, zone_height: float = DEFAULT_ZONE_HEIGHT):
+        self.ra = np.ascontiguousarray(ra, dtype=np.float64)
+        self.dec = np.ascontiguousarray(dec, dtype=np.float64)
+        self.size = np.ascontiguousarray(size, dtype=np.float64)
+        n = len(self.ra)
+        if not (len(self.dec) == len(self.size) == len(name) == len(catalog) == n):
+            raise ValueError("All catalog columns must have the same length")
+
+        # Strings are interned: names become one shared object each, catalogs
+        # are stored as small integer codes into catalog_names.
+        self.name = np.array([sys.intern(str(value)) for value in name], dtype=object)
+        self.common_name = _optional_strings(common_name, n)
+        self.ngc_name = _optional_strings(ngc_name, n)
+        self.aliases = _optional_strings(aliases, n)
+        self.catalog_names, codes = np.unique(np.asarray(catalog, dtype=str), return_inverse=True)
+        self.catalog_names = [sys.intern(str(value)) for value in self.catalog_names]
+        self.catalog_code = codes.astype(np.int16 if len(self.catalog_names) < 2**15 else np.int32)
+
+        self.ra_rad = np.deg2rad(self.ra)
+        self.dec_rad = np.deg2rad(self.dec)
+        self.sin_dec = np.sin(self.dec_rad)
+        self.cos_dec = np.cos(self.dec_rad)
+        self.xyz = unit_vectors(self.ra, self.dec)
+
+        self.index = ZoneIndex(self.ra, self.dec, zone_height=zone_height)
+
+        # Secondary orderings that let attribute filters select rows without
+        # scanning: rows grouped by catalog, sorted by size (NaN last) and
+        # sorted by normalized name, plus each row's position in the latter.
+        self.catalog_order = np.argsort(self.catalog_code, kind='stable')
+        self.size_order = np.argsort(self.size, kind='stable')
+        self.size_sorted = self.size[self.size_order]
+        normalized = np.array([normalize_name(value) for value in self.name], dtype=str)
+        self.name_order = np.argsort(normalized, kind='stable')
+        self.name_rank = np.empty(n, dtype=np.int64)
+        self.name_rank[self.name_order] = np.arange(n)
+        self._finish()
+
+    def _finish(self):
+        """Derive the small lookup tables that are not persisted."""
+        self._catalog_lookup = np.array(self.catalog_names, dtype=object)
+        self._catalog_codes = {name.lower(): code for code, name in enumerate(self.catalog_names)}
+        counts = np.bincount(self.catalog_code, minlength=len(self.catalog_names))
+        self._catalog_offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._names = None
+        self._names_lock = threading.Lock()
+        self._density = None
+        self._density_lock = threading.Lock()
+
+    @property
+    def names(self) -> NameIndex:
+        """Designation lookup index, built on first use."""
+        if self._names is None:
+            with self._names_lock:
+                if self._names is None:
+                    self._names = NameIndex(self)
+        return self._names
+
+    @property
+    def density(self) -> DensityPyramid:
+        """Sky density pyramid, built on first use."""
+        if self._density is None:
+            with self._density_lock:
+                if self._density is None:
+                    self._density = DensityPyramid.from_store(self)
+        return self._density
+
+    @classmethod
+    def from_columns(cls, columns: dict, catalog_names, zone_height: float) -> "CatalogStore":
+        """
+        Wrap precomputed columns without copying them.
+
+        `columns` holds every entry of ARRAY_COLUMNS and STRING_COLUMNS plus the
+        zone index arrays `index_keys`/`index_order`, as produced by
+        to_columns(). Memory-mapped arrays stay memory-mapped.
+        """
+        store = cls.__new__(cls)
+        for column in ARRAY_COLUMNS:
+            setattr(store, column, columns[column])
+        for column in STRING_COLUMNS:
+            setattr(store, column, columns[column])
+        store.catalog_names = [sys.intern(str(value)) for value in catalog_names]
+        store.index = ZoneIndex.from_sorted(columns['index_keys'], columns['index_order'], zone_height)
+        store._finish()
+        return store
+
+    def to_columns(self) -> dict:
+        """All arrays needed to rebuild the store with from_columns()."""
+        columns = {column: getattr(self, column) for column in ARRAY_COLUMNS + STRING_COLUMNS}
+        columns['index_keys'] = self.index.keys
+        columns['index_order'] = self.index.order
+        return columns
+
+    @classmethod
+    def from_frame(cls, df, **kwargs) -> "CatalogStore":
+        """
+        Build a store from a DataFrame with name/catalog/ra/dec/size columns
+        and optional common_name/ngc_name/aliases columns.
+        """
+        optional = {column: df[column].to_numpy() for column in ('common_name', 'ngc_name', 'aliases')
+                    if column in df.columns}
+        return cls(
+            name=df['name'].to_numpy(),
+            catalog=df['catalog'].to_numpy(),
+            ra=df['ra'].to_numpy(dtype=np.float64),
+            dec=df['dec'].to_numpy(dtype=np.float64),
+            size=df['size'].to_numpy(dtype=np.float64, na_value=np.nan),
+            **optional,
+            **kwargs,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ra)
+
+    def catalog_counts(self) -> dict:
+        """Object count per catalog, largest catalog first."""
+        counts = np.bincount(self.catalog_code, minlength=len(self.catalog_names))
+        order = np.argsort(-counts, kind='stable')
+        return {self.catalog_names[i]: int(counts[i]) for i in order if counts[i]}
+
+    def catalog_of(self, rows) -> np.ndarray:
+        """Catalog name (as an object array) for each of the given rows."""
+        return self._catalog_lookup[self.catalog_code[rows]]
+
+    def catalog_code_of(self, catalog: str):
+        """Integer code of a catalog name (case-insensitive), or None if unknown."""
+        return self._catalog_codes.get(str(catalog).lower())
+
+    def catalog_rows(self, code: int) -> np.ndarray:
+        """Ascending rows of one catalog."""
+        return self.catalog_order[self._catalog_offsets[code]:self._catalog_offsets[code + 1]]
+
+    def size_range(self, min_size: float = None, max_size: float = None):
+        """
+        Bounds (lo, hi) into size_order of the rows with min_size <= size <= max_size.
+
+        Rows without a size are never inside the bounds.
+        """
+        lo = 0 if min_size is None else int(np.searchsorted(self.size_sorted, min_size, side='left'))
+        hi = int(np.searchsorted(self.size_sorted, np.inf if max_size is None else max_size, side='right'))
+        return lo, max(lo, hi)
+
+    def name_prefix_range(self, prefix: str):
+        """Bounds (lo, hi) into name_order of the rows whose normalized name starts with prefix."""
+        prefix = normalize_name(prefix)
+        names = _SortedNames(self)
+        lo = bisect.bisect_left(names, prefix)
+        hi = bisect.bisect_right(names, prefix, lo=lo, key=lambda name: name[:len(prefix)])
+        return lo, hi
+
+    def _within(self, query_ids, rows, queries, radius):
+        """Exact cone test of (query, row) pairs; returns the keep mask and dot products."""
+        queries = queries[query_ids]
+        vectors = self.xyz[rows]
+        dots = (vectors[:, 0] * queries[:, 0] +
+                vectors[:, 1] * queries[:, 1] +
+                vectors[:, 2] * queries[:, 2])
+        # Compare squared chord lengths rather than dots against cos(radius),
+        # which rounds to 1 for sub-arcsecond radii.
+        chords = ((vectors[:, 0] - queries[:, 0]) ** 2 +
+                  (vectors[:, 1] - queries[:, 1]) ** 2 +
+                  (vectors[:, 2] - queries[:, 2]) ** 2)
+        # A 180 degree cone is the whole sphere, whatever the rounding says.
+        max_chord = np.where(radius >= 180.0, np.inf, 4.0 * np.sin(np.deg2rad(radius) / 2.0) ** 2)
+        return chords <= max_chord[query_ids], dots
+
+    def within(self, rows, ra: float, dec: float, radius: float):
+        """Subset of the given rows inside one cone, returned as (rows, dots)."""
+        rows = np.asarray(rows, dtype=np.int64)
+        keep, dots = self._within(np.zeros(len(rows), dtype=np.int64), rows,
+                                  unit_vectors([ra], [dec]), np.array([radius], dtype=np.float64))
+        return rows[keep], dots[keep]
+
+    def cone_many(self, ra, dec, radius, return_dots: bool = False):
+        """
+        Run many cone searches in one vectorized pass.
+
+        Returns (query_ids, rows): parallel arrays pairing each query with
+        the rows inside its cone, grouped by query with rows ascending. With
+        return_dots, a third array holds each row's dot product with its
+        query's unit vector, which orders matches by separation.
+        """
+        ra, dec, radius = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(ra, dtype=np.float64)),
+            np.atleast_1d(np.asarray(dec, dtype=np.float64)),
+            np.atleast_1d(np.asarray(radius, dtype=np.float64)),
+        )
+        query_ids, rows = self.index.candidates_many(ra, dec, radius)
+        keep, dots = self._within(query_ids, rows, unit_vectors(ra, dec), radius)
+        if return_dots:
+            return query_ids[keep], rows[keep], dots[keep]
+        return query_ids[keep], rows[keep]
+
+    def cone(self, ra: float, dec: float, radius: float, return_dots: bool = False):
+        """
+        Ascending row numbers of the objects within radius degrees of (ra, dec).
+
+        With return_dots, returns (rows, dots) as described in cone_many().
+        """
+        result = self.cone_many(ra, dec, radius, return_dots=return_dots)
+        return result[1:] if return_dots else result[1]
+
+    def separations(self, rows, ra, dec) -> np.ndarray:
+        """Angular distance in degrees of the given rows from (ra, dec)."""
+        return angular_separation(self.ra[rows], self.dec[rows], ra, dec)
+
+
+def _optional_strings(values, n: int) -> np.ndarray:
+    """Interned object array of strings, with '' for missing values."""
+    if values is None:
+        return np.full(n, '', dtype=object)
+    if len(values) != n:
+        raise ValueError("All catalog columns must have the same length")
+    return np.array([sys.intern(str(value)) if isinstance(value, str) else '' for value in values],
+                    dtype=object)
+
+
+class _SortedNames:
+    """Sequence view of a store's normalized names in sorted order, for bisect."""
+
+    def __init__(self, store):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store.name_order)
+
+    def __getitem__(self, i: int) -> str:
+        return normalize_name(self._store.name[self._store.name_order[i]])
@@ -0,0 +1,120 @@
+"""
+Observability planning: which objects rise above an altitude during a night.
+
+The altitude of an object follows from
+
+    sin(alt) = sin(lat) sin(dec) + cos(lat) cos(dec) cos(LST - ra)
+
+which is the dot product of the object's unit vector with the observer's
+zenith expressed in equatorial coordinates. The zenith at time t is the unit
+vector of (LST(t), lat), so sin(alt) for every object and every time step is
+one (objects x 3) @ (3 x steps) matrix product of the store's precomputed
+unit vectors with the zeniths of the time grid. Objects are processed in
+chunks so the (objects x steps) grid stays within a fixed memory budget, and
+objects whose declination keeps them below the altitude at this latitude are
+dropped before any grid is built.
+
+Positions are J2000 and sidereal time is the IAU 1982 GMST expression, good
+to a few arcseconds for planning; precession, refraction and nutation are
+ignored.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+UNIX_EPOCH_JD = 2440587.5
+J2000_JD = 2451545.0
+SECONDS_PER_DAY = 86400.0
+
+# Elements of the (objects x steps) grid evaluated at once; small enough
+# for each chunk's grid to stay in cache
+DEFAULT_CHUNK_ELEMENTS = 1 << 16
+
+
+class Visibility(NamedTuple):
+    """
+    Objects above the altitude limit for at least one time step.
+
+    rows are ascending; the step arrays index into the time grid.
+    """
+    rows: np.ndarray
+    max_sin_altitude: np.ndarray
+    best_step: np.ndarray
+    first_step: np.ndarray
+    last_step: np.ndarray
+    visible_steps: np.ndarray
+
+    @property
+    def max_altitude(self) -> np.ndarray:
+        """Highest altitude over the time grid, in degrees."""
+        return np.rad2deg(np.arcsin(np.clip(self.max_sin_altitude, -1.0, 1.0)))
+
+
+def time_grid(start: float, end: float, step: float) -> np.ndarray:
+    """POSIX timestamps from start to end inclusive, step seconds apart."""
+    return start + step * np.arange(int(np.floor((end - start) / step + 1e-9)) + 1)
+
+
+def sidereal_angle(unix_seconds, longitude: float) -> np.ndarray:
+    """Local mean sidereal time in degrees for POSIX timestamps and an east longitude."""
+    days = np.asarray(unix_seconds, dtype=np.float64) / SECONDS_PER_DAY + (UNIX_EPOCH_JD - J2000_JD)
+    gmst = 280.46061837 + 360.98564736629 * days
+    return np.mod(gmst + longitude, 360.0)
+
+
+def zenith_vectors(unix_seconds, latitude: float, longitude: float) -> np.ndarray:
+    """(steps, 3) equatorial unit vectors of the observer's zenith at each time."""
+    lst = np.deg2rad(sidereal_angle(unix_seconds, longitude))
+    lat = np.deg2rad(latitude)
+    return np.ascontiguousarray(np.stack(
+        [np.cos(lat) * np.cos(lst), np.cos(lat) * np.sin(lst), np.full_like(lst, np.sin(lat))],
+        axis=-1,
+    ))
+
+
+def visible_objects(store, latitude: float, longitude: float, unix_seconds, min_altitude: float = 30.0,
+                    rows=None, chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> Visibility:
+    """
+    Objects that reach min_altitude degrees at some step of the time grid.
+
+    Args:
+        latitude, longitude: Observer position in degrees (longitude east)
+        unix_seconds: Time grid as POSIX timestamps
+        rows: Ascending rows to consider, e.g. from filters.filtered_rows();
+            None for the whole catalog
+        chunk_elements: Bound on the size of the (objects x steps) grid
+    """
+    rows = np.arange(len(store), dtype=np.int64) if rows is None else np.asarray(rows, dtype=np.int64)
+    zenith = zenith_vectors(unix_seconds, latitude, longitude)
+    steps = len(zenith)
+
+    # An object culminates at 90 - |lat - dec|; skip those that never get high enough
+    rows = rows[np.abs(store.dec[rows] - latitude) <= 90.0 - min_altitude]
+    if steps == 0:
+        rows = rows[:0]
+
+    threshold = np.sin(np.deg2rad(min_altitude))
+    chunk = max(1, chunk_elements // max(steps, 1))
+    parts = []
+    for start in range(0, len(rows), chunk):
+        block = rows[start:start + chunk]
+        sin_alt = store.xyz[block] @ zenith.T
+        best = sin_alt.argmax(axis=1)
+        peak = sin_alt[np.arange(len(best)), best]
+        seen = peak >= threshold
+        if not seen.any():
+            continue
+        above = sin_alt[seen] >= threshold
+        parts.append((
+            block[seen],
+            peak[seen],
+            best[seen],
+            above.argmax(axis=1),
+            steps - 1 - above[:, ::-1].argmax(axis=1),
+            above.view(np.uint8).sum(axis=1, dtype=np.int64),
+        ))
+
+    if not parts:
+        empty = np.empty(0, dtype=np.int64)
+        return Visibility(empty, np.empty(0, dtype=np.float64), empty, empty, empty, empty)
+    return Visibility(*(np.concatenate(column) for column in zip(*parts)))
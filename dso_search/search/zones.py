@@ -0,0 +1,150 @@
+"""
+Declination-zone spatial index for cone searches.
+
+The sky is cut into declination zones of fixed height. Inside the index the
+objects are ordered by (zone, RA), so the part of a cone that falls into one
+zone is a contiguous slice that can be found with two binary searches. A cone
+query therefore only touches the objects in those slices; the caller still
+applies the exact distance test to the returned candidates.
+"""
+import numpy as np
+
+# Default zone height in degrees. Small cones touch one or two zones, wide
+# cones touch a few hundred slices at most.
+DEFAULT_ZONE_HEIGHT = 0.5
+
+# Extra padding (degrees) applied to every candidate window so that rounding
+# in the window arithmetic can never drop an object the exact test would keep.
+_MARGIN = 1e-9
+
+
+class ZoneIndex:
+    """Sorted zone index over sky positions given in degrees."""
+
+    def __init__(self, ra, dec, zone_height: float = DEFAULT_ZONE_HEIGHT):
+        ra = np.asarray(ra, dtype=np.float64)
+        dec = np.asarray(dec, dtype=np.float64)
+        if ra.shape != dec.shape or ra.ndim != 1:
+            raise ValueError("ra and dec must be 1-D arrays of the same length")
+        if zone_height <= 0:
+            raise ValueError("zone_height must be positive")
+
+        self.zone_height = float(zone_height)
+        self.n_zones = int(np.ceil(180.0 / self.zone_height))
+
+        ra = np.mod(ra, 360.0)
+        ra[ra >= 360.0] = 0.0
+        keys = self._zone_of(dec) * 360.0 + ra
+        # NaN keys sort to the end and never fall inside a query window.
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+    @classmethod
+    def from_sorted(cls, keys, order, zone_height: float) -> "ZoneIndex":
+        """Wrap previously built keys/order arrays (e.g. memory-mapped) without copying."""
+        index = cls.__new__(cls)
+        index.zone_height = float(zone_height)
+        index.n_zones = int(np.ceil(180.0 / index.zone_height))
+        index.keys = keys
+        index.order = order
+        return index
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _zone_of(self, dec):
+        zones = np.floor((np.asarray(dec, dtype=np.float64) + 90.0) / self.zone_height)
+        return np.clip(zones, 0, self.n_zones - 1)
+
+    def _slices(self, ra, dec, radius):
+        """
+        Compute index slices covering each cone.
+
+        Returns (query_ids, starts, stops), one entry per non-empty slice of
+        the sorted key array.
+        """
+        ra = np.atleast_1d(np.asarray(ra, dtype=np.float64))
+        dec = np.atleast_1d(np.asarray(dec, dtype=np.float64))
+        radius = np.atleast_1d(np.asarray(radius, dtype=np.float64)) + _MARGIN
+        ra, dec, radius = np.broadcast_arrays(np.mod(ra, 360.0), dec, radius)
+
+        z0 = self._zone_of(np.maximum(dec - radius, -90.0)).astype(np.int64)
+        z1 = self._zone_of(np.minimum(dec + radius, 90.0)).astype(np.int64)
+
+        # Half-width in RA of the cone; a cone containing a pole spans all RA.
+        full = (np.abs(dec) + radius >= 90.0) | (radius >= 90.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratio = np.sin(np.deg2rad(radius)) / np.cos(np.deg2rad(dec))
+            alpha = np.rad2deg(np.arcsin(np.minimum(ratio, 1.0))) + _MARGIN
+        full |= ~(alpha < 180.0)
+
+        # Up to two RA windows per cone: the main one and the part that
+        # wraps around RA=0/360. Unused second windows are left empty (lo > hi).
+        lo = ra - alpha
+        hi = ra + alpha
+        wrap_lo = ~full & (lo < 0)
+        wrap_hi = ~full & (hi > 360.0)
+        lo1 = np.where(full | wrap_lo, 0.0, lo)
+        hi1 = np.where(full | wrap_hi, 360.0, hi)
+        lo2 = np.where(wrap_lo, lo + 360.0, np.where(wrap_hi, 0.0, 1.0))
+        hi2 = np.where(wrap_lo, 360.0, np.where(wrap_hi, hi - 360.0, 0.0))
+
+        n_per_query = z1 - z0 + 1
+        query_ids = np.repeat(np.arange(len(ra)), n_per_query)
+        first = np.cumsum(n_per_query) - n_per_query
+        zones = z0[query_ids] + (np.arange(len(query_ids)) - first[query_ids])
+        base = zones * 360.0
+
+        starts = []
+        stops = []
+        for win_lo, win_hi in ((lo1, hi1), (lo2, hi2)):
+            win_lo = win_lo[query_ids]
+            win_hi = win_hi[query_ids]
+            start = np.searchsorted(self.keys, base + win_lo, side="left")
+            # An upper bound of 360 is exclusive, otherwise it would reach
+            # objects at RA=0 in the next zone.
+            stop = np.where(
+                win_hi >= 360.0,
+                np.searchsorted(self.keys, base + 360.0, side="left"),
+                np.searchsorted(self.keys, base + win_hi, side="right"),
+            )
+            starts.append(start)
+            stops.append(stop)
+
+        query_ids = np.concatenate([query_ids, query_ids])
+        starts = np.concatenate(starts)
+        stops = np.concatenate(stops)
+        keep = stops > starts
+        return query_ids[keep], starts[keep], stops[keep]
+
+    def candidates_many(self, ra, dec, radius):
+        """
+        Candidate rows for many cones at once.
+
+        Returns (query_ids, rows): parallel arrays pairing each query with the
+        original row numbers of its candidates. Pairs are grouped by query
+        and rows are ascending within each query.
+        """
+        query_ids, starts, stops = self._slices(ra, dec, radius)
+        lengths = stops - starts
+        total = int(lengths.sum())
+        if total == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty.copy()
+
+        offsets = np.cumsum(lengths) - lengths
+        positions = np.repeat(starts - offsets, lengths) + np.arange(total)
+        pair_queries = np.repeat(query_ids, lengths)
+        rows = self.order[positions]
+        ordering = np.lexsort((rows, pair_queries))
+        return pair_queries[ordering], rows[ordering]
+
+    def count_candidates(self, ra: float, dec: float, radius: float) -> int:
+        """Number of candidates of a cone, without materializing them."""
+        _, starts, stops = self._slices(ra, dec, radius)
+        return int((stops - starts).sum())
+
+    def candidates(self, ra: float, dec: float, radius: float) -> np.ndarray:
+        """Ascending row numbers of every object that may lie within the cone."""
+        _, rows = self.candidates_many(ra, dec, radius)
+        return rows
@@ -0,0 +1,223 @@
+"""
+Shared HTTP fetch layer for catalog downloads.
+
+All downloads go through one pooled requests session with timeouts and
+retries. Responses are streamed to disk, never held in memory, and each
+downloaded file gets a small sidecar (<file>.meta.json) with the ETag and
+Last-Modified of the response, so that a refresh sends a conditional request
+and transfers nothing when the file is unchanged upstream. Compressed
+(gzip) transfers are requested and decoded on the fly. An interrupted
+download leaves a .part file that the next attempt resumes with a Range
+request. fetch_many() downloads several files concurrently over the same
+session.
+"""
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (10, 120)
+DEFAULT_RETRIES = 3
+DEFAULT_POOL_SIZE = 8
+DEFAULT_WORKERS = 4
+CHUNK_SIZE = 1 << 16
+USER_AGENT = 'dso_search'
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def make_session(retries: int = DEFAULT_RETRIES, pool_size: int = DEFAULT_POOL_SIZE):
+    """A requests session with connection pooling and retries with backoff."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=('GET', 'HEAD'), raise_on_status=False)
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+def get_session():
+    """The process-wide shared session, created on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = make_session()
+    return _session
+
+
+class FetchResult:
+    """Outcome of a fetch: `status` is 'downloaded', 'resumed' or 'not_modified'."""
+
+    def __init__(self, path: Path, status: str, transferred: int):
+        self.path = path
+        self.status = status
+        self.transferred = transferred
+
+    @property
+    def changed(self) -> bool:
+        return self.status != 'not_modified'
+
+    def __repr__(self):
+        return f"FetchResult({str(self.path)!r}, {self.status!r}, transferred={self.transferred})"
+
+
+def _meta_path(path: Path) -> Path:
+    return path.with_name(path.name + '.meta.json')
+
+
+def _read_meta(path: Path) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_meta(path: Path, meta: dict):
+    tmp_path = path.with_name(f'{path.name}.tmp-{os.getpid()}-{threading.get_ident()}')
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _validators(response) -> dict:
+    return {'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')}
+
+
+def _decode(part: Path, path: Path, encoding: str):
+    """Move the downloaded bytes into place, undoing any content encoding."""
+    if encoding in ('gzip', 'x-gzip'):
+        with gzip.open(part, 'rb') as src, open(path, 'wb') as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        part.unlink()
+    elif encoding == 'deflate':
+        decompressor = zlib.decompressobj()
+        with open(part, 'rb') as src, open(path, 'wb') as dst:
+            for block in iter(lambda: src.read(CHUNK_SIZE), b''):
+                dst.write(decompressor.decompress(block))
+            dst.write(decompressor.flush())
+        part.unlink()
+    else:
+        os.replace(part, path)
+
+
+def fetch(url: str, path, params=None, session=None, timeout=DEFAULT_TIMEOUT,
+          attempts: int = DEFAULT_RETRIES, conditional: bool = True) -> FetchResult:
+    """
+    Download `url` to `path`, transferring as little as possible.
+
+    Args:
+        url, params: Request URL and query parameters
+        path: Destination file; written only once the download is complete
+        session: Session to use; defaults to the shared one
+        timeout: (connect, read) timeouts in seconds
+        attempts: Tries for a download interrupted mid-stream; each retry
+            resumes from the bytes already received
+        conditional: Revalidate an existing file with If-None-Match /
+            If-Modified-Since instead of downloading it again
+
+    Returns:
+        FetchResult with the status and the number of bytes transferred
+    """
+    import requests
+    import urllib3
+
+    session = session or get_session()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    part = path.with_name(path.name + '.part')
+    part_meta_path = _meta_path(part)
+    request_url = requests.Request('GET', url, params=params).prepare().url
+
+    transferred = 0
+    for attempt in range(1, attempts + 1):
+        headers = {'Accept-Encoding': 'gzip, deflate'}
+        part_meta = _read_meta(part_meta_path)
+        offset = part.stat().st_size if part.exists() else 0
+        resuming = offset > 0 and part_meta.get('url') == request_url and (
+            part_meta.get('etag') or part_meta.get('last_modified'))
+        if resuming:
+            headers['Range'] = f'bytes={offset}-'
+            headers['If-Range'] = part_meta.get('etag') or part_meta['last_modified']
+            # Ranges refer to the stored representation, so keep its encoding
+            headers['Accept-Encoding'] = part_meta.get('encoding') or 'identity'
+        meta = _read_meta(_meta_path(path))
+        if conditional and path.exists() and meta.get('url') == request_url:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        try:
+            with session.get(request_url, headers=headers, stream=True, timeout=timeout) as response:
+                if response.status_code == 304:
+                    logger.info(f"{path.name} is up to date")
+                    return FetchResult(path, 'not_modified', transferred)
+                if response.status_code == 416:
+                    # The partial file does not fit the current resource; start over
+                    part.unlink(missing_ok=True)
+                    continue
+                response.raise_for_status()
+
+                append = resuming and response.status_code == 206
+                encoding = response.headers.get('Content-Encoding', 'identity').lower()
+                if not append:
+                    _write_meta(part_meta_path, {'url': request_url, 'encoding': encoding,
+                                                 **_validators(response)})
+                with open(part, 'ab' if append else 'wb') as f:
+                    for block in response.raw.stream(CHUNK_SIZE, decode_content=False):
+                        f.write(block)
+                        transferred += len(block)
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError,
+                urllib3.exceptions.ProtocolError, urllib3.exceptions.ReadTimeoutError) as e:
+            if attempt == attempts:
+                raise
+            logger.warning(f"Download of {path.name} interrupted ({e}), resuming")
+            continue
+
+        part_meta = _read_meta(part_meta_path)
+        _decode(part, path, part_meta.get('encoding', 'identity'))
+        part_meta_path.unlink(missing_ok=True)
+        _write_meta(_meta_path(path), {'url': request_url, 'etag': part_meta.get('etag'),
+                                       'last_modified': part_meta.get('last_modified')})
+        status = 'resumed' if resuming and append else 'downloaded'
+        logger.info(f"Fetched {path.name} ({transferred} bytes transferred)")
+        return FetchResult(path, status, transferred)
+
+    raise RuntimeError(f"Could not download {url}")
+
+
+def fetch_many(downloads, session=None, max_workers: int = DEFAULT_WORKERS, **kwargs) -> list:
+    """
+    Fetch several files concurrently.
+
+    Args:
+        downloads: Iterable of (url, path) or (url, path, params) tuples
+        kwargs: Passed on to fetch()
+
+    Returns:
+        FetchResults in the order of `downloads`
+    """
+    session = session or get_session()
+    downloads = [tuple(download) + (None,) * (3 - len(download)) for download in downloads]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(fetch, url, path, params, session, **kwargs)
+                   for url, path, params in downloads]
+        return [future.result() for future in futures]
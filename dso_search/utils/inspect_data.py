@@ -1,13 +1,13 @@
 """Utility script to inspect catalog data formats."""
 import sys
 from pathlib import Path
-import requests
 sys.path.append(str(Path(__file__).parent.parent.parent))
+from dso_search.utils.fetch import DEFAULT_TIMEOUT, get_session
 
 def inspect_vizier_response(catalog_name, params):
     url = "https://vizier.cds.unistra.fr/viz-bin/asu-tsv"
     print(f"\nFetching {catalog_name} data from VizieR...")
-    response = requests.get(url, params=params)
+    response = get_session().get(url, params=params, timeout=DEFAULT_TIMEOUT)
 
     print("\nRaw Response Content:")
     print("=" * 50)
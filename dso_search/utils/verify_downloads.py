@@ -1,40 +1,46 @@
 """Utility script to verify catalog data downloads."""
-import requests
+import filecmp
+import tempfile
 from pathlib import Path
 
+import requests
+
+from dso_search.utils.fetch import fetch
+
 def verify_messier_download():
     """Verify the Messier catalog download and content."""
     url = "https://raw.githubusercontent.com/OpenAstronomyData/MessierCatalog/main/messier_catalog_info.txt"
     print(f"Downloading from: {url}")
-    
-    response = requests.get(url)
-    print(f"Response status: {response.status_code}")
-    
-    if response.status_code == 200:
-        content = response.text
-        print("\nFirst few lines of content:")
-        print("=" * 50)
-        print(content[:500])
-        print("=" * 50)
-        
-        # Save the content for inspection
-        data_dir = Path("data/raw")
-        data_dir.mkdir(parents=True, exist_ok=True)
-        
-        output_file = data_dir / "messier_catalog_info.txt"
-        with open(output_file, "w") as f:
-            f.write(content)
-        print(f"\nSaved content to: {output_file}")
-        
+
+    # Downloaded next to, not over, the checked-in source file
+    local_file = Path("data/raw") / "messier_catalog_info.txt"
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_file = Path(temp_dir) / "messier_catalog_info.txt"
+        try:
+            result = fetch(url, output_file)
+        except (requests.RequestException, RuntimeError) as e:
+            print(f"Failed to download: {e}")
+            return
+        print(f"Result: {result.status} ({result.transferred} bytes transferred)")
+
+        with open(output_file) as f:
+            print("\nFirst few lines of content:")
+            print("=" * 50)
+            print(f.read(500))
+            print("=" * 50)
+
+        if local_file.exists():
+            same = filecmp.cmp(output_file, local_file, shallow=False)
+            print(f"\n{local_file} {'matches the download' if same else 'differs from the download'}")
+
         # Basic content validation
-        lines = content.split("\n")
-        print(f"\nTotal lines: {len(lines)}")
-        if len(lines) > 2:
-            print("Header lines:")
-            for i in range(min(3, len(lines))):
-                print(f"Line {i}: {lines[i]}")
-    else:
-        print(f"Failed to download: {response.status_code}")
+        with open(output_file) as f:
+            lines = [line.rstrip('\n') for line in f]
+    print(f"\nTotal lines: {len(lines)}")
+    if len(lines) > 2:
+        print("Header lines:")
+        for i in range(min(3, len(lines))):
+            print(f"Line {i}: {lines[i]}")
 
 if __name__ == "__main__":
     verify_messier_download()
@@ -1,80 +1,217 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+"""
+Figures describing the processed catalogs.
+
+Each figure is drawn from a small summary of the catalog rather than from
+the rows themselves: counts per catalog, an equal-area 2D histogram of the
+sky, box plot statistics of the sizes, completeness per field and an RA
+histogram. The summaries are computed with vectorized pandas/NumPy
+operations and have a fixed size, so rendering takes the same time for ten
+objects and for ten million, and the sky map shows densities instead of one
+marker per object.
+
+In the build pipeline (dso_search/catalog/build.py) the summaries are
+written to one JSON file per figure and every figure is a separate stage:
+figures render in parallel worker processes, and a figure whose summary is
+unchanged (e.g. the sky map when only sizes changed) is not redrawn.
+"""
+import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def load_data():
+import numpy as np
+import pandas as pd
+
+# Figures written by create_visualizations, relative to data/visualizations
+FIGURES = (
+    'objects_by_catalog.png',
+    'sky_distribution.png',
+    'size_distribution.png',
+    'data_completeness.png',
+    'ra_distribution.png',
+)
+
+DPI = 300
+# Sky map bins: RA columns and declination rows of equal area (uniform in sin(dec))
+SKY_RA_BINS = 180
+SKY_DEC_BINS = 90
+RA_BINS = 50
+
+
+def load_data(data_dir='data/processed'):
     dfs = []
-    data_dir = Path('data/processed')
-    for csv_file in data_dir.glob('processed_*.csv'):
+    data_dir = Path(data_dir)
+    for csv_file in sorted(data_dir.glob('processed_*.csv')):
         df = pd.read_csv(csv_file)
         dfs.append(df)
     return pd.concat(dfs, ignore_index=True)
 
-def create_visualizations(df):
-    # Create visualizations directory
-    Path('data/visualizations').mkdir(parents=True, exist_ok=True)
 
-    # Set style for better-looking plots
-    plt.style.use('seaborn')
+def _catalog_counts(df) -> dict:
+    counts = df['catalog'].value_counts(sort=True)
+    return {'catalogs': counts.index.tolist(), 'counts': counts.tolist()}
+
+
+def _sky_density(df) -> dict:
+    ra = np.mod(df['ra'].to_numpy(dtype=np.float64), 360.0)
+    sin_dec = np.sin(np.deg2rad(df['dec'].to_numpy(dtype=np.float64)))
+    counts, _, _ = np.histogram2d(sin_dec, ra, bins=(SKY_DEC_BINS, SKY_RA_BINS),
+                                  range=((-1.0, 1.0), (0.0, 360.0)))
+    return {'ra_bins': SKY_RA_BINS, 'dec_bins': SKY_DEC_BINS, 'counts': counts.astype(np.int64).tolist()}
+
+
+def _size_boxes(df) -> dict:
+    sizes = df[['catalog', 'size']].dropna()
+    sizes = sizes[sizes['size'] > 0]
+    boxes = []
+    for catalog, group in sizes.groupby('catalog', sort=True)['size']:
+        values = group.to_numpy()
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        reach = 1.5 * (q3 - q1)
+        boxes.append({
+            'label': catalog, 'med': median, 'q1': q1, 'q3': q3,
+            'whislo': values[values >= q1 - reach].min(), 'whishi': values[values <= q3 + reach].max(),
+        })
+    return {'boxes': boxes}
+
+
+def _completeness(df) -> dict:
+    completeness = df.notna().mean() * 100
+    return {'fields': completeness.index.tolist(), 'percent': completeness.tolist()}
+
+
+def _ra_histogram(df) -> dict:
+    counts, edges = np.histogram(np.mod(df['ra'].to_numpy(dtype=np.float64), 360.0), bins=RA_BINS,
+                                 range=(0.0, 360.0))
+    return {'edges': edges.tolist(), 'counts': counts.tolist()}
+
+
+_SUMMARIES = dict(zip(FIGURES, (_catalog_counts, _sky_density, _size_boxes, _completeness, _ra_histogram)))
+
+
+def summarize(df) -> dict:
+    """The summary each figure is drawn from, keyed by figure file name."""
+    return {figure: _SUMMARIES[figure](df) for figure in FIGURES}
+
+
+def summary_path(summary_dir, figure: str) -> Path:
+    return Path(summary_dir) / f'{Path(figure).stem}.json'
+
+
+def write_summaries(processed_dir, summary_dir):
+    """Summarize the processed catalogs into one JSON file per figure."""
+    summary_dir = Path(summary_dir)
+    summary_dir.mkdir(parents=True, exist_ok=True)
+    for figure, summary in summarize(load_data(processed_dir)).items():
+        with open(summary_path(summary_dir, figure), 'w') as f:
+            json.dump(summary, f, sort_keys=True)
+
 
-    # 1. Objects by Catalog
+def _plot_catalog_counts(plt, summary):
     plt.figure(figsize=(10, 6))
-    sns.countplot(data=df, x='catalog')
+    plt.bar(summary['catalogs'], summary['counts'])
     plt.title('Distribution of Objects by Catalog', fontsize=14)
     plt.xlabel('Catalog', fontsize=12)
     plt.ylabel('Number of Objects', fontsize=12)
     plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig('data/visualizations/objects_by_catalog.png', dpi=300, bbox_inches='tight')
-    plt.close()
 
-    # 2. Sky Distribution
-    plt.figure(figsize=(12, 6))
-    plt.scatter(df['ra'], df['dec'], alpha=0.5, s=20)
-    plt.xlabel('Right Ascension (degrees)', fontsize=12)
-    plt.ylabel('Declination (degrees)', fontsize=12)
-    plt.title('Sky Distribution of Deep Space Objects', fontsize=14)
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig('data/visualizations/sky_distribution.png', dpi=300, bbox_inches='tight')
-    plt.close()
 
-    # 3. Size Distribution
-    plt.figure(figsize=(10, 6))
-    sns.boxplot(data=df, x='catalog', y='size')
-    plt.title('Size Distribution by Catalog', fontsize=14)
-    plt.xlabel('Catalog', fontsize=12)
-    plt.ylabel('Size (arcminutes)', fontsize=12)
-    plt.yscale('log')
+def _plot_sky_density(plt, summary):
+    from matplotlib.colors import LogNorm
+
+    counts = np.ma.masked_equal(np.array(summary['counts'], dtype=np.float64), 0)
+    # RA increases to the left, as seen from inside the celestial sphere
+    longitude = np.deg2rad(180.0 - np.linspace(0.0, 360.0, summary['ra_bins'] + 1))
+    latitude = np.arcsin(np.linspace(-1.0, 1.0, summary['dec_bins'] + 1))
+    fig = plt.figure(figsize=(12, 6))
+    ax = fig.add_subplot(projection='mollweide')
+    mesh = ax.pcolormesh(longitude, latitude, counts, norm=LogNorm() if counts.count() else None,
+                         cmap='viridis', shading='flat')
+    ticks = np.arange(-150, 151, 30)
+    ax.set_xticks(np.deg2rad(ticks), [f'{180 - tick}°' for tick in ticks])
+    ax.grid(True, alpha=0.3)
+    fig.colorbar(mesh, ax=ax, orientation='horizontal', pad=0.08, fraction=0.05,
+                 label='Objects per cell (equal-area cells)')
+    ax.set_xlabel('Right Ascension', fontsize=12)
+    ax.set_ylabel('Declination', fontsize=12)
+    ax.set_title('Sky Distribution of Deep Space Objects', fontsize=14, pad=20)
+
+
+def _plot_size_boxes(plt, summary):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    if summary['boxes']:
+        ax.bxp(summary['boxes'], showfliers=False)
+    ax.set_title('Size Distribution by Catalog', fontsize=14)
+    ax.set_xlabel('Catalog', fontsize=12)
+    ax.set_ylabel('Size (arcminutes)', fontsize=12)
+    ax.set_yscale('log')
     plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig('data/visualizations/size_distribution.png', dpi=300, bbox_inches='tight')
-    plt.close()
 
-    # 4. Data Completeness
-    completeness = df.notna().mean() * 100
+
+def _plot_completeness(plt, summary):
     plt.figure(figsize=(10, 6))
-    completeness.plot(kind='bar')
+    plt.bar(summary['fields'], summary['percent'])
     plt.title('Data Completeness by Field', fontsize=14)
     plt.ylabel('Completeness (%)', fontsize=12)
     plt.xlabel('Field', fontsize=12)
     plt.xticks(rotation=45)
     plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig('data/visualizations/data_completeness.png', dpi=300, bbox_inches='tight')
-    plt.close()
 
-    # 5. RA Distribution
+
+def _plot_ra_histogram(plt, summary):
     plt.figure(figsize=(10, 6))
-    plt.hist(df['ra'], bins=50, edgecolor='black')
+    edges = np.array(summary['edges'])
+    plt.stairs(summary['counts'], edges, fill=True, edgecolor='black')
     plt.xlabel('Right Ascension (degrees)', fontsize=12)
     plt.ylabel('Number of Objects', fontsize=12)
     plt.title('Distribution of Objects by Right Ascension', fontsize=14)
     plt.grid(True, alpha=0.3)
+
+
+_PLOTS = dict(zip(FIGURES, (_plot_catalog_counts, _plot_sky_density, _plot_size_boxes, _plot_completeness,
+                            _plot_ra_histogram)))
+
+
+def render(figure: str, summary: dict, out_path):
+    """Draw one figure from its summary and save it."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_theme()
+    _PLOTS[figure](plt, summary)
     plt.tight_layout()
-    plt.savefig('data/visualizations/ra_distribution.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    plt.savefig(out_path, dpi=DPI, bbox_inches='tight')
+    plt.close('all')
+
+
+def render_figure(figure: str, summary_file, out_path):
+    """Draw one figure from a summary file written by write_summaries()."""
+    with open(summary_file) as f:
+        summary = json.load(f)
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    render(figure, summary, out_path)
+
+
+def create_visualizations(df, out_dir='data/visualizations', jobs: int = None):
+    """
+    Draw every figure into out_dir.
+
+    Args:
+        jobs: Worker processes; 1 draws in this process, None uses one per CPU
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    summaries = summarize(df)
+    if jobs == 1:
+        for figure, summary in summaries.items():
+            render(figure, summary, out_dir / figure)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(render, figure, summary, out_dir / figure) for figure, summary in summaries.items()]
+        for future in futures:
+            future.result()
+
 
 if __name__ == "__main__":
     df = load_data()
@@ -1,29 +1,31 @@
 #!/usr/bin/env python3
 """
 Runner script for generating visualizations of the Deep Space Object catalog data.
-This script loads the processed catalog data and creates various visualizations
-to illustrate the composition and quality of the data.
+This script brings the processed catalogs, the binary index and the
+visualizations up to date, rerunning only the stages whose inputs changed
+since the last run, and creates various visualizations to illustrate the
+composition and quality of the data.
 """
+import argparse
 from pathlib import Path
-from dso_search.catalog import process_messier, process_ngc
-from dso_search.utils.visualize_data import load_data, create_visualizations
+from dso_search.catalog.build import pipeline
 
 def main():
+    parser = argparse.ArgumentParser(description="Process the catalogs and generate visualizations.")
+    parser.add_argument('--force', action='store_true', help="Rebuild everything, even if unchanged")
+    parser.add_argument('--jobs', type=int, default=None, help="Catalogs processed in parallel (default: one per CPU)")
+    args = parser.parse_args()
+
     # Ensure data directories exist
     for dir_name in ['raw', 'processed', 'intermediate', 'visualizations']:
         Path(f'data/{dir_name}').mkdir(parents=True, exist_ok=True)
 
-    # Process catalogs
-    print("Processing Messier catalog...")
-    process_messier.process_messier_catalog()
-    print("Processing NGC catalog...")
-    process_ngc.process_ngc_catalog()
-
-    # Generate visualizations
-    print("Generating visualizations...")
-    df = load_data()
-    create_visualizations(df)
-    print("Visualizations completed. Check data/visualizations/ directory for output.")
+    # Process catalogs, write the binary catalog and generate visualizations
+    ran = pipeline('data').run(force=args.force, jobs=args.jobs)
+    if ran:
+        print(f"Rebuilt: {', '.join(ran)}. Check data/visualizations/ directory for output.")
+    else:
+        print("Catalogs and visualizations are up to date.")
 
 if __name__ == "__main__":
     main()
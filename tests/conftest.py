@@ -2,11 +2,14 @@
 Pytest configuration and fixtures for DSO Search API tests.
 """
 import pytest
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import tempfile
 import shutil
 
+from dso_search.search.store import CatalogStore
+
 @pytest.fixture(scope="session")
 def test_data_dir():
     """Create a temporary directory for test data."""
@@ -31,3 +34,50 @@ def sample_catalog_data(test_data_dir):
     df.to_csv(data_path / "test_catalog.csv", index=False)
 
     return df
+
+
+def _uniform_sky(n, seed=0):
+    """Return (ra, dec) arrays in degrees for n points uniform on the sphere."""
+    rng = np.random.default_rng(seed)
+    ra = rng.uniform(0.0, 360.0, n)
+    dec = np.rad2deg(np.arcsin(rng.uniform(-1.0, 1.0, n)))
+    return ra, dec
+
+
+def _synthetic_frame(n, seed, catalogs=('NGC',), missing_sizes=0.0, max_size=60.0):
+    """
+    Catalog frame of n objects uniform on the sky. Catalogs are assigned in
+    turn, names are '<catalog> <row>' and sizes are uniform in
+    [0.1, max_size) arcminutes, a `missing_sizes` fraction of them NaN.
+    """
+    ra, dec = _uniform_sky(n, seed)
+    rng = np.random.default_rng(seed + 1)
+    catalog = np.array(catalogs)[np.arange(n) % len(catalogs)]
+    size = rng.uniform(0.1, max_size, n)
+    return pd.DataFrame({
+        'name': [f'{c} {i}' for i, c in enumerate(catalog)],
+        'catalog': catalog,
+        'ra': ra,
+        'dec': dec,
+        'size': np.where(rng.uniform(size=n) < missing_sizes, np.nan, size),
+    })
+
+
+@pytest.fixture(scope="session")
+def uniform_sky():
+    """uniform_sky(n, seed) -> (ra, dec) of n points uniform on the sphere."""
+    return _uniform_sky
+
+
+@pytest.fixture(scope="session")
+def synthetic_frame():
+    """Factory of synthetic catalog frames; see _synthetic_frame for the arguments."""
+    return _synthetic_frame
+
+
+@pytest.fixture(scope="session")
+def synthetic_store():
+    """Factory of CatalogStores over synthetic_frame(...) catalogs."""
+    def make(n, seed, **kwargs):
+        return CatalogStore.from_frame(_synthetic_frame(n, seed, **kwargs))
+    return make
@@ -5,6 +5,7 @@ import pytest
 from fastapi.testclient import TestClient
 from pathlib import Path
 import pandas as pd
+import json
 
 from dso_search.api.main import app
 from dso_search.api.models import Coordinates, DeepSpaceObject, SearchResponse
@@ -115,3 +116,183 @@ def test_search_response_format():
         assert isinstance(obj["ra"], (int, float))
         assert isinstance(obj["dec"], (int, float))
         assert obj["size"] is None or isinstance(obj["size"], (int, float))
+
+def test_batch_search_matches_single_searches():
+    """Test that a batch search returns the same objects as separate searches."""
+    queries = [
+        {"ra": 10.68458, "dec": 41.26917, "radius": 1.0},
+        {"ra": 83.82208, "dec": -5.39111, "radius": 30.0},
+        {"ra": 200.0, "dec": -60.0, "radius": 0.5},
+    ]
+    response = client.post("/search/batch", json={"queries": queries})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == len(queries)
+    assert set(data["results"]) == {"0", "1", "2"}
+
+    for i, coords in enumerate(queries):
+        single = client.post("/search", json=coords).json()
+        assert data["results"][str(i)] == single
+
+def test_batch_search_invalid_queries():
+    """Test batch searching with an empty or invalid query list."""
+    response = client.post("/search/batch", json={"queries": []})
+    assert response.status_code == 422
+
+    response = client.post("/search/batch", json={"queries": [{"ra": 400, "dec": 0}]})
+    assert response.status_code == 422
+
+def test_crossmatch_json_upload():
+    """Test cross-matching a JSON source list."""
+    sources = [[10.684, 41.269], [200.0, -60.0], {"ra": 83.82, "dec": -5.39}]
+    response = client.post("/crossmatch", params={"radius": 0.1}, json={"sources": sources[:2]})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["source_index"] for line in lines] == [0]
+    assert lines[0]["name"] == "M31"
+    assert 0 <= lines[0]["separation"] <= 0.1
+
+    response = client.post("/crossmatch", params={"radius": 0.1}, json=[sources[2]])
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 1
+
+def test_crossmatch_csv_upload():
+    """Test cross-matching a CSV source list in 'all' mode."""
+    body = "RA,Dec\n10.684,41.269\n83.7,13.0\n"
+    response = client.post("/crossmatch", params={"radius": 10.0, "mode": "all"},
+                           content=body, headers={"content-type": "text/csv"})
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert {line["source_index"] for line in lines} == {0, 1}
+    separations = [line["separation"] for line in lines if line["source_index"] == 1]
+    assert separations == sorted(separations)
+
+def test_crossmatch_limit():
+    """Test the per-source match limit of cross-matches."""
+    params = {"radius": 10.0, "mode": "all"}
+    lines = client.post("/crossmatch", params={**params, "limit": 1}, json=[[206.0, 51.0]]).text.splitlines()
+    everything = client.post("/crossmatch", params=params, json=[[206.0, 51.0]]).text.splitlines()
+    assert len(everything) > 1 and lines == everything[:1]
+    assert client.post("/crossmatch", params={**params, "limit": 100001}, json=[[206.0, 51.0]]).status_code == 422
+
+def test_crossmatch_invalid_upload():
+    """Test cross-matching with malformed or out-of-range sources."""
+    response = client.post("/crossmatch", params={"radius": 0.1}, json=[[400.0, 0.0]])
+    assert response.status_code == 422
+
+    response = client.post("/crossmatch", params={"radius": 0.1},
+                           content="x,y\n1,2\n", headers={"content-type": "text/csv"})
+    assert response.status_code == 422
+
+    response = client.post("/crossmatch", params={"radius": 0.1, "mode": "closest"}, json=[])
+    assert response.status_code == 422
+
+def test_search_nearest_first_with_separation():
+    """Test that results are ordered by separation and carry it."""
+    coords = {"ra": 83.7, "dec": 10.0, "radius": 60.0}
+    response = client.post("/search", json=coords)
+    assert response.status_code == 200
+    data = response.json()
+    separations = [obj["separation"] for obj in data["objects"]]
+    assert data["count"] == data["total"] == len(separations) > 1
+    assert separations == sorted(separations)
+    assert all(0 <= separation <= 60.0 for separation in separations)
+    assert data["next_offset"] is None
+
+def test_search_pagination():
+    """Test limit/offset paging through nearest-first results."""
+    coords = {"ra": 83.7, "dec": 10.0, "radius": 180.0}
+    everything = client.post("/search", json=coords).json()
+    total = everything["total"]
+    assert total >= 3
+
+    names = []
+    offset = 0
+    while offset is not None:
+        page = client.post("/search", json={**coords, "limit": 2, "offset": offset}).json()
+        assert page["total"] == total
+        assert page["count"] <= 2
+        names += [obj["name"] for obj in page["objects"]]
+        offset = page["next_offset"]
+    assert names == [obj["name"] for obj in everything["objects"]]
+
+    beyond = client.post("/search", json={**coords, "limit": 2, "offset": total}).json()
+    assert beyond["objects"] == [] and beyond["next_offset"] is None
+
+    assert client.post("/search", json={**coords, "limit": 0}).status_code == 422
+    assert client.post("/search", json={**coords, "offset": -1}).status_code == 422
+
+def test_batch_search_pagination():
+    """Test per-query limits in batch searches."""
+    queries = [
+        {"ra": 83.7, "dec": 10.0, "radius": 180.0, "limit": 1},
+        {"ra": 83.7, "dec": 10.0, "radius": 180.0, "limit": 1, "offset": 1},
+    ]
+    data = client.post("/search/batch", json={"queries": queries}).json()
+    for i, coords in enumerate(queries):
+        assert data["results"][str(i)] == client.post("/search", json=coords).json()
+
+def test_batch_search_caps(monkeypatch):
+    """Test the page size of batch queries without a limit and the cap on batch responses."""
+    from dso_search.api import main
+
+    everything = {"ra": 83.7, "dec": 10.0, "radius": 180.0}
+    assert client.post("/search", json=everything).json()["total"] > 2
+    monkeypatch.setattr(main, "MAX_LIMIT", 2)
+    data = client.post("/search/batch", json={"queries": [everything]}).json()
+    assert data["results"]["0"]["count"] == 2 and data["results"]["0"]["next_offset"] == 2
+
+    monkeypatch.setattr(main, "MAX_BATCH_OBJECTS", 3)
+    response = client.post("/search/batch", json={"queries": [everything, everything]})
+    assert response.status_code == 422
+    assert client.post("/search/batch", json={"queries": [{**everything, "limit": 1}] * 3}).status_code == 200
+    assert client.post("/search/batch", json={"queries": [{**everything, "limit": 100001}]}).status_code == 422
+
+def test_search_with_filters():
+    """Test catalog, size and name filters on searches."""
+    coords = {"ra": 83.7, "dec": 10.0, "radius": 180.0}
+    everything = client.post("/search", json=coords).json()["objects"]
+
+    data = client.post("/search", json={**coords, "catalogs": ["Messier"], "name_prefix": "m 4"}).json()
+    expected = [obj for obj in everything
+                if obj["catalog"] == "Messier" and obj["name"].replace(" ", "").startswith("M4")]
+    assert data["objects"] == expected
+
+    data = client.post("/search", json={**coords, "min_size": 5, "max_size": 10}).json()
+    assert data["objects"] == [obj for obj in everything
+                               if obj["size"] is not None and 5 <= obj["size"] <= 10]
+
+    response = client.post("/search", json={**coords, "min_size": 10, "max_size": 5})
+    assert response.status_code == 422
+
+def test_batch_search_with_filters():
+    """Test that batch queries apply their own filters."""
+    queries = [
+        {"ra": 83.7, "dec": 10.0, "radius": 180.0, "name_prefix": "M4"},
+        {"ra": 83.7, "dec": 10.0, "radius": 180.0},
+        {"ra": 83.7, "dec": 10.0, "radius": 180.0, "catalogs": ["NGC"]},
+    ]
+    data = client.post("/search/batch", json={"queries": queries}).json()
+    for i, coords in enumerate(queries):
+        assert data["results"][str(i)] == client.post("/search", json=coords).json()
+
+def test_object_lookup():
+    """Names resolve regardless of spacing, case and catalog prefix."""
+    for name in ["M31", "m 31", "Messier%2031", "NGC%20224", "Andromeda%20Galaxy"]:
+        response = client.get(f"/objects/{name}")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["object"]["name"] == "M31"
+        assert data["common_name"] == "Andromeda Galaxy"
+        assert "NGC 224" in data["aliases"]
+    assert client.get("/objects/NGC%209999").status_code == 404
+
+def test_autocomplete():
+    response = client.get("/autocomplete", params={"q": "m", "limit": 3})
+    assert response.status_code == 200
+    suggestions = response.json()["suggestions"]
+    assert 0 < len(suggestions) <= 3
+    assert all(s["match"].upper().startswith("M") for s in suggestions)
+    response = client.get("/autocomplete", params={"q": "andromeda"})
+    assert [s["name"] for s in response.json()["suggestions"]] == ["M31"]
@@ -0,0 +1,99 @@
+"""
+Tests for the memory-mapped binary catalog artifact.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dso_search.catalog.binary import (
+    BINARY_DIR_NAME, StringColumn, binary_catalog_is_current, build_binary_catalog,
+    load_binary_catalog,
+)
+from dso_search.search.engine import open_catalog
+from dso_search.search.store import CatalogStore
+
+
+@pytest.fixture
+def processed_dir(tmp_path):
+    rng = np.random.default_rng(8)
+    n = 500
+    pd.DataFrame({
+        'name': [f'NGC {i}' for i in range(n)],
+        'catalog': 'NGC',
+        'ra': rng.uniform(0, 360, n),
+        'dec': rng.uniform(-90, 90, n),
+        'size': np.where(rng.uniform(size=n) < 0.1, np.nan, 5.0),
+    }).to_csv(tmp_path / 'processed_ngc.csv', index=False)
+    pd.DataFrame({
+        'name': ['M31', 'M42'], 'catalog': 'Messier', 'common_name': ['Andromeda Galaxy', 'Orion Nebula'],
+        'ngc_name': ['NGC 224', 'NGC 1976'], 'ra': [10.684583, 83.822083],
+        'dec': [41.269167, -5.391111], 'size': [10.0, 10.0],
+    }).to_csv(tmp_path / 'processed_messier.csv', index=False)
+    return tmp_path
+
+
+def test_roundtrip_matches_csv_store(processed_dir):
+    assert not binary_catalog_is_current(processed_dir)
+    build_binary_catalog(processed_dir)
+    assert binary_catalog_is_current(processed_dir)
+
+    mapped = load_binary_catalog(processed_dir / BINARY_DIR_NAME)
+    expected = CatalogStore.from_frame(pd.concat(
+        [pd.read_csv(processed_dir / 'processed_messier.csv'),
+         pd.read_csv(processed_dir / 'processed_ngc.csv')], ignore_index=True))
+
+    assert isinstance(mapped.ra, np.memmap)
+    assert not mapped.xyz.flags.writeable
+    assert len(mapped) == len(expected)
+    assert mapped.catalog_counts() == expected.catalog_counts()
+    assert mapped.name[np.arange(len(mapped))].tolist() == expected.name.tolist()
+    np.testing.assert_array_equal(mapped.size, expected.size)
+    for ra, dec, radius in [(10.7, 41.3, 1.0), (200.0, -30.0, 15.0), (0.0, 89.0, 5.0)]:
+        np.testing.assert_array_equal(mapped.cone(ra, dec, radius), expected.cone(ra, dec, radius))
+
+
+def test_stale_when_csv_is_newer(processed_dir):
+    build_binary_catalog(processed_dir)
+    csv_file = processed_dir / 'processed_ngc.csv'
+    later = os.stat(processed_dir / BINARY_DIR_NAME / 'manifest.json').st_mtime + 10
+    os.utime(csv_file, (later, later))
+    assert not binary_catalog_is_current(processed_dir)
+
+
+def test_stale_when_csv_is_removed(processed_dir):
+    build_binary_catalog(processed_dir)
+    (processed_dir / 'processed_ngc.csv').unlink()
+    assert not binary_catalog_is_current(processed_dir)
+
+
+def test_stale_when_older_csv_is_added(processed_dir):
+    build_binary_catalog(processed_dir)
+    added = processed_dir / 'processed_ic.csv'
+    pd.DataFrame({'name': ['IC 434'], 'catalog': 'IC', 'ra': [85.25], 'dec': [-2.46], 'size': [60.0]}).to_csv(
+        added, index=False)
+    # e.g. restored from a backup with its original timestamp
+    earlier = os.stat(processed_dir / BINARY_DIR_NAME / 'manifest.json').st_mtime - 3600
+    os.utime(added, (earlier, earlier))
+    assert not binary_catalog_is_current(processed_dir)
+
+
+def test_string_column_indexing():
+    column = StringColumn(*StringColumn.encode(['M31', 'NGC 7000', 'Ångström', '']))
+    assert len(column) == 4
+    assert column[2] == 'Ångström'
+    assert column[-1] == ''
+    assert column[np.array([1, 0])].tolist() == ['NGC 7000', 'M31']
+    assert column[np.array([True, False, False, True])].tolist() == ['M31', '']
+    assert column[1:3].tolist() == ['NGC 7000', 'Ångström']
+    assert column[[]].tolist() == []
+
+
+def test_open_catalog_falls_back_to_csvs_when_mapping_fails(processed_dir):
+    build_binary_catalog(processed_dir)
+    (processed_dir / BINARY_DIR_NAME / 'ra.npy').write_bytes(b'corrupt')
+    assert binary_catalog_is_current(processed_dir)
+    store = open_catalog(processed_dir)
+    assert not isinstance(store.ra, np.memmap)
+    assert len(store) == 502
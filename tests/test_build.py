@@ -0,0 +1,100 @@
+"""
+Tests for the incremental pipeline build.
+"""
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from dso_search.catalog.build import BuildGraph, Stage, pipeline
+
+RAW_DIR = Path(__file__).resolve().parents[1] / 'data' / 'raw'
+
+
+def concatenate(out_path, *in_paths):
+    """Test action: write the concatenated inputs and count the runs next to the output."""
+    out_path = Path(out_path)
+    out_path.write_text(''.join(Path(path).read_text() for path in in_paths))
+    runs = out_path.with_suffix('.runs')
+    runs.write_text(str(int(runs.read_text()) + 1 if runs.exists() else 1))
+
+
+def runs(path) -> int:
+    return int(Path(path).with_suffix('.runs').read_text())
+
+
+@pytest.fixture
+def graph(tmp_path):
+    for name in 'ab':
+        (tmp_path / f'{name}.txt').write_text(name)
+
+    def build():
+        stages = [
+            Stage(f'copy:{name}', concatenate, (str(tmp_path / f'{name}.out'), str(tmp_path / f'{name}.txt')),
+                  inputs=[tmp_path / f'{name}.txt'], outputs=[tmp_path / f'{name}.out'])
+            for name in 'ab'
+        ]
+        stages.append(Stage('join', concatenate,
+                            (str(tmp_path / 'joined.out'), str(tmp_path / 'a.out'), str(tmp_path / 'b.out')),
+                            inputs=[tmp_path / 'a.out', tmp_path / 'b.out'],
+                            outputs=[tmp_path / 'joined.out'], after=['copy:a', 'copy:b']))
+        return BuildGraph(stages, tmp_path / 'state.json')
+
+    return tmp_path, build
+
+
+def test_second_build_is_a_noop(graph):
+    tmp_path, build = graph
+    assert build().run(jobs=1) == ['copy:a', 'copy:b', 'join']
+    assert (tmp_path / 'joined.out').read_text() == 'ab'
+    assert build().run(jobs=1) == []
+
+
+def test_only_changed_inputs_rebuild(graph):
+    tmp_path, build = graph
+    build().run(jobs=1)
+    (tmp_path / 'b.txt').write_text('B')
+    assert build().run(jobs=1) == ['copy:b', 'join']
+    assert (tmp_path / 'joined.out').read_text() == 'aB'
+    assert runs(tmp_path / 'a.out') == 1
+
+
+def test_touched_but_unchanged_input_skips(graph):
+    tmp_path, build = graph
+    build().run(jobs=1)
+    os.utime(tmp_path / 'a.txt', ns=(0, 0))
+    assert build().run(jobs=1) == []
+
+
+def test_identical_upstream_output_skips_downstream(graph):
+    tmp_path, build = graph
+    build().run(jobs=1)
+    (tmp_path / 'a.out').unlink()
+    assert build().run(jobs=1) == ['copy:a']
+    assert runs(tmp_path / 'joined.out') == 1
+
+
+def test_parallel_and_forced_builds(graph):
+    tmp_path, build = graph
+    assert build().run(jobs=2) == ['copy:a', 'copy:b', 'join']
+    assert (tmp_path / 'joined.out').read_text() == 'ab'
+    assert build().run(force=True, jobs=2) == ['copy:a', 'copy:b', 'join']
+    assert runs(tmp_path / 'joined.out') == 2
+
+
+def test_unknown_dependency():
+    with pytest.raises(ValueError):
+        BuildGraph([Stage('x', concatenate, after=['missing'])], 'state.json')
+
+
+def test_catalog_pipeline(tmp_path):
+    data_dir = tmp_path / 'data'
+    (data_dir / 'raw').mkdir(parents=True)
+    shutil.copy(RAW_DIR / 'messier_catalog_info.txt', data_dir / 'raw')
+
+    build = pipeline(data_dir, sources=['messier'], visualizations=False)
+    assert build.run(jobs=1) == ['ingest:messier', 'index']
+    assert (data_dir / 'processed' / 'processed_messier.csv').exists()
+    assert (data_dir / 'processed' / 'catalog.bin' / 'manifest.json').exists()
+    assert pipeline(data_dir, sources=['messier'], visualizations=False).run(jobs=1) == []
@@ -0,0 +1,84 @@
+"""
+Tests for the query result cache.
+"""
+import time
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from dso_search.api.cache import InMemoryBackend, QueryCache
+from dso_search.api.main import create_app
+
+
+def test_quantized_keys():
+    cache = QueryCache(precision=1e-3)
+    assert cache.key('v1', 'search', 10.0001, 20.0, 1.0) == cache.key('v1', 'search', 10.0, 20.0002, 1.0)
+    assert cache.key('v1', 'search', 10.0, 20.0, 1.0) != cache.key('v1', 'search', 10.01, 20.0, 1.0)
+    assert cache.key('v1', 'search', 360.0, 0.0, 1.0) == cache.key('v1', 'search', 0.0, 0.0, 1.0)
+    assert cache.key('v1', 'search', 1.0, 0.0, 1.0) != cache.key('v2', 'search', 1.0, 0.0, 1.0)
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = QueryCache(max_entries=2, max_bytes=10)
+    cache.put('v:a', b'1234')
+    cache.put('v:b', b'1234')
+    assert cache.get('v:a') == b'1234'   # a is now most recently used
+    cache.put('v:c', b'12')
+    assert cache.get('v:b') is None
+    assert cache.get('v:a') == b'1234'
+    cache.put('v:d', b'123456789')
+    assert cache.stats()['bytes'] <= 10
+    assert cache.stats()['evictions'] == 3
+    cache.put('v:e', b'x' * 11)   # larger than the whole cache: not stored
+    assert cache.get('v:e') is None
+
+
+def test_ttl_expiry():
+    cache = QueryCache(ttl=0.01)
+    cache.put('v:a', b'1')
+    time.sleep(0.02)
+    assert cache.get('v:a') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_new_version_clears_cache():
+    cache = QueryCache()
+    cache.put('v1:a', b'1')
+    assert cache.get('v2:a') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_shared_backend():
+    shared = InMemoryBackend()
+    first, second = QueryCache(shared=shared), QueryCache(shared=shared)
+    first.put('v:a', b'result')
+    assert second.get('v:a') == b'result'
+    assert second.stats()['shared_hits'] == 1
+    assert second.get('v:a') == b'result'
+    assert second.stats()['shared_hits'] == 1   # now served locally
+
+
+@pytest.fixture
+def catalog_dir(tmp_path):
+    pd.DataFrame({
+        'name': ['M31', 'NGC 7000'], 'catalog': ['Messier', 'NGC'],
+        'ra': [10.68458, 315.7], 'dec': [41.26917, 44.3], 'size': [178.0, 120.0],
+    }).to_csv(tmp_path / 'processed_test.csv', index=False)
+    return tmp_path
+
+
+def test_search_endpoint_uses_cache(catalog_dir):
+    client = TestClient(create_app(catalog_dir, cache=QueryCache()))
+    coords = {"ra": 10.68458, "dec": 41.26917, "radius": 1.0}
+    first = client.post("/search", json=coords)
+    second = client.post("/search", json=coords)
+    assert first.content == second.content
+    assert second.json()["count"] == 1
+    stats = client.get("/cache/stats").json()
+    assert stats["enabled"]
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    other = client.post("/search", json={**coords, "radius": 2.0})
+    assert other.status_code == 200
+    assert client.get("/cache/stats").json()["misses"] == 2
@@ -0,0 +1,104 @@
+"""
+Tests for the search engine and the offline batch CLI.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dso_search import cli
+from dso_search.catalog.binary import build_binary_catalog
+from dso_search.search.engine import batch_search, cone_search, crossmatch, open_catalog
+from dso_search.search.filters import AttributeFilter
+
+
+@pytest.fixture(scope="module")
+def catalog_dir(tmp_path_factory, synthetic_frame):
+    directory = tmp_path_factory.mktemp('processed')
+    synthetic_frame(4000, seed=250, catalogs=('IC', 'NGC', 'NGC'), missing_sizes=0.2).to_csv(
+        directory / 'processed_test.csv', index=False)
+    build_binary_catalog(directory)
+    return directory
+
+
+@pytest.fixture(scope="module")
+def store(catalog_dir):
+    return open_catalog(catalog_dir)
+
+
+@pytest.fixture(scope="module")
+def sources(tmp_path_factory, uniform_sky):
+    n = 500
+    path = tmp_path_factory.mktemp('sources') / 'sources.csv'
+    ra, dec = uniform_sky(n, seed=7)
+    pd.DataFrame({
+        'id': np.arange(n),
+        'ra': ra,
+        'dec': dec,
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_batch_search_matches_cone_searches(store):
+    ra = np.array([10.0, 200.0, 359.9, 45.0])
+    dec = np.array([41.0, -30.0, 0.0, 89.5])
+    filters = [None, AttributeFilter(catalogs=['IC']), AttributeFilter(min_size=10.0), None]
+    offsets, limits = [0, 1, 0, 2], [None, 3, 5, -1]
+    query_ids, rows, separations, totals = batch_search(store, ra, dec, 8.0, filters, offsets, limits)
+    for i in range(len(ra)):
+        expected = cone_search(store, ra[i], dec[i], 8.0, filters[i], offsets[i],
+                               None if limits[i] == -1 else limits[i])
+        np.testing.assert_array_equal(rows[query_ids == i], expected.rows)
+        np.testing.assert_allclose(separations[query_ids == i], expected.separations)
+        assert totals[i] == expected.total
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_crossmatch_file(catalog_dir, store, sources, tmp_path, jobs):
+    out = tmp_path / 'matches.csv'
+    cli.main(['crossmatch', str(sources), str(out), '--radius', '2', '--mode', 'all',
+              '--catalog-dir', str(catalog_dir), '--chunk-size', '64', '--jobs', str(jobs)])
+    matches = pd.read_csv(out)
+    assert list(matches.columns) == list(cli.COLUMNS)
+
+    frame = pd.read_csv(sources)
+    source_ids, rows, separations = crossmatch(store, frame['ra'], frame['dec'], 2.0, nearest=False)
+    np.testing.assert_array_equal(matches['source_index'], source_ids)
+    assert matches['name'].tolist() == store.name[rows].tolist()
+    np.testing.assert_allclose(matches['separation'], separations)
+
+
+def test_cone_file_as_json_lines(catalog_dir, store, sources, tmp_path):
+    out = tmp_path / 'matches.jsonl'
+    cli.main(['cone', str(sources), str(out), '--radius', '5', '--limit', '2', '--catalogs', 'IC',
+              '--catalog-dir', str(catalog_dir), '--chunk-size', '100', '--jobs', '2'])
+    records = [json.loads(line) for line in out.read_text().splitlines()]
+    assert records and all(record['catalog'] == 'IC' for record in records)
+
+    frame = pd.read_csv(sources)
+    for source in {record['source_index'] for record in records[:20]}:
+        expected = cone_search(store, frame['ra'][source], frame['dec'][source], 5.0,
+                               AttributeFilter(catalogs=['IC']), limit=2)
+        assert ([record['name'] for record in records if record['source_index'] == source]
+                == store.name[expected.rows].tolist())
+
+
+def test_invalid_inputs(catalog_dir, sources, tmp_path):
+    with pytest.raises(ValueError, match='no column'):
+        list(cli.read_chunks(sources, ra_column='RA'))
+
+    bad = tmp_path / 'bad.csv'
+    pd.DataFrame({'ra': [10.0, 400.0], 'dec': [0.0, 0.0]}).to_csv(bad, index=False)
+    with pytest.raises(SystemExit):
+        cli.main(['cone', str(bad), str(tmp_path / 'out.csv'), '--radius', '1',
+                  '--catalog-dir', str(catalog_dir), '--jobs', '1'])
+
+
+def test_unknown_catalog_is_rejected(catalog_dir, sources, tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['cone', str(sources), str(tmp_path / 'out.csv'), '--radius', '1',
+                  '--catalog-dir', str(catalog_dir), '--jobs', '1', '--catalogs', 'ngc', 'M'])
+    assert exit_info.value.code == 2
+    assert 'unknown catalog(s) M' in capsys.readouterr().err
+    assert not (tmp_path / 'out.csv').exists()
@@ -0,0 +1,54 @@
+"""
+Tests for vectorized coordinate parsing.
+"""
+import numpy as np
+import pytest
+
+from dso_search.catalog.coordinates import parse_dec, parse_ra, parse_sexagesimal
+
+
+def test_parse_ra_formats():
+    ra, valid = parse_ra(['05:34:31.94', '00 42 44.3', '00 42.7', '10.5', '23:59:59.99'])
+    assert valid.all()
+    np.testing.assert_allclose(ra, [83.633083, 10.684583, 10.675, 10.5, 359.99996], atol=1e-6)
+
+
+def test_parse_dec_signs():
+    dec, valid = parse_dec(['-05:23:28', '+41 16 09', '41:16:09', '-00:30:00', '-00 00 36', ' -12.5 ',
+                            '- 05 23 28', '+00:00:00'])
+    assert valid.all()
+    np.testing.assert_allclose(dec, [-5.391111, 41.269167, 41.269167, -0.5, -0.01, -12.5,
+                                     -5.391111, 0.0], atol=1e-6)
+
+
+@pytest.mark.parametrize("value", [
+    '', 'abc', None, float('nan'), '05:61:00', '05:30:60', '05:30:', ':05:30', '1.2:30', '05:3.0:10',
+    '5:-3:2', '05 30 10 20', '1.2.3', 'Ä', '--5',
+])
+def test_invalid_entries_are_masked(value):
+    degrees, valid = parse_sexagesimal([value, '12:00:00'])
+    assert valid.tolist() == [False, True]
+    assert np.isnan(degrees[0]) and degrees[1] == 12.0
+
+
+def test_range_validation():
+    _, valid = parse_ra(['24:00:00', '-01:00:00', '359.5'])
+    assert valid.tolist() == [False, False, True]
+    _, valid = parse_dec(['+90:00:00', '-90:00:01', '91'])
+    assert valid.tolist() == [True, False, False]
+
+
+def test_matches_reference_conversion():
+    rng = np.random.default_rng(4)
+    n = 2000
+    seconds = rng.integers(0, 90 * 3600, n)
+    signs = rng.choice(['-', '+', ''], n)
+    text = [f"{sign}{s // 3600:02d}:{s % 3600 // 60:02d}:{s % 60:02d}" for sign, s in zip(signs, seconds)]
+    dec, valid = parse_dec(text)
+    assert valid.all()
+    np.testing.assert_allclose(dec, np.where(signs == '-', -1, 1) * seconds / 3600.0, atol=1e-9)
+
+
+def test_empty_input():
+    degrees, valid = parse_sexagesimal([])
+    assert degrees.shape == valid.shape == (0,)
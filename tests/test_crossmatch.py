@@ -0,0 +1,77 @@
+"""
+Tests for cross-matching source lists against the catalog store.
+"""
+import numpy as np
+import pytest
+
+from dso_search.search.crossmatch import crossmatch, iter_crossmatch
+from dso_search.search.geometry import angular_separation
+
+
+@pytest.fixture(scope="module")
+def catalog(synthetic_store):
+    return synthetic_store(3000, seed=21)
+
+
+@pytest.fixture(scope="module")
+def sources(catalog):
+    rng = np.random.default_rng(4)
+    # Half the sources sit close to a catalog object, half are random
+    picks = rng.choice(len(catalog), 200)
+    ra = np.concatenate([np.mod(catalog.ra[picks] + rng.normal(0, 0.05, 200), 360),
+                         rng.uniform(0, 360, 200)])
+    dec = np.concatenate([np.clip(catalog.dec[picks] + rng.normal(0, 0.05, 200), -90, 90),
+                          rng.uniform(-90, 90, 200)])
+    return ra, dec
+
+
+def brute_force(catalog, ra, dec, radius):
+    pairs = []
+    for i, (a, d) in enumerate(zip(ra, dec)):
+        separations = angular_separation(catalog.ra, catalog.dec, a, d)
+        for row in np.nonzero(separations <= radius)[0]:
+            pairs.append((i, row, separations[row]))
+    return pairs
+
+
+def test_all_matches_agree_with_brute_force(catalog, sources):
+    ra, dec = sources
+    source_ids, rows, separations = crossmatch(catalog, ra, dec, 1.5, nearest=False)
+    expected = brute_force(catalog, ra, dec, 1.5)
+    assert sorted(zip(source_ids.tolist(), rows.tolist())) == sorted((i, r) for i, r, _ in expected)
+    np.testing.assert_allclose(separations, angular_separation(
+        catalog.ra[rows], catalog.dec[rows], ra[source_ids], dec[source_ids]))
+
+
+def test_nearest_match_per_source(catalog, sources):
+    ra, dec = sources
+    source_ids, rows, separations = crossmatch(catalog, ra, dec, 0.2)
+    assert len(np.unique(source_ids)) == len(source_ids)
+    expected = {}
+    for i, row, separation in brute_force(catalog, ra, dec, 0.2):
+        if i not in expected or separation < expected[i][1]:
+            expected[i] = (row, separation)
+    assert dict(zip(source_ids.tolist(), rows.tolist())) == {i: r for i, (r, _) in expected.items()}
+
+
+def test_chunking_does_not_change_results(catalog, sources):
+    ra, dec = sources
+    whole = crossmatch(catalog, ra, dec, 1.0, nearest=False)
+    chunked = crossmatch(catalog, ra, dec, 1.0, nearest=False, chunk_size=7)
+    for a, b in zip(whole, chunked):
+        np.testing.assert_array_equal(a, b)
+    assert len(list(iter_crossmatch(catalog, ra, dec, 1.0, chunk_size=100))) == 4
+
+
+def test_limit_keeps_nearest_matches_per_source(catalog, sources):
+    ra, dec = sources
+    source_ids, rows, separations = crossmatch(catalog, ra, dec, 5.0, nearest=False)
+    limited = crossmatch(catalog, ra, dec, 5.0, nearest=False, limit=2)
+    ranks = np.arange(len(source_ids)) - np.searchsorted(source_ids, source_ids)
+    for a, b in zip((source_ids, rows, separations), limited):
+        np.testing.assert_array_equal(a[ranks < 2], b)
+
+
+def test_empty_source_list(catalog):
+    source_ids, rows, separations = crossmatch(catalog, [], [], 1.0)
+    assert len(source_ids) == len(rows) == len(separations) == 0
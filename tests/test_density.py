@@ -0,0 +1,108 @@
+"""
+Tests for the sky density pyramid and the tiles endpoint.
+"""
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from dso_search.api import main
+from dso_search.api.main import TILE_OBJECTS_LEVEL, create_app
+from dso_search.search.density import DensityPyramid, cell_of, cell_rows, grid_shape
+from dso_search.search.store import CatalogStore
+
+
+@pytest.fixture(scope="module")
+def store(synthetic_frame):
+    df = synthetic_frame(5000, seed=230, missing_sizes=0.2)
+    # Objects on cell boundaries and at the poles
+    df.loc[:5, 'ra'] = [0.0, 90.0, 180.0, 359.999, 45.0, 270.0]
+    df.loc[:5, 'dec'] = [0.0, 45.0, -90.0, 90.0, -45.0, 89.99]
+    return CatalogStore.from_frame(df)
+
+
+@pytest.mark.parametrize("level", [0, 3, 6])
+def test_pyramid_matches_direct_binning(store, level):
+    pyramid = DensityPyramid.from_store(store, max_level=6)
+    stats = pyramid.levels[level]
+    assert stats.count.shape == grid_shape(level)
+    x, y = cell_of(store.ra, store.dec, level)
+    expected = np.zeros(grid_shape(level), dtype=np.int64)
+    np.add.at(expected, (y, x), 1)
+    np.testing.assert_array_equal(stats.count, expected)
+
+    for cx, cy in zip(x[:20], y[:20]):
+        sizes = store.size[(x == cx) & (y == cy)]
+        sizes = sizes[~np.isnan(sizes)]
+        assert stats.sized[cy, cx] == len(sizes)
+        assert stats.size_sum[cy, cx] == pytest.approx(sizes.sum())
+        if len(sizes):
+            assert (stats.size_min[cy, cx], stats.size_max[cy, cx]) == (sizes.min(), sizes.max())
+
+
+def test_cells_partition_their_parent(store):
+    pyramid = DensityPyramid.from_store(store, max_level=6)
+    for level, x, y, depth in [(0, 0, 0, 3), (2, 5, 1, 2), (4, 30, 15, 6), (5, 0, 31, 1)]:
+        cell_level, xs, ys, stats = pyramid.cells(level, x, y, depth)
+        assert cell_level == min(level + depth, 6)
+        scale = 1 << (cell_level - level)
+        assert ((xs // scale == x) & (ys // scale == y)).all()
+        assert stats.count.sum() == pyramid.count(level, x, y)
+        assert (stats.count > 0).all()
+    assert pyramid.cells(7, 0, 0, 2)[0] is None
+
+
+@pytest.mark.parametrize("level", [1, 4, 7, 10])
+def test_cell_rows_match_brute_force(store, level):
+    x, y = cell_of(store.ra, store.dec, level)
+    # Cells of boundary and polar objects, plus a few random ones
+    for cx, cy in zip(x[:10], y[:10]):
+        rows = cell_rows(store, level, cx, cy)
+        np.testing.assert_array_equal(rows, np.flatnonzero((x == cx) & (y == cy)))
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(create_app(preload=True))
+
+
+def test_low_zoom_tiles_report_cells(client):
+    total = client.get("/health").json()["catalog_count"]
+    halves = [client.get(f"/tiles/0/{x}/0").json() for x in (0, 1)]
+    assert sum(tile["total"] for tile in halves) == total
+    west = halves[0]
+    assert (west["ra_min"], west["ra_max"], west["dec_min"], west["dec_max"]) == (0.0, 180.0, -90.0, 90.0)
+    assert west["cell_level"] == 4
+    assert west["objects"] is None
+    assert sum(cell["count"] for cell in west["cells"]) == west["total"]
+    assert all(cell["min_size"] <= cell["mean_size"] <= cell["max_size"]
+               for cell in west["cells"] if cell["sized"])
+
+    shallow = client.get("/tiles/0/0/0", params={"depth": 0}).json()
+    assert [(cell["x"], cell["y"], cell["count"]) for cell in shallow["cells"]] == [(0, 0, west["total"])]
+
+
+def test_deep_zoom_tiles_list_objects(client):
+    # M31 at (10.68, 41.27)
+    x, y = (int(v) for v in cell_of(10.684583, 41.269167, TILE_OBJECTS_LEVEL))
+    tile = client.get(f"/tiles/{TILE_OBJECTS_LEVEL}/{x}/{y}").json()
+    assert "M31" in [obj["name"] for obj in tile["objects"]]
+    assert tile["total"] == len(tile["objects"])
+
+    x, y = (int(v) for v in cell_of(10.684583, 41.269167, 12))
+    tile = client.get(f"/tiles/12/{x}/{y}").json()
+    assert tile["cell_level"] is None and tile["cells"] == []
+    assert [obj["name"] for obj in tile["objects"]] == ["M31"]
+
+
+def test_tile_objects_are_largest_first(client, monkeypatch):
+    monkeypatch.setattr(main, 'TILE_OBJECTS_LEVEL', 0)
+    tile = client.get("/tiles/0/0/0", params={"limit": 3}).json()
+    assert len(tile["objects"]) == 3 and tile["total"] > 3
+    sizes = [obj["size"] for obj in tile["objects"]]
+    assert sizes == sorted(sizes, reverse=True)
+
+
+def test_invalid_tiles(client):
+    assert client.get("/tiles/2/8/0").status_code == 404
+    assert client.get("/tiles/2/0/4").status_code == 404
+    assert client.get("/tiles/21/0/0").status_code == 422
@@ -0,0 +1,182 @@
+"""
+Tests for the bounded search worker pool.
+"""
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from dso_search.api import main
+from dso_search.api.executor import Overloaded, SearchExecutor, SearchTimeout
+from dso_search.api.main import create_app
+
+
+def test_executor_runs_in_worker_threads():
+    executor = SearchExecutor(workers=2, queue_size=0)
+    name = asyncio.run(executor.run(lambda: threading.current_thread().name))
+    assert name.startswith('search')
+    assert executor.stats()['in_progress'] == 0
+
+
+def test_executor_rejects_beyond_capacity():
+    executor = SearchExecutor(workers=1, queue_size=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(Overloaded):
+            await executor.run(time.sleep, 0)
+        release.set()
+        return await asyncio.gather(*running)
+
+    assert asyncio.run(scenario()) == [True, True]
+    assert executor.stats()['rejected'] == 1
+    assert executor.stats()['in_progress'] == 0
+
+
+def test_executor_timeout_holds_slot_until_the_task_ends():
+    executor = SearchExecutor(workers=1, queue_size=1, timeout=0.05)
+    release = threading.Event()
+
+    async def scenario():
+        with pytest.raises(SearchTimeout):
+            await executor.run(release.wait)
+        # The running task still holds its slot
+        assert executor.stats()['in_progress'] == 1
+        release.set()
+        for _ in range(100):
+            if executor.stats()['in_progress'] == 0:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    assert executor.stats() == {'workers': 1, 'queue_size': 1, 'in_progress': 0, 'rejected': 0, 'timeouts': 1}
+
+
+def test_stream_timeout_holds_slot_until_the_block_ends():
+    executor = SearchExecutor(workers=1, queue_size=0, timeout=0.1)
+    release = threading.Event()
+
+    def blocks():
+        yield 'first'
+        release.wait(5)
+        yield 'second'
+
+    async def scenario():
+        executor.admit()
+        stream = main._stream_in_executor(executor, blocks(), executor.deadline())
+        assert await stream.__anext__() == 'first'
+        with pytest.raises(SearchTimeout):
+            await stream.__anext__()
+        # The worker is still producing the second block
+        assert executor.stats()['in_progress'] == 1
+        release.set()
+        for _ in range(100):
+            if executor.stats()['in_progress'] == 0:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    assert executor.stats()['in_progress'] == 0
+
+
+def test_lifespan_shuts_the_executor_down():
+    executor = SearchExecutor(workers=1, queue_size=0)
+    with TestClient(create_app(preload=True, executor=executor)) as client:
+        assert client.post("/search", json=SEARCH).status_code == 200
+    with pytest.raises(RuntimeError):
+        executor.submit(time.sleep, 0)
+
+
+def blocking_search(monkeypatch):
+    """Make /search block in its worker until the returned event is set."""
+    entered = threading.Event()
+    release = threading.Event()
+    cone_search = main._cone_search
+
+    def slow(*args):
+        entered.set()
+        release.wait(5)
+        return cone_search(*args)
+
+    monkeypatch.setattr(main, '_cone_search', slow)
+    return entered, release
+
+
+async def wait_for(event: threading.Event):
+    for _ in range(500):
+        if event.is_set():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("event not set")
+
+
+def client_for(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test')
+
+
+SEARCH = {"ra": 10.68, "dec": 41.27, "radius": 180}
+
+
+def test_slow_search_does_not_block_other_requests(monkeypatch):
+    entered, release = blocking_search(monkeypatch)
+    app = create_app(preload=True, executor=SearchExecutor(workers=1, queue_size=0))
+    app.state.cache = None
+
+    async def scenario():
+        async with client_for(app) as client:
+            slow = asyncio.ensure_future(client.post("/search", json=SEARCH))
+            await wait_for(entered)
+            health = await client.get("/health")
+            busy = await client.post("/search", json=SEARCH)
+            release.set()
+            return health, busy, await slow
+
+    health, busy, slow = asyncio.run(scenario())
+    assert health.status_code == 200
+    assert busy.status_code == 429
+    assert busy.headers["retry-after"] == "1"
+    assert slow.status_code == 200
+    assert slow.json()["count"] > 0
+
+
+def test_search_timeout_returns_504(monkeypatch):
+    entered, release = blocking_search(monkeypatch)
+    app = create_app(preload=True, executor=SearchExecutor(workers=1, queue_size=0, timeout=0.1))
+    app.state.cache = None
+
+    async def scenario():
+        async with client_for(app) as client:
+            response = await client.post("/search", json=SEARCH)
+            release.set()
+            metrics = await client.get("/metrics")
+            return response, metrics
+
+    response, metrics = asyncio.run(scenario())
+    assert response.status_code == 504
+    assert 'dso_executor_timeouts_total 1' in metrics.text
+
+
+def test_crossmatch_and_batch_run_in_executor():
+    executor = SearchExecutor(workers=2, queue_size=0)
+    app = create_app(preload=True, executor=executor)
+
+    async def scenario():
+        async with client_for(app) as client:
+            batch = await client.post("/search/batch", json={"queries": [SEARCH, SEARCH]})
+            matches = await client.post("/crossmatch", params={"radius": 1.0},
+                                        json=[[10.68, 41.27], [83.82, -5.39]])
+            bad = await client.post("/crossmatch", params={"radius": 1.0}, content=b"not,a,list",
+                                    headers={"content-type": "application/json"})
+            return batch, matches, bad
+
+    batch, matches, bad = asyncio.run(scenario())
+    assert batch.status_code == 200 and batch.json()["count"] == 2
+    assert matches.status_code == 200 and len(matches.text.splitlines()) == 2
+    assert bad.status_code == 422
+    # Every slot was given back, including those of the stream and the failed upload
+    assert executor.stats()['in_progress'] == 0
@@ -0,0 +1,175 @@
+"""
+Tests for the shared fetch layer, against a local stand-in HTTP server.
+"""
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip('requests')
+
+from dso_search.utils.fetch import fetch, fetch_many, make_session
+
+BODY = b''.join(b'%05d\t00 42 44.3\t+41 16 09\t178.0\n' % i for i in range(2000))
+ETAG = '"v1"'
+LAST_MODIFIED = 'Mon, 05 Oct 2026 12:00:00 GMT'
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serves BODY with validators, ranges and optional gzip; counts requests and bytes."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if (self.headers.get('If-None-Match') == server.etag or
+                self.headers.get('If-Modified-Since') == LAST_MODIFIED and server.etag == ETAG):
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        gzipped = self.path.startswith('/gzip') and 'gzip' in self.headers.get('Accept-Encoding', '')
+        body = gzip.compress(server.body, mtime=0) if gzipped else server.body
+        start = 0
+        status = 200
+        range_header = self.headers.get('Range')
+        if range_header and self.headers.get('If-Range') in (server.etag, None):
+            start = int(range_header.split('=')[1].rstrip('-'))
+            status = 206
+        payload = body[start:]
+        if server.truncate is not None:
+            # Promise the whole body but drop the connection part way through
+            sent, server.truncate = payload[:server.truncate], None
+        else:
+            sent = payload
+
+        self.send_response(status)
+        self.send_header('ETag', server.etag)
+        self.send_header('Last-Modified', LAST_MODIFIED)
+        self.send_header('Content-Length', str(len(payload)))
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{len(body) - 1}/{len(body)}')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        server.sent += len(sent)
+        self.wfile.write(sent)
+        if len(sent) < len(payload):
+            self.close_connection = True
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.body = BODY
+    httpd.etag = ETAG
+    httpd.truncate = None
+    httpd.requests = []
+    httpd.sent = 0
+    httpd.url = f'http://127.0.0.1:{httpd.server_address[1]}'
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def session():
+    session = make_session(retries=0)
+    yield session
+    session.close()
+
+
+def test_fetch_streams_to_disk(server, session, tmp_path):
+    path = tmp_path / 'raw' / 'ngc2000.tsv'
+    result = fetch(server.url + '/plain', path, {'-source': 'VII/118'}, session=session)
+    assert result.status == 'downloaded'
+    assert result.transferred == len(BODY)
+    assert path.read_bytes() == BODY
+    assert not path.with_name(path.name + '.part').exists()
+    assert server.requests[0]['Accept-Encoding'] == 'gzip, deflate'
+
+
+def test_refresh_transfers_nothing_when_unchanged(server, session, tmp_path):
+    path = tmp_path / 'ngc2000.tsv'
+    fetch(server.url + '/plain', path, session=session)
+    mtime = path.stat().st_mtime_ns
+    result = fetch(server.url + '/plain', path, session=session)
+    assert result.status == 'not_modified' and not result.changed
+    assert result.transferred == 0
+    assert server.requests[-1]['If-None-Match'] == ETAG
+    assert server.requests[-1]['If-Modified-Since'] == LAST_MODIFIED
+    assert path.stat().st_mtime_ns == mtime
+
+    # A new upstream version is downloaded again
+    server.etag = '"v2"'
+    server.body = BODY[::-1]
+    assert fetch(server.url + '/plain', path, session=session).status == 'downloaded'
+    assert path.read_bytes() == BODY[::-1]
+
+
+def test_different_query_is_not_revalidated(server, session, tmp_path):
+    path = tmp_path / 'ngc2000.tsv'
+    fetch(server.url + '/plain', path, {'max': '10'}, session=session)
+    fetch(server.url + '/plain', path, {'max': '20'}, session=session)
+    assert 'If-None-Match' not in server.requests[-1]
+
+
+def test_gzip_transfer_is_decoded(server, session, tmp_path):
+    path = tmp_path / 'ngc2000.tsv'
+    result = fetch(server.url + '/gzip', path, session=session)
+    assert path.read_bytes() == BODY
+    assert result.transferred == len(gzip.compress(BODY, mtime=0)) < len(BODY)
+
+
+@pytest.mark.parametrize('route', ['/plain', '/gzip'])
+def test_interrupted_download_resumes(server, session, tmp_path, route):
+    path = tmp_path / 'ngc2000.tsv'
+    server.truncate = 1000
+    result = fetch(server.url + route, path, session=session)
+    assert result.status == 'resumed'
+    assert path.read_bytes() == BODY
+    assert server.requests[-1]['Range'] == 'bytes=1000-'
+    assert server.requests[-1]['If-Range'] == ETAG
+    # Every byte crossed the wire once
+    assert server.sent == result.transferred
+
+
+def test_partial_file_of_old_version_restarts(server, session, tmp_path):
+    path = tmp_path / 'ngc2000.tsv'
+    server.truncate = 1000
+    with pytest.raises(Exception):
+        fetch(server.url + '/plain', path, session=session, attempts=1)
+    assert path.with_name(path.name + '.part').stat().st_size == 1000
+
+    server.etag = '"v2"'
+    result = fetch(server.url + '/plain', path, session=session)
+    assert result.status == 'downloaded'
+    assert path.read_bytes() == BODY
+
+
+def test_fetch_many(server, session, tmp_path):
+    downloads = [(server.url + f'/plain/{i}', tmp_path / f'{i}.tsv') for i in range(4)]
+    downloads.append((server.url + '/gzip', tmp_path / 'gz.tsv', {'q': '1'}))
+    results = fetch_many(downloads, session=session, max_workers=3)
+    assert [result.path for result in results] == [download[1] for download in downloads]
+    assert all(result.status == 'downloaded' for result in results)
+    assert all(path.read_bytes() == BODY for path in tmp_path.glob('*.tsv'))
+    results = fetch_many(downloads, session=session)
+    assert all(result.status == 'not_modified' for result in results)
+
+
+def test_ngc_source_refresh(server, session, tmp_path, monkeypatch):
+    from dso_search.catalog import ingest, process_ngc
+    from dso_search.utils import fetch as fetch_module
+
+    monkeypatch.setattr(process_ngc, 'NGC_URL', server.url + '/plain')
+    monkeypatch.setattr(fetch_module, '_session', session)
+    kwargs = dict(raw_dir=tmp_path, processed_dir=tmp_path, intermediate_dir=tmp_path)
+    assert ingest.refresh(['ngc'], **kwargs)[0].status == 'downloaded'
+    assert ingest.refresh(['ngc'], **kwargs)[0].status == 'not_modified'
+    assert (tmp_path / 'ngc2000.tsv').read_bytes() == BODY
@@ -0,0 +1,72 @@
+"""
+Tests for attribute filters pushed down into cone searches.
+"""
+import numpy as np
+import pytest
+
+from dso_search.search.engine import cone_search
+from dso_search.search.filters import AttributeFilter
+from dso_search.search.store import CatalogStore, unit_vectors
+
+
+@pytest.fixture(scope="module")
+def frame_and_store(synthetic_frame):
+    df = synthetic_frame(6000, seed=170, catalogs=('IC', 'NGC', 'NGC'), missing_sizes=0.1)
+    df.loc[:19, 'catalog'] = 'Messier'
+    return df, CatalogStore.from_frame(df)
+
+
+def expected_rows(df, store, ra, dec, radius, catalogs=None, min_size=None, max_size=None,
+                  name_prefix=None):
+    rows = store.cone(ra, dec, radius)
+    sub = df.iloc[rows]
+    keep = np.ones(len(rows), dtype=bool)
+    if catalogs is not None:
+        keep &= sub['catalog'].str.lower().isin([c.lower() for c in catalogs]).to_numpy()
+    if min_size is not None:
+        keep &= (sub['size'] >= min_size).to_numpy()
+    if max_size is not None:
+        keep &= (sub['size'] <= max_size).to_numpy()
+    if name_prefix is not None:
+        normalized = sub['name'].str.replace(' ', '').str.upper()
+        keep &= normalized.str.startswith(name_prefix.replace(' ', '').upper()).to_numpy()
+    return rows[keep]
+
+
+@pytest.mark.parametrize("radius", [0.5, 10.0, 180.0])
+@pytest.mark.parametrize("kwargs", [
+    {'catalogs': ['Messier']},
+    {'catalogs': ['ngc', 'Messier', 'unknown']},
+    {'min_size': 30.0},
+    {'min_size': 5.0, 'max_size': 5.5},
+    {'max_size': 1.0, 'catalogs': ['IC']},
+    {'name_prefix': 'ngc 10'},
+    {'name_prefix': 'IC1', 'min_size': 10.0},
+    {'catalogs': ['unknown']},
+])
+def test_matches_post_filtering(frame_and_store, radius, kwargs):
+    df, store = frame_and_store
+    for ra, dec in [(10.0, 20.0), (200.0, -45.0)]:
+        result = cone_search(store, ra, dec, radius, AttributeFilter(**kwargs))
+        expected = expected_rows(df, store, ra, dec, radius, **kwargs)
+        np.testing.assert_array_equal(np.sort(result.rows), expected)
+        assert result.total == len(expected)
+        dots = store.xyz[result.rows] @ unit_vectors(ra, dec)
+        assert np.all(np.diff(dots) <= 0)
+
+
+def test_unfiltered_is_plain_cone(frame_and_store):
+    _, store = frame_and_store
+    result = cone_search(store, 10.0, 20.0, 5.0, AttributeFilter())
+    np.testing.assert_array_equal(np.sort(result.rows), store.cone(10.0, 20.0, 5.0))
+    assert not AttributeFilter().active
+
+
+def test_store_ranges(frame_and_store):
+    df, store = frame_and_store
+    lo, hi = store.size_range(10.0, 20.0)
+    assert hi - lo == ((df['size'] >= 10.0) & (df['size'] <= 20.0)).sum()
+    lo, hi = store.name_prefix_range('ngc10')
+    names = {store.name[row] for row in store.name_order[lo:hi]}
+    assert names == {name for name in df['name'] if name.replace(' ', '').startswith('NGC10')}
+    assert len(store.catalog_rows(store.catalog_code_of('messier'))) == 20
@@ -0,0 +1,140 @@
+"""
+Tests for field-of-view (rectangle and polygon) searches.
+"""
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from dso_search.api.main import create_app
+from dso_search.search.footprints import Footprint, footprint_search, footprint_search_many
+from dso_search.search.store import unit_vectors
+
+
+@pytest.fixture(scope="module")
+def store(synthetic_store):
+    return synthetic_store(20000, seed=50)
+
+
+def in_rectangle(store, ra, dec, width, height, position_angle):
+    """Brute force: standard gnomonic coordinates rotated by the position angle."""
+    ra0, dec0 = np.deg2rad(ra), np.deg2rad(dec)
+    ra1, dec1 = np.deg2rad(store.ra), np.deg2rad(store.dec)
+    cos_c = np.sin(dec0) * np.sin(dec1) + np.cos(dec0) * np.cos(dec1) * np.cos(ra1 - ra0)
+    xi = np.cos(dec1) * np.sin(ra1 - ra0) / cos_c
+    eta = (np.cos(dec0) * np.sin(dec1) - np.sin(dec0) * np.cos(dec1) * np.cos(ra1 - ra0)) / cos_c
+    pa = np.deg2rad(position_angle)
+    along = xi * np.sin(pa) + eta * np.cos(pa)
+    across = xi * np.cos(pa) - eta * np.sin(pa)
+    inside = (cos_c > 0) & (np.abs(across) < np.tan(np.deg2rad(width) / 2)) \
+        & (np.abs(along) < np.tan(np.deg2rad(height) / 2))
+    return np.flatnonzero(inside)
+
+
+def in_convex_polygon(store, ra, dec):
+    """Brute force: on the inner side of every edge's great circle."""
+    vertices = unit_vectors(ra, dec)
+    normals = np.cross(vertices, np.roll(vertices, -1, axis=0))
+    # Orient every edge's normal towards the polygon, not its antipode
+    normals *= np.sign(normals @ vertices.sum(axis=0))[:, None]
+    return np.flatnonzero((store.xyz @ normals.T > 0).all(axis=1))
+
+
+@pytest.mark.parametrize("ra, dec, width, height, position_angle", [
+    (10.0, 20.0, 8.0, 3.0, 0.0),
+    (200.0, -45.0, 12.0, 5.0, 33.0),
+    (359.0, 5.0, 10.0, 6.0, -70.0),     # straddles RA 0/360
+    (120.0, 86.0, 9.0, 4.0, 110.0),     # contains the north pole
+    (45.0, 0.0, 60.0, 40.0, 15.0),      # wide enough for curved edges to matter
+])
+def test_rectangle_matches_brute_force(store, ra, dec, width, height, position_angle):
+    footprint = Footprint.rectangle(ra, dec, width, height, position_angle)
+    rows, dots = footprint_search(store, footprint)
+    np.testing.assert_array_equal(rows, in_rectangle(store, ra, dec, width, height, position_angle))
+    np.testing.assert_allclose(dots, store.xyz[rows] @ footprint.center)
+
+
+def test_polygon_matches_brute_force(store):
+    ra = [350.0, 15.0, 20.0, 5.0, 345.0]
+    dec = [-10.0, -12.0, 5.0, 15.0, 8.0]
+    for order in (slice(None), slice(None, None, -1)):
+        rows, _ = footprint_search(store, Footprint(np.array(ra)[order], np.array(dec)[order]))
+        np.testing.assert_array_equal(rows, in_convex_polygon(store, ra, dec))
+
+
+def test_concave_polygon(store):
+    # An L shape: the union of two rectangles in the tangent plane at (100, 0)
+    footprint = Footprint([95.0, 105.0, 105.0, 100.0, 100.0, 95.0], [-5.0, -5.0, 0.0, 0.0, 5.0, 5.0])
+    rows, _ = footprint_search(store, footprint)
+    lower = set(in_convex_polygon(store, [95.0, 105.0, 105.0, 95.0], [-5.0, -5.0, 0.0, 0.0]))
+    upper = set(in_convex_polygon(store, [95.0, 100.0, 100.0, 95.0], [0.0, 0.0, 5.0, 5.0]))
+    assert set(rows) == lower | upper
+
+
+def test_many_footprints_match_single_searches(store):
+    footprints = [
+        Footprint.rectangle(10.0 * i, 3.0 * i - 30.0, 4.0 + i, 2.0 + i, 17.0 * i) for i in range(20)
+    ] + [Footprint([0.0, 10.0, 5.0], [0.0, 0.0, 10.0])]
+    ids, rows, dots = footprint_search_many(store, footprints)
+    for i, footprint in enumerate(footprints):
+        expected_rows, expected_dots = footprint_search(store, footprint)
+        np.testing.assert_array_equal(rows[ids == i], expected_rows)
+        np.testing.assert_allclose(dots[ids == i], expected_dots)
+
+
+@pytest.mark.parametrize("ra, dec", [
+    ([0.0, 1.0], [0.0, 1.0]),
+    ([0.0, 120.0, 240.0], [0.0, 0.0, 0.0]),
+])
+def test_invalid_polygons(ra, dec):
+    with pytest.raises(ValueError):
+        Footprint(ra, dec)
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(create_app(preload=True))
+
+
+def test_fov_endpoint(client):
+    rectangle = {"ra": 10.68, "dec": 41.27, "width": 4.0, "height": 2.0, "position_angle": 35.0}
+    response = client.post("/search/fov", json=rectangle)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["objects"][0]["name"] in ("M31", "NGC 224")
+    separations = [obj["separation"] for obj in body["objects"]]
+    assert separations == sorted(separations)
+
+    page = client.post("/search/fov", json={**rectangle, "limit": 1, "offset": 1}).json()
+    assert page["objects"] == body["objects"][1:2]
+    assert page["total"] == body["count"]
+
+    polygon = client.post("/search/fov", json={
+        "vertices": [[8.0, 39.0], [13.0, 39.0], [13.0, 43.0], [8.0, 43.0]], "catalogs": ["Messier"]})
+    assert polygon.status_code == 200
+    assert {obj["catalog"] for obj in polygon.json()["objects"]} == {"Messier"}
+
+
+def test_fov_batch_endpoint(client):
+    fields = [
+        {"ra": 10.68, "dec": 41.27, "width": 4.0, "height": 2.0},
+        {"ra": 83.82, "dec": -5.39, "width": 1.0, "height": 1.0, "position_angle": 45.0, "limit": 2},
+        {"vertices": [[0.0, 0.0], [0.5, 0.0], [0.5, 0.5]]},
+    ]
+    response = client.post("/search/fov/batch", json={"footprints": fields})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 3
+    for i, field in enumerate(fields):
+        single = client.post("/search/fov", json=field).json()
+        assert body["results"][str(i)] == single
+
+
+@pytest.mark.parametrize("body", [
+    {"ra": 10.0, "dec": 20.0, "width": 4.0},
+    {"ra": 10.0, "dec": 20.0, "width": 4.0, "height": 2.0, "vertices": [[0, 0], [1, 0], [1, 1]]},
+    {"vertices": [[0, 0], [1, 0]]},
+    {"vertices": [[0, 0], [120, 0], [240, 0]]},
+    {"vertices": [[0, 0], [1, 0], [400, 1]]},
+])
+def test_fov_endpoint_rejects_invalid_fields(client, body):
+    assert client.post("/search/fov", json=body).status_code == 422
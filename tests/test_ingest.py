@@ -0,0 +1,129 @@
+"""
+Tests for the streaming catalog ingestion framework and the built-in sources.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from dso_search.catalog import ingest
+from dso_search.catalog.ingest import (
+    PROCESSED_COLUMNS, CatalogSource, available_sources, get_source, read_vizier_tsv,
+    register_source,
+)
+from dso_search.catalog.process_messier import MessierSource
+from dso_search.catalog.process_ngc import NGCSource
+
+VIZIER_TSV = """#
+#   VizieR Astronomical Server vizier.cds.unistra.fr
+#RESOURCE=yCat_7118
+Name\tRAJ2000\tDEJ2000\tDiam
+ \t"h:m:s"\t"d:m:s"\tarcmin
+-----\t----------\t---------\t-----
+224\t00 42 44.3\t+41 16 09\t178.0
+1976\t05 35 17.3\t-05 23 28\t85.0
+I 434\t05 41 00.0\t-02 27 00\t60.0
+7000\t20 58 48\t+44 20 00\t
+"""
+
+
+def test_read_vizier_tsv_skips_preamble(tmp_path):
+    path = tmp_path / 'ngc2000.tsv'
+    path.write_text(VIZIER_TSV)
+    chunks = list(read_vizier_tsv(path, chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+    assert list(chunks[0].columns) == ['Name', 'RAJ2000', 'DEJ2000', 'Diam']
+    assert chunks[0]['Name'].tolist() == ['224', '1976', 'I 434']
+
+
+def test_ngc_source_from_tsv(tmp_path):
+    (tmp_path / 'ngc2000.tsv').write_text(VIZIER_TSV)
+    source = NGCSource(raw_dir=tmp_path, processed_dir=tmp_path)
+    assert source.process(chunk_size=2) == 3
+    df = pd.read_csv(source.output_path)
+    assert tuple(df.columns) == PROCESSED_COLUMNS
+    assert df['name'].tolist() == ['NGC224', 'NGC1976', 'NGC7000']
+    np.testing.assert_allclose(df['dec'], [41.269167, -5.391111, 44.333333], atol=1e-6)
+    assert np.isnan(df['size'][2])
+
+
+def test_ngc_source_from_fixed_width(tmp_path):
+    lines = [
+        ' 224  Gx  00 42.7  +41 16  s  And  178.    3.5  ',
+        'I 434 DN  05 41.0  -02 27  s  Ori   60.         ',
+        '1976  C+N 05 35.3  -05 23  s  Ori   85.    4.   ',
+    ]
+    (tmp_path / 'ngc2000.dat').write_text('\n'.join(lines) + '\n')
+    source = NGCSource(raw_dir=tmp_path, processed_dir=tmp_path)
+    assert source.process() == 2
+    df = pd.read_csv(source.output_path)
+    assert df['name'].tolist() == ['NGC224', 'NGC1976']
+    np.testing.assert_allclose(df['ra'], [10.675, 83.825])
+    np.testing.assert_allclose(df['dec'], [41.266667, -5.383333], atol=1e-6)
+    np.testing.assert_allclose(df['size'], [178.0, 85.0])
+
+
+def test_chunked_output_matches_single_chunk(tmp_path):
+    raw = tmp_path / 'raw'
+    raw.mkdir()
+    (raw / 'messier_catalog_info.txt').write_text(
+        "# Name,CommonName,NGCName,RA,Dec\n" +
+        ''.join(f"M{i},Object {i},NGC {i},{i % 24:02d}:30:00,-{i % 90:02d}:15:00\n" for i in range(1, 111)))
+    outputs = []
+    for chunk_size in (7, 1000):
+        out = tmp_path / f'out{chunk_size}'
+        source = MessierSource(raw_dir=raw, processed_dir=out, intermediate_dir=out)
+        assert source.process(chunk_size) == 110
+        outputs.append(source.output_path.read_text())
+    assert outputs[0] == outputs[1]
+    df = pd.read_csv(tmp_path / 'out7' / 'processed_messier.csv')
+    assert (df['dec'] < 0).all()
+    assert (tmp_path / 'out7' / 'messier_names.tsv').exists()
+
+
+def test_messier_blank_ngc_name_is_missing(tmp_path):
+    (tmp_path / 'messier_catalog_info.txt').write_text(
+        "# Name,CommonName,NGCName,RA,Dec\n"
+        "M31,Andromeda Galaxy,NGC 224,00:42:44.3,+41:16:09\n"
+        "M40,Winnecke 4, ,12:22:12.5,+58:04:59\n"
+        "M45,Pleiades,,03:47:24,+24:07:00\n")
+    source = MessierSource(raw_dir=tmp_path, processed_dir=tmp_path, intermediate_dir=tmp_path)
+    assert source.process() == 3
+    transformed = source.transform(pd.DataFrame({
+        'name': ['M31', 'M40'], 'common_name': ['Andromeda Galaxy', 'Winnecke 4'],
+        'ngc_name': ['NGC 224', ' '], 'ra': ['00:42:44.3', '12:22:12.5'], 'dec': ['+41:16:09', '+58:04:59'],
+    }))
+    assert transformed['ngc_name'].iloc[0] == 'NGC 224'
+    assert pd.isna(transformed['ngc_name'].iloc[1])
+    df = pd.read_csv(source.output_path)
+    assert df['ngc_name'].iloc[0] == 'NGC 224'
+    assert df['ngc_name'].iloc[1:].isna().all()
+
+
+def test_failed_ingest_leaves_previous_output(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, '_SOURCES', dict(ingest._SOURCES))
+
+    @register_source
+    class BrokenSource(CatalogSource):
+        name = 'broken-test'
+        catalog = 'Broken'
+
+        def read_chunks(self, chunk_size):
+            yield pd.DataFrame({'name': ['X1'], 'ra': ['1.0'], 'dec': ['2.0']})
+            raise OSError("truncated")
+
+        def transform(self, chunk):
+            return chunk.assign(ra=pd.to_numeric(chunk['ra']), dec=pd.to_numeric(chunk['dec']))
+
+    source = get_source('broken-test')(processed_dir=tmp_path)
+    source.output_path.write_text('previous')
+    with pytest.raises(OSError):
+        source.process()
+    assert source.output_path.read_text() == 'previous'
+    assert list(tmp_path.iterdir()) == [source.output_path]
+
+
+def test_registry():
+    assert {'messier', 'ngc'} <= set(available_sources())
+    assert get_source('ngc') is NGCSource
+    with pytest.raises(ValueError):
+        get_source('nope')
@@ -0,0 +1,118 @@
+"""
+Tests for merging cross-identified catalog entries.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from dso_search.catalog.merge import link_entries, merge_catalogs
+from dso_search.search.store import CatalogStore
+
+
+@pytest.fixture
+def combined():
+    return pd.DataFrame({
+        'name': ['M31', 'M42', 'M43', 'NGC224', 'NGC1976', 'NGC1982', 'NGC1977', 'IC 1', 'NGC5'],
+        'catalog': ['Messier'] * 3 + ['NGC'] * 4 + ['IC', 'NGC'],
+        'common_name': ['Andromeda Galaxy', 'Orion Nebula', None, None, None, None, None, None, None],
+        'ngc_name': ['NGC 224', 'NGC 1976', 'NGC 1982', None, None, None, None, None, None],
+        'ra': [10.6846, 83.8221, 83.8875, 10.6846, 83.8221, 83.8875, 83.8500, 1.0, 1.0],
+        'dec': [41.2692, -5.3911, -5.2700, 41.2692, -5.3911, -5.2700, -4.8400, 2.0, 2.005],
+        'size': [10.0, 10.0, 10.0, 178.0, 85.0, 20.0, 20.0, np.nan, 3.0],
+    })
+
+
+def test_merge_emits_one_row_per_object(combined):
+    merged = merge_catalogs(combined)
+    assert merged['name'].tolist() == ['M31', 'M42', 'M43', 'NGC1977', 'IC 1', 'NGC5']
+    assert merged['aliases'].tolist() == ['NGC224', 'NGC1976', 'NGC1982', '', '', '']
+    assert merged['common_name'][0] == 'Andromeda Galaxy'
+    # Measured NGC diameters replace the Messier placeholder size
+    assert merged['size'][:3].tolist() == [178.0, 85.0, 20.0]
+
+
+def test_size_missing_from_canonical_entry_comes_from_others():
+    df = pd.DataFrame({
+        'name': ['C1', 'NGC188'], 'catalog': ['Caldwell', 'NGC'], 'ngc_name': ['NGC 188', None],
+        'ra': [12.1, 12.1], 'dec': [85.25, 85.25], 'size': [np.nan, 14.0],
+    })
+    merged = merge_catalogs(df)
+    assert merged['name'].tolist() == ['C1']
+    assert merged['size'][0] == 14.0
+
+
+def test_placeholder_size_kept_without_measured_size():
+    df = pd.DataFrame({
+        'name': ['M40', 'NGC1'], 'catalog': ['Messier', 'NGC'],
+        'ra': [185.55, 1.0], 'dec': [58.08, 2.0], 'size': [10.0, np.nan],
+    })
+    assert merge_catalogs(df)['size'][0] == 10.0
+
+
+def test_close_pairs_without_confirming_designations_stay_apart():
+    # A Messier entry without ngc_name next to an NGC object, and an NGC/IC double
+    df = pd.DataFrame({
+        'name': ['M40', 'NGC4290', 'NGC2', 'IC 2'], 'catalog': ['Messier', 'NGC', 'NGC', 'IC'],
+        'ngc_name': [None, None, None, None],
+        'ra': [185.55, 185.551, 1.0, 1.003], 'dec': [58.08, 58.08, 2.0, 2.0], 'size': [10.0, 2.0, 1.0, 1.0],
+    })
+    group = link_entries(df)
+    assert len(set(group.tolist())) == 4
+
+
+def test_shared_cross_identification_links_by_position():
+    df = pd.DataFrame({
+        'name': ['M31', 'C99'], 'catalog': ['Messier', 'Caldwell'], 'ngc_name': ['NGC 224', 'NGC224'],
+        'ra': [10.6846, 10.6850], 'dec': [41.2692, 41.2692], 'size': [10.0, 190.0],
+    })
+    merged = merge_catalogs(df)
+    assert merged['aliases'].tolist() == ['C99']
+    assert merged['size'][0] == 190.0
+
+
+def test_designation_links_need_consistent_positions(combined):
+    combined.loc[3, 'dec'] = -41.2692
+    merged = merge_catalogs(combined)
+    assert 'NGC224' in merged['name'].tolist()
+    assert merged['aliases'][0] == ''
+
+
+def test_conflicting_designations_are_not_merged(combined):
+    # M43 claims to be NGC 1982, so a different NGC entry at its position stays apart
+    combined.loc[5, 'name'] = 'NGC1999'
+    group = link_entries(combined)
+    assert group[2] != group[5]
+
+
+def test_one_entry_per_catalog_in_a_group():
+    # Both NGC entries carry M1's designation; only the closer one joins it
+    df = pd.DataFrame({
+        'name': ['M1', 'NGC1', 'NGC 1'], 'catalog': ['Messier', 'NGC', 'NGC'], 'ngc_name': ['NGC 1', None, None],
+        'ra': [10.0, 10.001, 10.002], 'dec': [0.0, 0.0, 0.0], 'size': [1.0, 1.0, 1.0],
+    })
+    merged = merge_catalogs(df)
+    assert merged['name'].tolist() == ['M1', 'NGC 1']
+    assert merged['aliases'].tolist() == ['NGC1', '']
+
+
+def test_merged_aliases_resolve(combined):
+    store = CatalogStore.from_frame(merge_catalogs(combined))
+    row, linked = store.names.resolve('NGC 224')
+    assert store.name[row] == 'M31' and len(linked) == 0
+
+
+def test_spatial_join_scales(uniform_sky):
+    n = 20000
+    ra, dec = uniform_sky(n, seed=3)
+    # Entries of two catalogs sharing cross-identifications link through the spatial join
+    df = pd.DataFrame({
+        'name': [f'C{i}' for i in range(n)] + [f'X{i}' for i in range(n)],
+        'catalog': ['Caldwell'] * n + ['Other'] * n,
+        'ngc_name': [f'NGC{i}' for i in range(n)] * 2,
+        'ra': np.concatenate([ra, ra + 1e-4]),
+        'dec': np.concatenate([dec, dec]),
+        'size': 1.0,
+    })
+    merged = merge_catalogs(df)
+    assert len(merged) == n
+    assert (merged['aliases'] != '').all()
@@ -0,0 +1,136 @@
+"""
+Tests for the metrics endpoint and the slow request profiler.
+"""
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from dso_search.api.cache import QueryCache
+from dso_search.api.executor import SearchExecutor
+from dso_search.api.main import ADMIN_TOKEN_ENV, create_app
+from dso_search.api.metrics import Counter, Histogram
+from dso_search.api.profiling import SlowRequestProfiler
+from dso_search.search import engine
+
+
+def parse(text: str) -> dict:
+    """Samples of an exposition, keyed by 'name{labels}'."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            key, value = line.rsplit(' ', 1)
+            samples[key] = float(value)
+    return samples
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('h', 'Test.', ('endpoint',), buckets=(1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value, '/x')
+    samples = parse('\n'.join(histogram.render()))
+    assert samples['h_bucket{endpoint="/x",le="1"}'] == 2
+    assert samples['h_bucket{endpoint="/x",le="10"}'] == 3
+    assert samples['h_bucket{endpoint="/x",le="+Inf"}'] == 4
+    assert samples['h_count{endpoint="/x"}'] == 4
+    assert samples['h_sum{endpoint="/x"}'] == 56.5
+
+
+def test_label_values_are_escaped():
+    counter = Counter('c', 'Test.', ('path',))
+    counter.inc('a"b\\c')
+    assert 'c{path="a\\"b\\\\c"} 1' in counter.render()
+
+
+def test_metrics_endpoint():
+    client = TestClient(create_app(preload=True, cache=QueryCache(), metrics=True))
+    for _ in range(2):
+        assert client.post("/search", json={"ra": 10.68, "dec": 41.27, "radius": 180}).status_code == 200
+    client.post("/search", json={"ra": 10.68, "dec": 41.27, "radius": 1, "catalogs": ["NGC"]})
+    client.post("/search/batch", json={"queries": [{"ra": 10.68, "dec": 41.27, "radius": 5}]})
+    client.get("/objects/M31")
+    client.get("/objects/nonexistent")
+    client.post("/search", json={"ra": 400, "dec": 0})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    samples = parse(response.text)
+    assert samples['dso_requests_total{method="POST",endpoint="/search",status="200"}'] == 3
+    assert samples['dso_requests_total{method="POST",endpoint="/search",status="422"}'] == 1
+    # Requests are labelled by route template, not by path
+    assert samples['dso_requests_total{method="GET",endpoint="/objects/{name}",status="200"}'] == 1
+    assert samples['dso_requests_total{method="GET",endpoint="/objects/{name}",status="404"}'] == 1
+    assert samples['dso_request_duration_seconds_count{endpoint="/search"}'] == 4
+
+    # The second identical search was served from the cache
+    for stage in ('candidates', 'exact', 'order', 'serialize'):
+        assert samples[f'dso_search_stage_seconds_count{{endpoint="/search",stage="{stage}"}}'] == 2
+    assert samples['dso_search_stage_seconds_count{endpoint="/search",stage="cache"}'] == 3
+    assert samples['dso_search_stage_seconds_count{endpoint="/search/batch",stage="cone"}'] == 1
+    assert samples['dso_search_result_objects_count{endpoint="/search"}'] == 2
+    assert samples['dso_cache_hits_total'] == 1
+
+    assert samples['dso_catalog_loads_total'] == 1
+    assert samples['dso_catalog_load_seconds'] > 0
+    assert samples['dso_catalog_objects{catalog="Messier"}'] > 0
+
+
+def test_metrics_disabled(monkeypatch):
+    monkeypatch.setenv(ADMIN_TOKEN_ENV, "secret")
+    client = TestClient(create_app(preload=True, metrics=False))
+    assert client.post("/search", json={"ra": 10.68, "dec": 41.27}).status_code == 200
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/debug/profiles", headers={"X-Admin-Token": "secret"}).json() == {"enabled": False}
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_profiler_keeps_slow_requests_only():
+    profiler = SlowRequestProfiler(threshold=0.05, interval=0.001)
+
+    def run(label, seconds):
+        sample = profiler.start()
+        start = time.perf_counter()
+        busy(seconds)
+        profiler.finish(sample, label, time.perf_counter() - start)
+
+    thread = threading.Thread(target=run, args=('fast', 0.01))
+    thread.start()
+    thread.join()
+    run('slow', 0.1)
+    profiles = profiler.profiles()
+    assert [profile['request'] for profile in profiles] == ['slow']
+    assert profiles[0]['samples'] > 0
+    assert 'busy (test_metrics.py' in profiles[0]['stacks'][0]['stack']
+
+
+def test_slow_request_profiles_endpoint(monkeypatch):
+    monkeypatch.setenv(ADMIN_TOKEN_ENV, "secret")
+    profiler = SlowRequestProfiler(threshold=0.0, interval=0.001)
+    client = TestClient(create_app(preload=True, profiler=profiler))
+    client.post("/search", json={"ra": 10.68, "dec": 41.27, "radius": 180})
+    body = client.get("/debug/profiles", headers={"X-Admin-Token": "secret"}).json()
+    assert body["enabled"] is True
+    assert body["profiles"][0]["request"] == "POST /search"
+
+
+def test_slow_search_profile_samples_the_worker(monkeypatch):
+    # Slow down the candidate stage so the search itself dominates the samples
+    candidates = engine.cone_candidates
+
+    def slow_candidates(*args):
+        busy(0.05)
+        return candidates(*args)
+
+    monkeypatch.setattr(engine, 'cone_candidates', slow_candidates)
+    profiler = SlowRequestProfiler(threshold=0.0, interval=0.001)
+    client = TestClient(create_app(preload=True, profiler=profiler, executor=SearchExecutor(workers=1)))
+    assert client.post("/search", json={"ra": 10.68, "dec": 41.27, "radius": 5}).status_code == 200
+    profile = profiler.profiles()[0]
+    assert profile["request"] == "POST /search"
+    assert any('cone_search (engine.py' in entry["stack"] for entry in profile["stacks"])
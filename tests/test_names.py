@@ -0,0 +1,67 @@
+"""
+Tests for designation normalization and the name lookup index.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from dso_search.search.names import designation_key
+from dso_search.search.store import CatalogStore
+
+
+@pytest.fixture(scope="module")
+def store():
+    return CatalogStore.from_frame(pd.DataFrame({
+        'name': ['M31', 'M42', 'M45', 'NGC224', 'NGC1976', 'NGC1977', 'IC 434'],
+        'catalog': ['Messier'] * 3 + ['NGC'] * 3 + ['IC'],
+        'common_name': ['Andromeda Galaxy', 'Orion Nebula', 'Pleiades', None, None, None, 'Horsehead Nebula'],
+        'ngc_name': ['NGC 224', 'NGC 1976', None, None, None, None, None],
+        'ra': [10.68, 83.82, 56.75, 10.68, 83.82, 83.85, 85.25],
+        'dec': [41.27, -5.39, 24.12, 41.27, -5.39, -4.84, -2.46],
+        'size': [178.0, 85.0, 110.0, 178.0, 85.0, 20.0, 60.0],
+    }))
+
+
+@pytest.mark.parametrize("value, key", [
+    ("NGC 224", "NGC224"), ("ngc0224", "NGC224"), ("M 31", "M31"), ("Messier 31", "M31"),
+    ("Andromeda Galaxy", "ANDROMEDAGALAXY"), ("IC 434", "IC434"), ("NGC 2264-A", "NGC2264A"),
+])
+def test_designation_key(value, key):
+    assert designation_key(value) == key
+
+
+@pytest.mark.parametrize("query", ["M31", "m 31", "Messier 31", "NGC 224", "NGC0224", "andromeda galaxy"])
+def test_resolve_links_messier_and_ngc(store, query):
+    row, linked = store.names.resolve(query)
+    assert {store.name[row], *store.name[linked]} == {'M31', 'NGC224'}
+
+
+def test_resolve_prefers_own_name(store):
+    row, linked = store.names.resolve("NGC 1976")
+    assert store.name[row] == 'NGC1976'
+    assert store.name[linked].tolist() == ['M42']
+    row, linked = store.names.resolve("M45")
+    assert store.name[row] == 'M45' and len(linked) == 0
+
+
+def test_resolve_unknown(store):
+    row, linked = store.names.resolve("NGC 9999")
+    assert row is None and len(linked) == 0
+
+
+def test_complete_dedupes_linked_entries(store):
+    suggestions = store.names.complete("ngc 19")
+    assert [text for text, _ in suggestions] == ['NGC 1976', 'NGC1977']
+    assert [text for text, _ in store.names.complete("or")] == ['Orion Nebula']
+    assert len(store.names.complete("NGC", limit=1)) == 1
+    assert store.names.complete("  ") == []
+
+
+def test_index_on_mapped_store(tmp_path, store):
+    from dso_search.catalog.binary import load_binary_catalog, write_binary_catalog
+
+    mapped = load_binary_catalog(write_binary_catalog(store, tmp_path / 'catalog.bin'))
+    row, linked = mapped.names.resolve("Orion Nebula")
+    assert mapped.name[row] == 'M42'
+    assert mapped.name[np.asarray(linked)].tolist() == ['NGC1976']
+    assert mapped.common_name[row] == 'Orion Nebula'
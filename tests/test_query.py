@@ -0,0 +1,40 @@
+"""
+Tests for nearest-first ordering and paging of search results.
+"""
+import numpy as np
+
+from dso_search.search.query import page_by_separation, page_groups_by_separation
+
+
+def full_order(rows, dots):
+    return np.lexsort((rows, -dots))
+
+
+def test_pages_match_full_sort():
+    rng = np.random.default_rng(2)
+    rows = np.arange(1000)
+    # Coarse values give plenty of ties at page boundaries
+    dots = np.round(rng.uniform(0.9, 1.0, 1000), 2)
+    expected = full_order(rows, dots)
+    np.testing.assert_array_equal(page_by_separation(rows, dots), expected)
+
+    pages = [page_by_separation(rows, dots, offset, 37) for offset in range(0, 1000, 37)]
+    np.testing.assert_array_equal(np.concatenate(pages), expected)
+    assert len(page_by_separation(rows, dots, 1000, 10)) == 0
+
+
+def test_group_pages_match_single_pages():
+    rng = np.random.default_rng(3)
+    query_ids = np.sort(rng.integers(0, 4, 400))
+    rows = rng.permutation(400)
+    dots = np.round(rng.uniform(0.5, 1.0, 400), 1)
+    offsets = [0, 3, 0, 50]
+    limits = [5, 5, -1, 10]
+
+    keep, totals = page_groups_by_separation(query_ids, rows, dots, 5, offsets, limits)
+    np.testing.assert_array_equal(totals, np.bincount(query_ids, minlength=5))
+    for q in range(4):
+        mine = np.nonzero(query_ids == q)[0]
+        limit = None if limits[q] < 0 else limits[q]
+        expected = mine[page_by_separation(rows[mine], dots[mine], offsets[q], limit)]
+        np.testing.assert_array_equal(keep[query_ids[keep] == q], expected)
@@ -0,0 +1,114 @@
+"""
+Tests for catalog snapshots and hot reloading.
+"""
+import os
+import time
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from dso_search.api.main import ADMIN_TOKEN_ENV, create_app
+from dso_search.api.state import CatalogHolder
+
+
+def write_catalog(path, n):
+    csv_file = path / 'processed_test.csv'
+    pd.DataFrame({
+        'name': [f'NGC {i}' for i in range(n)],
+        'catalog': 'NGC',
+        'ra': [10.0 + i for i in range(n)],
+        'dec': [20.0] * n,
+        'size': [1.0] * n,
+    }).to_csv(csv_file, index=False)
+    # Make sure the modification time differs from the previous write
+    stamp = time.time() + n
+    os.utime(csv_file, (stamp, stamp))
+
+
+@pytest.fixture
+def catalog_dir(tmp_path):
+    write_catalog(tmp_path, 3)
+    return tmp_path
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    """Headers of an admin request, with the admin token configured."""
+    monkeypatch.setenv(ADMIN_TOKEN_ENV, 'secret')
+    return {'X-Admin-Token': 'secret'}
+
+
+def test_reload_swaps_snapshot(catalog_dir, admin):
+    client = TestClient(create_app(catalog_dir))
+    before = client.get('/health').json()
+    assert before['catalog_count'] == 3
+
+    response = client.post('/admin/reload', params={'wait': True}, headers=admin)
+    assert response.json() == {'status': 'unchanged', 'version': before['catalog_version']}
+
+    write_catalog(catalog_dir, 5)
+    response = client.post('/admin/reload', params={'wait': True}, headers=admin)
+    assert response.status_code == 200
+    assert response.json()['status'] == 'reloaded'
+
+    after = client.get('/health').json()
+    assert after['catalog_count'] == 5
+    assert after['catalog_version'] != before['catalog_version']
+    assert client.get('/catalogs').json()['version'] == after['catalog_version']
+
+
+def test_in_flight_snapshot_is_unaffected(catalog_dir):
+    holder = CatalogHolder(catalog_dir)
+    old = holder.snapshot()
+    write_catalog(catalog_dir, 4)
+    assert holder.reload()
+    assert len(holder.get()) == 4
+    # A request that grabbed the old snapshot still sees a complete catalog
+    assert len(old.store) == 3
+    assert len(old.store.cone(11.0, 20.0, 5.0)) == 3
+
+
+def test_forced_reload(catalog_dir):
+    holder = CatalogHolder(catalog_dir)
+    old = holder.snapshot()
+    assert not holder.reload()
+    assert holder.reload(force=True)
+    assert holder.snapshot() is not old
+    assert holder.snapshot().version == old.version
+
+
+def test_background_reload(catalog_dir, admin):
+    client = TestClient(create_app(catalog_dir))
+    version = client.get('/health').json()['catalog_version']
+    write_catalog(catalog_dir, 6)
+    response = client.post('/admin/reload', headers=admin)
+    assert response.status_code == 202
+    assert response.json()['version'] == version
+    deadline = time.time() + 5
+    while client.get('/health').json()['catalog_count'] != 6:
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+def test_file_watcher_reloads(catalog_dir):
+    with TestClient(create_app(catalog_dir, watch_interval=0.02)) as client:
+        assert client.get('/health').json()['catalog_count'] == 3
+        write_catalog(catalog_dir, 7)
+        deadline = time.time() + 5
+        while client.get('/health').json()['catalog_count'] != 7:
+            assert time.time() < deadline
+            time.sleep(0.01)
+
+
+def test_admin_token(catalog_dir, monkeypatch):
+    client = TestClient(create_app(catalog_dir))
+    monkeypatch.delenv(ADMIN_TOKEN_ENV, raising=False)
+    # Without a configured token the admin endpoints are disabled
+    assert client.post('/admin/reload', params={'wait': True}, headers={'X-Admin-Token': ''}).status_code == 404
+
+    monkeypatch.setenv(ADMIN_TOKEN_ENV, 'secret')
+    assert client.post('/admin/reload', params={'wait': True}).status_code == 403
+    assert client.post('/admin/reload', params={'wait': True}, headers={'X-Admin-Token': 'wrong'}).status_code == 403
+    response = client.post('/admin/reload', params={'wait': True}, headers={'X-Admin-Token': 'secret'})
+    assert response.status_code == 200
@@ -0,0 +1,62 @@
+"""
+Tests for the bulk search response encoder.
+"""
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from dso_search.api import main
+from dso_search.api.models import DeepSpaceObject, SearchResponse
+from dso_search.api.serialization import search_response
+from dso_search.search.store import CatalogStore
+
+
+def model_bytes(catalog, rows, separations=None, total=None, offset=0):
+    """Encode rows the way the per-row Pydantic path did."""
+    objects = [
+        DeepSpaceObject(
+            name=catalog.name[i],
+            catalog=catalog.catalog_names[catalog.catalog_code[i]],
+            ra=catalog.ra[i],
+            dec=catalog.dec[i],
+            size=catalog.size[i],
+            separation=None if separations is None else separations[k]
+        )
+        for k, i in enumerate(rows)
+    ]
+    total = len(objects) if total is None else total
+    next_offset = offset + len(objects) if offset + len(objects) < total else None
+    return SearchResponse(objects=objects, count=len(objects), total=total,
+                          next_offset=next_offset).model_dump_json().encode()
+
+
+def test_bytes_match_model_serialization():
+    rng = np.random.default_rng(0)
+    n = 2000
+    df = pd.DataFrame({
+        'name': [f'NGC {i}' for i in range(n - 2)] + ['Ångström', 'M "quoted"'],
+        'catalog': rng.choice(['Messier', 'NGC'], n),
+        'ra': rng.uniform(0.0, 360.0, n),
+        'dec': np.concatenate([rng.uniform(-90.0, 90.0, n - 2), [3.2e-05, -0.0]]),
+        'size': np.where(rng.uniform(size=n) < 0.2, np.nan, rng.uniform(0.0, 1e3, n)),
+    })
+    catalog = CatalogStore.from_frame(df)
+    for rows in (np.arange(n), np.array([n - 2, n - 1]), np.array([], dtype=np.int64)):
+        assert search_response(catalog, rows).body == model_bytes(catalog, rows)
+        separations = catalog.separations(rows, 10.0, -20.0)
+        assert (search_response(catalog, rows, separations, total=n, offset=5).body ==
+                model_bytes(catalog, rows, separations, total=n, offset=5))
+
+
+def test_endpoint_bytes_match_model_serialization():
+    client = TestClient(main.app)
+    coords = {"ra": 83.7, "dec": 10.0, "radius": 60.0}
+    response = client.post("/search", json=coords)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    catalog = main.app.state.catalog.get()
+    rows = catalog.cone(coords["ra"], coords["dec"], coords["radius"])
+    assert len(rows) > 0
+    separations = catalog.separations(rows, coords["ra"], coords["dec"])
+    rows, separations = rows[np.argsort(separations)], np.sort(separations)
+    assert response.content == model_bytes(catalog, rows, separations)
@@ -0,0 +1,100 @@
+"""
+Tests for application construction, catalog loading and the startup budget.
+"""
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from dso_search.api import state
+from dso_search.api.main import create_app
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Seconds allowed for importing dso_search.api.main in a fresh interpreter,
+# and for importing it plus starting an app on a small catalog.
+IMPORT_BUDGET = 3.0
+STARTUP_BUDGET = 5.0
+
+PROBE = r"""
+import json, sys, time
+start = time.perf_counter()
+import dso_search.api.main as main
+imported = time.perf_counter() - start
+loaded_on_import = main.app.state.catalog.loaded
+pandas_on_import = 'pandas' in sys.modules
+from fastapi.testclient import TestClient
+with TestClient(main.create_app(sys.argv[1])) as client:
+    count = client.get('/health').json()['catalog_count']
+print(json.dumps({'import_s': imported, 'startup_s': time.perf_counter() - start,
+                  'loaded_on_import': loaded_on_import, 'pandas_on_import': pandas_on_import,
+                  'count': count}))
+"""
+
+
+def write_catalog(path):
+    pd.DataFrame({
+        'name': ['M31', 'NGC 7000', 'M42'],
+        'catalog': ['Messier', 'NGC', 'Messier'],
+        'ra': [10.68458, 315.7, 83.82208],
+        'dec': [41.26917, 44.3, -5.39111],
+        'size': [178.0, 120.0, 85.0],
+    }).to_csv(path / 'processed_test.csv', index=False)
+
+
+def test_import_and_startup_budget(tmp_path):
+    write_catalog(tmp_path)
+    # Run from an unrelated directory: nothing may depend on the cwd
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE, str(tmp_path)], cwd=tmp_path,
+        env={'PYTHONPATH': str(REPO_ROOT), 'PATH': ''},
+        capture_output=True, text=True, check=True,
+    )
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    assert not stats['loaded_on_import']
+    assert not stats['pandas_on_import']
+    assert stats['count'] == 3
+    assert stats['import_s'] < IMPORT_BUDGET
+    assert stats['startup_s'] < STARTUP_BUDGET
+
+
+def test_catalog_dir_from_environment(tmp_path, monkeypatch):
+    write_catalog(tmp_path)
+    monkeypatch.setenv(state.CATALOG_DIR_ENV, str(tmp_path))
+    app = create_app()
+    assert not app.state.catalog.loaded
+    with TestClient(app) as client:
+        assert app.state.catalog.loaded
+        assert client.get('/health').json()['catalog_count'] == 3
+
+
+def test_preload(tmp_path):
+    write_catalog(tmp_path)
+    app = create_app(tmp_path, preload=True)
+    assert app.state.catalog.loaded
+
+
+def test_catalog_loaded_once(tmp_path, monkeypatch):
+    write_catalog(tmp_path)
+    calls = []
+    real_load = state.load_catalog
+
+    def slow_load(data_dir):
+        calls.append(data_dir)
+        time.sleep(0.05)
+        return real_load(data_dir)
+
+    monkeypatch.setattr(state, 'load_catalog', slow_load)
+    holder = state.CatalogHolder(tmp_path)
+    threads = [threading.Thread(target=holder.get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len(holder.get()) == 3
@@ -0,0 +1,74 @@
+"""
+Tests for the columnar catalog store.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from dso_search.search.geometry import angular_separation
+from dso_search.search.store import CatalogStore, unit_vectors
+
+
+@pytest.fixture(scope="module")
+def store(synthetic_frame):
+    df = synthetic_frame(5000, seed=110, catalogs=('Messier', 'NGC'), missing_sizes=0.1, max_size=100.0)
+    return df, CatalogStore.from_frame(df)
+
+
+def test_precomputed_columns(store):
+    df, catalog = store
+    assert len(catalog) == len(df)
+    assert catalog.xyz.flags['C_CONTIGUOUS']
+    np.testing.assert_allclose(np.linalg.norm(catalog.xyz, axis=1), 1.0)
+    np.testing.assert_allclose(catalog.sin_dec, np.sin(np.deg2rad(df['dec'])))
+    assert catalog.catalog_names[catalog.catalog_code[0]] == df['catalog'][0]
+    assert np.isnan(catalog.size).sum() == df['size'].isna().sum()
+
+
+def test_cone_matches_haversine_scan(store):
+    df, catalog = store
+    rng = np.random.default_rng(5)
+    for _ in range(100):
+        ra0, dec0 = rng.uniform(0, 360), rng.uniform(-90, 90)
+        radius = rng.choice([0.5, 3.0, 20.0])
+        expected = np.nonzero(angular_separation(df['ra'].to_numpy(), df['dec'].to_numpy(),
+                                                 ra0, dec0) <= radius)[0]
+        np.testing.assert_array_equal(catalog.cone(ra0, dec0, radius), expected)
+
+
+def test_cone_whole_sky(store):
+    df, catalog = store
+    assert len(catalog.cone(10.0, 10.0, 180.0)) == len(df)
+
+
+def test_cone_sub_arcsecond_radius():
+    # Objects 0.2 and 1.8 milliarcseconds from the query point
+    catalog = CatalogStore.from_frame(pd.DataFrame({
+        'name': ['A', 'B', 'C'],
+        'catalog': 'NGC',
+        'ra': [10.68458, 10.68458, 10.68458],
+        'dec': [41.26917, 41.26917 + 5e-7, 41.26917 + 5.6e-8],
+        'size': 1.0,
+    }))
+    np.testing.assert_array_equal(catalog.cone(10.68458, 41.26917, 1e-7), [0, 2])
+    np.testing.assert_array_equal(catalog.cone(10.68458, 41.26917, 1e-6), [0, 1, 2])
+
+
+def test_catalog_counts(store):
+    df, catalog = store
+    assert catalog.catalog_counts() == df['catalog'].value_counts().to_dict()
+
+
+def test_unit_vectors_scalar():
+    np.testing.assert_allclose(unit_vectors(90.0, 0.0), [0.0, 1.0, 0.0], atol=1e-15)
+
+
+def test_cone_many_matches_single_cones(store):
+    _, catalog = store
+    rng = np.random.default_rng(9)
+    ra = rng.uniform(0, 360, 50)
+    dec = rng.uniform(-90, 90, 50)
+    radius = rng.choice([0.5, 5.0, 180.0], 50)
+    query_ids, rows = catalog.cone_many(ra, dec, radius)
+    for i in range(50):
+        np.testing.assert_array_equal(rows[query_ids == i], catalog.cone(ra[i], dec[i], radius[i]))
@@ -0,0 +1,116 @@
+"""
+Tests for the vectorized visibility planner.
+"""
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from dso_search.api.main import create_app
+from dso_search.search.filters import AttributeFilter, filtered_rows
+from dso_search.search.visibility import sidereal_angle, time_grid, visible_objects
+
+NIGHT = time_grid(datetime(2024, 10, 1, 0, tzinfo=timezone.utc).timestamp(),
+                  datetime(2024, 10, 1, 10, tzinfo=timezone.utc).timestamp(), 300.0)
+
+
+@pytest.fixture(scope="module")
+def store(synthetic_store):
+    return synthetic_store(3000, seed=120, catalogs=('IC', 'NGC'))
+
+
+def brute_force_altitudes(store, latitude, longitude, times):
+    """(objects, steps) altitudes in degrees from the hour angle formula."""
+    hour_angle = np.deg2rad(sidereal_angle(times, longitude)[None, :] - store.ra[:, None])
+    lat, dec = np.deg2rad(latitude), np.deg2rad(store.dec)[:, None]
+    sin_alt = np.sin(lat) * np.sin(dec) + np.cos(lat) * np.cos(dec) * np.cos(hour_angle)
+    return np.rad2deg(np.arcsin(sin_alt))
+
+
+def test_sidereal_time_at_reference_epoch():
+    # GMST at 2000-01-01 0h UT is 6h 39m 52.26s
+    midnight = datetime(2000, 1, 1, tzinfo=timezone.utc).timestamp()
+    assert sidereal_angle(midnight, 0.0) == pytest.approx((6 + 39 / 60 + 52.26 / 3600) * 15, abs=1e-3)
+    assert sidereal_angle(midnight, -75.0) == pytest.approx(sidereal_angle(midnight, 0.0) - 75.0)
+
+
+def test_time_grid_includes_end():
+    assert time_grid(0.0, 600.0, 300.0).tolist() == [0.0, 300.0, 600.0]
+    assert time_grid(0.0, 500.0, 300.0).tolist() == [0.0, 300.0]
+
+
+@pytest.mark.parametrize("latitude, longitude, min_altitude", [
+    (40.0, -75.0, 30.0),
+    (-33.9, 18.4, 45.0),
+    (78.0, 15.0, 0.0),
+])
+def test_matches_brute_force(store, latitude, longitude, min_altitude):
+    altitudes = brute_force_altitudes(store, latitude, longitude, NIGHT)
+    above = altitudes >= min_altitude
+    expected = np.flatnonzero(above.any(axis=1))
+
+    result = visible_objects(store, latitude, longitude, NIGHT, min_altitude)
+    np.testing.assert_array_equal(result.rows, expected)
+    np.testing.assert_allclose(result.max_altitude, altitudes[expected].max(axis=1), atol=1e-9)
+    np.testing.assert_array_equal(result.visible_steps, above[expected].sum(axis=1))
+    for row, first, last in zip(result.rows[:50], result.first_step, result.last_step):
+        steps = np.flatnonzero(above[row])
+        assert (first, last) == (steps[0], steps[-1])
+
+
+def test_chunking_does_not_change_results(store):
+    whole = visible_objects(store, 40.0, -75.0, NIGHT, 30.0)
+    chunked = visible_objects(store, 40.0, -75.0, NIGHT, 30.0, chunk_elements=1000)
+    for a, b in zip(whole, chunked):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_filtered_rows(store):
+    rows = filtered_rows(store, AttributeFilter(catalogs=['IC'], min_size=30.0))
+    expected = np.flatnonzero((store.catalog_of(np.arange(len(store))) == 'IC') & (store.size >= 30.0))
+    np.testing.assert_array_equal(rows, expected)
+    assert len(filtered_rows(store)) == len(store)
+
+    result = visible_objects(store, 40.0, -75.0, NIGHT, 30.0, rows=rows)
+    assert set(result.rows) == set(visible_objects(store, 40.0, -75.0, NIGHT, 30.0).rows) & set(rows)
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(create_app(preload=True))
+
+
+PLAN = {"latitude": 40.0, "longitude": -75.0, "start": "2024-10-01T00:00:00Z",
+        "end": "2024-10-01T10:00:00Z", "step_minutes": 5, "min_altitude": 30}
+
+
+def test_visible_endpoint(client):
+    response = client.post("/visible", json=PLAN)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["steps"] == 121
+    names = [obj["name"] for obj in body["objects"]]
+    # Andromeda culminates at 81 degrees on an October night; the Sombrero is up in daytime
+    assert "M31" in names and "M104" not in names
+    m31 = body["objects"][names.index("M31")]
+    assert m31["max_altitude"] == pytest.approx(90 - abs(40 - m31["dec"]), abs=1.0)
+    assert m31["first_visible"] <= m31["best_time"] <= m31["last_visible"]
+    assert m31["best_time"].endswith("Z")
+    altitudes = [obj["max_altitude"] for obj in body["objects"]]
+    assert altitudes == sorted(altitudes, reverse=True)
+
+    page = client.post("/visible", json={**PLAN, "limit": 2, "offset": 1}).json()
+    assert page["objects"] == body["objects"][1:3]
+    assert page["total"] == body["total"]
+
+
+def test_visible_endpoint_filters_and_validation(client):
+    filtered = client.post("/visible", json={**PLAN, "catalogs": ["NGC"]}).json()
+    assert {obj["catalog"] for obj in filtered["objects"]} <= {"NGC"}
+    naive = client.post("/visible", json={**PLAN, "start": "2024-10-01T00:00:00", "end": "2024-10-01T10:00:00"})
+    assert naive.json() == client.post("/visible", json=PLAN).json()
+
+    assert client.post("/visible", json={**PLAN, "end": "2024-09-30T00:00:00Z"}).status_code == 422
+    assert client.post("/visible", json={**PLAN, "end": "2025-10-01T00:00:00Z", "step_minutes": 1}).status_code == 422
+    assert client.post("/visible", json={**PLAN, "latitude": 95}).status_code == 422
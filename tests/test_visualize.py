@@ -0,0 +1,68 @@
+"""
+Tests for the catalog figures and their build stages.
+"""
+import numpy as np
+import pytest
+
+from dso_search.catalog.build import pipeline
+from dso_search.utils.visualize_data import (
+    FIGURES, SKY_DEC_BINS, SKY_RA_BINS, create_visualizations, summarize, summary_path, write_summaries,
+)
+
+
+@pytest.fixture
+def frame(synthetic_frame):
+    return synthetic_frame(2000, seed=30, catalogs=('IC', 'NGC', 'NGC', 'NGC'), missing_sizes=0.3)
+
+
+def test_summaries(frame):
+    summaries = summarize(frame)
+    assert list(summaries) == list(FIGURES)
+
+    assert summaries['objects_by_catalog.png'] == {'catalogs': ['NGC', 'IC'], 'counts': [1500, 500]}
+
+    sky = np.array(summaries['sky_distribution.png']['counts'])
+    assert sky.shape == (SKY_DEC_BINS, SKY_RA_BINS)
+    assert sky.sum() == len(frame)
+
+    boxes = {box['label']: box for box in summaries['size_distribution.png']['boxes']}
+    sizes = frame.loc[frame['catalog'] == 'IC', 'size'].dropna()
+    assert boxes['IC']['med'] == pytest.approx(sizes.median())
+    assert boxes['IC']['whislo'] <= boxes['IC']['q1'] <= boxes['IC']['q3'] <= boxes['IC']['whishi']
+
+    completeness = dict(zip(*summaries['data_completeness.png'].values()))
+    assert completeness['size'] == pytest.approx(frame['size'].notna().mean() * 100)
+    assert sum(summaries['ra_distribution.png']['counts']) == len(frame)
+
+
+def test_unchanged_summaries_are_identical_files(frame, tmp_path):
+    processed = tmp_path / 'processed'
+    processed.mkdir()
+    frame.to_csv(processed / 'processed_test.csv', index=False)
+    write_summaries(processed, tmp_path / 'a')
+
+    # New sizes change the size figures only; the sky and RA summaries are identical
+    frame.assign(size=frame['size'] * 2).to_csv(processed / 'processed_test.csv', index=False)
+    write_summaries(processed, tmp_path / 'b')
+    unchanged = {figure for figure in FIGURES
+                 if summary_path(tmp_path / 'a', figure).read_bytes() == summary_path(tmp_path / 'b', figure).read_bytes()}
+    assert unchanged == {'objects_by_catalog.png', 'sky_distribution.png', 'ra_distribution.png',
+                         'data_completeness.png'}
+
+
+def test_figure_stages(tmp_path):
+    build = pipeline(tmp_path / 'data', sources=['messier'])
+    waves = [sorted(stage.name for stage in wave) for wave in build.waves()]
+    assert waves == [
+        ['ingest:messier'],
+        ['figures', 'index'],
+        sorted(f'figure:{figure[:-4]}' for figure in FIGURES),
+    ]
+
+
+def test_create_visualizations(frame, tmp_path):
+    pytest.importorskip('matplotlib')
+    pytest.importorskip('seaborn')
+    create_visualizations(frame, tmp_path, jobs=1)
+    for figure in FIGURES:
+        assert (tmp_path / figure).stat().st_size > 0
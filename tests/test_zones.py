@@ -0,0 +1,69 @@
+"""
+Tests for the declination-zone spatial index.
+"""
+import numpy as np
+import pytest
+
+from dso_search.search.geometry import angular_separation
+from dso_search.search.zones import ZoneIndex
+
+
+def brute_force(ra, dec, ra0, dec0, radius):
+    return np.nonzero(angular_separation(ra, dec, ra0, dec0) <= radius)[0]
+
+
+def indexed(index, ra, dec, ra0, dec0, radius):
+    rows = index.candidates(ra0, dec0, radius)
+    return rows[angular_separation(ra[rows], dec[rows], ra0, dec0) <= radius]
+
+
+@pytest.fixture(scope="module")
+def sky(uniform_sky):
+    ra, dec = uniform_sky(20000, seed=42)
+    # Objects sitting on the awkward spots of the grid
+    ra = np.concatenate([ra, [0.0, 359.999999, 0.0, 180.0, 10.0]])
+    dec = np.concatenate([dec, [0.0, 0.0, 90.0, -90.0, 0.0]])
+    return ra, dec, ZoneIndex(ra, dec)
+
+
+def test_matches_brute_force_random_cones(sky, uniform_sky):
+    ra, dec, index = sky
+    q_ra, q_dec = uniform_sky(200, seed=7)
+    rng = np.random.default_rng(3)
+    for ra0, dec0 in zip(q_ra, q_dec):
+        radius = float(rng.choice([0.01, 0.3, 2.0, 15.0, 95.0]))
+        np.testing.assert_array_equal(
+            indexed(index, ra, dec, ra0, dec0, radius),
+            brute_force(ra, dec, ra0, dec0, radius),
+        )
+
+
+@pytest.mark.parametrize("ra0,dec0,radius", [
+    (0.0, 0.0, 1.0),        # wraps through RA=0
+    (359.9, 10.0, 0.5),     # wraps from the other side
+    (45.0, 89.5, 1.0),      # contains the north pole
+    (200.0, -89.9, 0.2),    # contains the south pole
+    (120.0, 30.0, 180.0),   # whole sky
+    (10.0, 0.0, 1e-7),      # tiny cone on an object
+])
+def test_matches_brute_force_edge_cases(sky, ra0, dec0, radius):
+    ra, dec, index = sky
+    np.testing.assert_array_equal(
+        indexed(index, ra, dec, ra0, dec0, radius),
+        brute_force(ra, dec, ra0, dec0, radius),
+    )
+
+
+def test_candidates_many_groups_by_query(sky):
+    ra, dec, index = sky
+    q_ra = np.array([10.0, 200.0, 359.5])
+    q_dec = np.array([5.0, -40.0, 60.0])
+    query_ids, rows = index.candidates_many(q_ra, q_dec, 2.0)
+    for i in range(3):
+        np.testing.assert_array_equal(rows[query_ids == i],
+                                      index.candidates(q_ra[i], q_dec[i], 2.0))
+
+
+def test_rejects_mismatched_arrays():
+    with pytest.raises(ValueError):
+        ZoneIndex([1.0, 2.0], [3.0])